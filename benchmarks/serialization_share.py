@@ -0,0 +1,145 @@
+import argparse
+import asyncio
+import cProfile
+import os
+import pstats
+import sys
+import tempfile
+import time
+
+###
+# Share of CPU time spent serializing the 100-row list endpoints, with FAST_JSON_RESPONSES on and off.
+# The app runs in this process against a throwaway SQLite database seeded with 100 states, schools
+# and users. Requests go through httpx's ASGI transport, so the whole request runs on this thread
+# under cProfile, timed by this thread's CPU clock. aiosqlite runs the queries on a thread of its
+# own, so the database's work is left out as it would be with postgres. Serialization is the time
+# spent inside FastAPI's serialize_response and JSONResponse.render, and inside the helpers of
+# src/responses.py, counted once where they nest.
+#
+#   python benchmarks/serialization_share.py [--requests 50]
+#
+# cProfile slows pure Python code more than C code, so the shares are an upper bound. The
+# milliseconds per request are wall time, measured separately without the profiler.
+###
+
+ROWS = 100
+
+_tmp_dir = tempfile.mkdtemp(prefix="ilp-benchmark-")
+os.environ["DB_URL"] = f"sqlite+aiosqlite:///{os.path.join(_tmp_dir, 'ilp.db')}"
+os.environ["UPLOAD_FOLDER"] = _tmp_dir
+os.environ["LOG_FILE"] = os.path.join(_tmp_dir, "adminlogs.log")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+import main  # noqa: E402
+from fastapi import routing  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+from src import responses  # noqa: E402
+from src.config import API_PREFIX, ROUTE_PREFIX_V1  # noqa: E402
+
+ENDPOINTS = [
+    ("GET", "/state/", None),
+    ("POST", "/getStatesByParams/", {"page_size": ROWS}),
+    ("GET", "/school/", None),
+    ("POST", "/getSchoolsByParams/", {"page_size": ROWS}),
+    ("POST", "/allSchoolDetails/", {"page_size": ROWS, "filters": {}}),
+    ("GET", "/ilpuser/", None),
+    ("POST", "/getIlpusersByParams/", {"page_size": ROWS}),
+]
+
+SERIALIZATION_FUNCTIONS = [
+    routing.serialize_response,
+    JSONResponse.render,
+    responses.FastJSONResponse.render,
+    responses.get_model_response,
+    responses.get_trusted_response,
+    responses.get_rows_response,
+]
+
+
+async def seed(client: httpx.AsyncClient):
+    from src.database import AsyncSessionLocal
+    from src.domain.ilpuser.models import ILPUser
+    from src.domain.organization.models import Organization
+
+    blocks = [{"name": "Benchmark Block"}]
+    states = [{"name": "Benchmark State", "zones": [{"name": "Benchmark Zone", "districts": [{"name": "Benchmark District", "blocks": blocks}]}]}]
+    states += [{"name": f"Benchmark State {number}"} for number in range(1, ROWS)]
+    response = await client.post("/bulkImportRegions", json={"states": states})
+    response.raise_for_status()
+    block_id = (await client.post("/getBlocksByParams/", json={"fields": ["id"], "filters": {"name": {"==": "Benchmark Block"}}})).json()[0]["id"]
+
+    async with AsyncSessionLocal() as db:
+        db.add(Organization(id="benchmark-org", name="Benchmark Org", long_name="Benchmark Organization", description="Schools under benchmark"))
+        db.add_all([
+            ILPUser(id=f"benchmark-user-{number}", email=f"user{number}@ilp-benchmark.org", password="x", username=f"benchmarkuser{number}",
+                    first_name="Benchmark", last_name=f"User {number}", phone1=f"90000{number:05d}", gender="FEMALE", created_by="benchmark")
+            for number in range(ROWS)
+        ])
+        await db.commit()
+
+    schools = [
+        {"name": f"Benchmark School {number}", "long_name": "Benchmark School", "dise_code": 90000000000 + number, "address": "Main Road",
+         "city": "Town", "pincode": 560001, "block_id": block_id, "organization_id": "benchmark-org"}
+        for number in range(ROWS)
+    ]
+    response = await client.post("/bulkUpsertSchools", json={"schools": schools})
+    response.raise_for_status()
+
+
+async def send(client: httpx.AsyncClient, method: str, url: str, body):
+    response = await client.request(method, url, params={"page_size": ROWS, "limit": ROWS} if method == "GET" else None, json=body)
+    response.raise_for_status()
+    assert len(response.json()) == ROWS, f"{url} returned {len(response.json())} rows"
+
+
+def get_serialization_time(stats: pstats.Stats) -> float:
+    ''' Cumulative time of the serialization functions, leaving out calls made from one another '''
+    functions = {(func.__code__.co_filename, func.__code__.co_firstlineno, func.__name__) for func in SERIALIZATION_FUNCTIONS}
+    total = 0.0
+    for function in functions & stats.stats.keys():
+        callers = stats.stats[function][4]
+        total += sum(caller_stats[3] for caller, caller_stats in callers.items() if caller not in functions)
+    return total
+
+
+async def measure(client: httpx.AsyncClient, method: str, url: str, body, requests: int) -> tuple:
+    ''' Milliseconds per request and the serialization share of the profiled CPU time '''
+    for _ in range(3):
+        await send(client, method, url, body)
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await send(client, method, url, body)
+    elapsed_ms = (time.perf_counter() - started) * 1000 / requests
+
+    profiler = cProfile.Profile(time.thread_time)
+    profiler.enable()
+    for _ in range(requests):
+        await send(client, method, url, body)
+    profiler.disable()
+    stats = pstats.Stats(profiler)
+    return elapsed_ms, get_serialization_time(stats) / stats.total_tt
+
+
+async def run(requests: int):
+    transport = httpx.ASGITransport(app=main.app)
+    async with main.app.router.lifespan_context(main.app):
+        async with httpx.AsyncClient(transport=transport, base_url=f"http://benchmark{API_PREFIX}{ROUTE_PREFIX_V1}") as client:
+            await seed(client)
+
+            print(f"{'endpoint':<28}{'default ms':>12}{'share':>8}{'fast ms':>12}{'share':>8}")
+            for method, url, body in ENDPOINTS:
+                results = []
+                for fast in (False, True):
+                    responses.FAST_JSON_RESPONSES = fast
+                    results.append(await measure(client, method, url, body, requests))
+                (default_ms, default_share), (fast_ms, fast_share) = results
+                print(f"{method + ' ' + url:<28}{default_ms:>12.2f}{default_share:>8.0%}{fast_ms:>12.2f}{fast_share:>8.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serialization share of CPU time for the 100-row list endpoints")
+    parser.add_argument("--requests", type=int, default=50, help="requests timed and profiled per endpoint and mode")
+    asyncio.run(run(parser.parse_args().requests))
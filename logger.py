@@ -1,32 +1,101 @@
+import atexit
+import copy
+import json
 import logging
-import os
-from logging.handlers import RotatingFileHandler
+import queue
+import random
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from starlette.config import Config
-from datetime import datetime
 
 # Load environment variables
 config = Config(".env")  # Automatically loads variables from .env file
 
-# Get today's date in YYYY-MM-DD format
-today_date = datetime.now().strftime("%Y-%m-%d")
-
 # Read values
-LOG_FILE_PATTERN = config("LOG_FILE_PATTERN", default="adminlogs_{date}.log")
-LOG_FILE = LOG_FILE_PATTERN.format(date=today_date)
+# The active file keeps one name; at each rollover the previous one is renamed with a date suffix
+LOG_FILE = config("LOG_FILE", default="adminlogs.log")
 LOG_LEVEL = config("LOG_LEVEL", default="INFO")
-LOG_MAX_SIZE = config("LOG_MAX_SIZE", cast=int, default=5)  # Convert MB to bytes
+LOG_ROTATE_WHEN = config("LOG_ROTATE_WHEN", default="midnight")  # TimedRotatingFileHandler "when"
 LOG_BACKUP_COUNT = config("LOG_BACKUP_COUNT", cast=int, default=3)
-LOG_FORMAT = config("LOG_FORMAT", default="%(asctime)s - %(levelname)s - %(message)s")
+LOG_JSON = config("LOG_JSON", cast=bool, default=True)
+LOG_FORMAT = config("LOG_FORMAT", default="%(asctime)s - %(levelname)s - %(request_id)s - %(message)s")  # Used when LOG_JSON is off
+LOG_DEBUG_SAMPLE_RATE = config("LOG_DEBUG_SAMPLE_RATE", cast=float, default=1.0)  # Share of DEBUG records kept
+
+# Id of the request being handled, set by RequestIdMiddleware and added to every record
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+# Attributes every LogRecord has; anything else was passed through extra= and is written as a field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "request_id"}
+
+
+class RequestIdFilter(logging.Filter):
+    ''' Stamps records with the current request id. Runs in the calling thread, before queueing. '''
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    ''' Keeps a share of DEBUG records so verbose code paths can stay instrumented in production '''
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno > logging.DEBUG or self.rate >= 1 or random.random() < self.rate
+
+
+class LogQueueHandler(QueueHandler):
+    '''
+    Resolves the message and traceback text before a record crosses to the listener thread,
+    but leaves formatting to the file handler so JSON output keeps its fields.
+    '''
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES})
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
 
 # Create a logger
 logger = logging.getLogger("my_project_logger")
 logger.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
 
-# Configure Rotating File Handler
-handler = RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_SIZE, backupCount=LOG_BACKUP_COUNT)
-formatter = logging.Formatter(LOG_FORMAT)
-handler.setFormatter(formatter)
+# The file handler runs on the queue listener's thread, so a slow disk never blocks the event loop
+file_handler = TimedRotatingFileHandler(LOG_FILE, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUP_COUNT, encoding="utf-8", delay=True)
+file_handler.setFormatter(JsonFormatter() if LOG_JSON else logging.Formatter(LOG_FORMAT))
+
+log_queue = queue.SimpleQueue()
+queue_handler = LogQueueHandler(log_queue)
+queue_handler.addFilter(DebugSamplingFilter(LOG_DEBUG_SAMPLE_RATE))
+queue_handler.addFilter(RequestIdFilter())
+
+listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
 
 # Prevent duplicate logging
 if not logger.hasHandlers():
-    logger.addHandler(handler)
+    logger.addHandler(queue_handler)
+    listener.start()
+    atexit.register(listener.stop)  # Flush queued records on shutdown
@@ -2,9 +2,16 @@ from fastapi import Depends, FastAPI, Request, Response, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from src.config import API_PREFIX, ALLOWED_HOSTS
 from src.database import AsyncSessionLocal, Base, engine
+from src.migrations import run_migrations
+from src.metrics import PrometheusMiddleware
+from src.request_id import RequestIdMiddleware, REQUEST_ID_HEADER
 from src.dependencies import get_token_header
 from src.routers.api import router as router_api
 from src.routers.handlers.http_error import http_error_handler
+from src.routers.util_functions import NEXT_CURSOR_HEADER
+from src.domain.region_path import service as region_path_service
+from src.domain.region_tree import service as region_tree_service
+from src.domain.import_job import service as import_job_service
 from logger import logger
 import asyncio
 
@@ -24,8 +31,16 @@ def get_application() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Let browser clients read the keyset pagination cursor and the request id
+        expose_headers=[NEXT_CURSOR_HEADER, REQUEST_ID_HEADER],
     )
 
+    # Request latency, status and per-request query counts, scraped from /metrics
+    application.add_middleware(PrometheusMiddleware)
+
+    # Correlates log records with the request that wrote them
+    application.add_middleware(RequestIdMiddleware)
+
     # Mapping API routes
     application.include_router(router_api, prefix=API_PREFIX)
 
@@ -40,18 +55,22 @@ async def create_tables():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+async def build_region_paths():
+    async with AsyncSessionLocal() as session:
+        await region_path_service.ensure_region_paths(session)
+
+async def expire_import_jobs():
+    async with AsyncSessionLocal() as session:
+        await import_job_service.expire_stale_import_jobs(session)
+
+async def load_region_tree():
+    async with AsyncSessionLocal() as session:
+        await region_tree_service.get_region_tree(session)
+
 @app.on_event("startup")
 async def startup():
     await create_tables()  # Ensures tables are created at app startup
-
-@app.middleware("http")
-async def db_session_middleware(request: Request, call_next):
-    """Middleware to attach a database session to each request."""
-    response = Response("Internal server error", status_code=500)
-    try:
-        async with AsyncSessionLocal() as session:
-            request.state.db = session
-            response = await call_next(request)
-    finally:
-        await request.state.db.close()  # Ensure async session is properly closed
-    return response
+    await run_migrations(engine)  # Brings existing tables up to the current schema
+    await build_region_paths()  # Backfills region paths for existing databases
+    await load_region_tree()  # Serves region hierarchy lookups from memory
+    await expire_import_jobs()  # Fails import jobs a stopped worker left behind
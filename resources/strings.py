@@ -3,6 +3,8 @@
 ###
 
 INVALID_FIELDS_IN_REQUEST_ERROR = "Invalid fields requested"
+INVALID_CURSOR_ERROR = "Invalid or expired pagination cursor"
+INVALID_SEARCH_TYPE_ERROR = "Search types must be any of user, school, region"
 
 AUTHENTICATION_FAILED_ERROR = "Authentication failed"
 
@@ -20,6 +22,10 @@ DISTRICT_DOES_NOT_EXIST_ERROR = "District does not exist"
 STATE_DOES_NOT_EXIST_ERROR = "State does not exist"
 USER_ROLE_ASSOCIATION_DOES_NOT_EXIST_ERROR = "User Role association does not exist"
 PROFILE_PIC_DOESNT_EXIST = "Profile picture doesnt exist"
+FILE_NOT_FOUND_ERROR = "File not found on server"
+IMPORT_JOB_DOES_NOT_EXIST_ERROR = "Import job does not exist"
+IMPORT_JOB_STALLED_ERROR = "The import stopped making progress, most likely because the server running it restarted. Rows reported as processed were imported."
+REGION_DOES_NOT_EXIST_ERROR = "Region does not exist"
 
 # Errors already exists
 EMAIL_ALREADY_EXISTS_ERROR = "User with this email id is already registered"
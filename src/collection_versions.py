@@ -0,0 +1,101 @@
+from sqlalchemy import BigInteger, Column, Enum, String, event, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+from typing import Optional
+import hashlib
+from .database import Base
+from .write_tracking import on_committing_write
+
+###
+# Version counters for the rarely changing lists the admin UI loads into dropdowns, and for the
+# dashboard summary. A write to one of a collection's tables bumps its counter row in the same
+# transaction, and the counters drive the ETags of the list endpoints and the dashboard snapshot.
+# Every worker process reads the same rows, so an ETag issued by one worker is honoured by all of
+# them, and a revalidated list costs one primary key lookup instead of the list query.
+###
+
+# Collection -> tables whose writes change it. Deleting a region cascades to the regions below
+# it in the database, so each region list also depends on the tables above it. A new collection
+# with tables needs its counter row added by a migration (see src/migrations.py).
+COLLECTION_TABLES = {
+    "state": {"states"},
+    "zone": {"states", "zones"},
+    "district": {"states", "zones", "districts"},
+    "block": {"states", "zones", "districts", "blocks"},
+    "role": {"roles"},
+    # Every table the dashboard summary counts or lists rows of
+    "dashboard": {"ilp_users", "roles", "user_role_assignments", "states", "zones", "districts", "blocks", "schools", "classes"},
+    # Database enum types only change with a deployment, which changes the schema fingerprint
+    "enum": set(),
+}
+
+
+class CollectionVersion(Base):
+    __tablename__ = "collection_versions"
+
+    collection = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+
+_schema_fingerprint: Optional[str] = None
+
+
+def _get_schema_fingerprint() -> str:
+    ''' Digest of the enum types the models declare, the same in every worker running this code '''
+    global _schema_fingerprint
+    if _schema_fingerprint is None:
+        enums = sorted({
+            (column.type.name or "", tuple(column.type.enums))
+            for table in Base.metadata.tables.values()
+            for column in table.columns
+            if isinstance(column.type, Enum)
+        })
+        _schema_fingerprint = hashlib.sha1(repr(enums).encode("utf-8")).hexdigest()
+    return _schema_fingerprint
+
+
+async def get_collection_versions(db: AsyncSession, collections: tuple) -> dict:
+    ''' Current counter of each collection; collections without tables are always 0 '''
+    versions = {collection: 0 for collection in collections}
+    tracked = [collection for collection in collections if COLLECTION_TABLES[collection]]
+    if tracked:
+        result = await db.execute(
+            select(CollectionVersion.collection, CollectionVersion.version).filter(CollectionVersion.collection.in_(tracked))
+        )
+        versions.update(result.all())
+    return versions
+
+
+async def get_collection_etag(db: AsyncSession, collections: tuple, representation: str) -> str:
+    ''' Strong ETag for a response built from collections; representation tells apart the URLs serving them '''
+    versions = await get_collection_versions(db, collections)
+    versions_text = ",".join(f"{collection}:{versions[collection]}" for collection in collections)
+    digest = hashlib.sha1(f"{_get_schema_fingerprint()}|{versions_text}|{representation}".encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def get_committed_version(session, collection: str) -> Optional[int]:
+    ''' In an after_commit listener: the version the commit bumped collection to, None when it didn't '''
+    return session.info.get("collection_versions", {}).get(collection)
+
+
+def _bump_changed_collections(session, tables: set):
+    changed = sorted(collection for collection, collection_tables in COLLECTION_TABLES.items() if tables & collection_tables)
+    result = session.execute(
+        update(CollectionVersion)
+        .filter(CollectionVersion.collection.in_(changed))
+        .values(version=CollectionVersion.version + 1)
+        .returning(CollectionVersion.collection, CollectionVersion.version)
+    )
+    session.info["collection_versions"] = dict(result.all())
+
+
+on_committing_write(set().union(*COLLECTION_TABLES.values()), _bump_changed_collections)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_committed_versions(session, transaction):
+    # Ends after the after_commit listeners have run; savepoints leave the outer transaction's versions
+    if transaction.parent is None:
+        session.info.pop("collection_versions", None)
@@ -16,3 +16,56 @@ config = Config(".env")
 ROUTE_PREFIX_V1 = "/v1"
 
 ALLOWED_HOSTS: List[str] = config("ALLOWED_HOSTS")
+
+# Seconds the role name -> id registry is served from memory before reloading
+ROLE_CACHE_TTL_SECONDS: int = config("ROLE_CACHE_TTL_SECONDS", cast=int, default=300)
+
+# bcrypt cost factor for new password hashes and the threads bcrypt runs on
+PASSWORD_HASH_ROUNDS: int = config("PASSWORD_HASH_ROUNDS", cast=int, default=12)
+PASSWORD_HASH_WORKERS: int = config("PASSWORD_HASH_WORKERS", cast=int, default=4)
+
+# Rows a background import job commits and reports progress for at a time
+IMPORT_JOB_CHUNK_SIZE: int = config("IMPORT_JOB_CHUNK_SIZE", cast=int, default=1000)
+# Seconds a pending or running import job may go without reporting progress before it is marked
+# failed, its worker taken to have stopped. Must be longer than a chunk takes to import
+IMPORT_JOB_STALE_SECONDS: int = config("IMPORT_JOB_STALE_SECONDS", cast=int, default=900)
+
+# "database" ranks /search results with pg_trgm; "memory" serves them from an in-process trigram
+# index, which is also used whenever the database is not PostgreSQL
+SEARCH_BACKEND: str = config("SEARCH_BACKEND", default="database")
+# Seconds the in-memory search index is served before it is rebuilt
+SEARCH_INDEX_TTL_SECONDS: int = config("SEARCH_INDEX_TTL_SECONDS", cast=int, default=300)
+
+# Database engine and connection pool. DB_ECHO is "false", "true" (log statements) or "debug"
+# (statements and result rows); DB_POOL_RECYCLE of -1 keeps connections open indefinitely.
+DB_ECHO: str = config("DB_ECHO", default="false")
+DB_POOL_SIZE: int = config("DB_POOL_SIZE", cast=int, default=10)
+DB_MAX_OVERFLOW: int = config("DB_MAX_OVERFLOW", cast=int, default=5)
+DB_POOL_TIMEOUT: float = config("DB_POOL_TIMEOUT", cast=float, default=30)
+DB_POOL_RECYCLE: int = config("DB_POOL_RECYCLE", cast=int, default=1800)
+DB_POOL_PRE_PING: bool = config("DB_POOL_PRE_PING", cast=bool, default=True)
+# PostgreSQL statement_timeout for every connection in milliseconds, 0 disables it
+DB_STATEMENT_TIMEOUT_MS: int = config("DB_STATEMENT_TIMEOUT_MS", cast=int, default=0)
+# Prepared statements cached per asyncpg connection; set to 0 behind pgbouncer in transaction mode
+DB_STATEMENT_CACHE_SIZE: int = config("DB_STATEMENT_CACHE_SIZE", cast=int, default=100)
+
+# Requests running more queries than this are counted and logged as likely N+1 patterns, 0 disables
+REQUEST_QUERY_BUDGET: int = config("REQUEST_QUERY_BUDGET", cast=int, default=25)
+
+# Rows an export fetches from its server-side cursor and sends to the client at a time
+EXPORT_BATCH_SIZE: int = config("EXPORT_BATCH_SIZE", cast=int, default=1000)
+
+# State, zone, district, block, role and enum lists are revalidated with ETags. Clients may reuse a list
+# for COLLECTION_CACHE_MAX_AGE_SECONDS without asking (0 means always revalidate)
+COLLECTION_CACHE_MAX_AGE_SECONDS: int = config("COLLECTION_CACHE_MAX_AGE_SECONDS", cast=int, default=0)
+
+# Seconds the in-memory region tree is served before its database version is checked again. Writes
+# made in this process patch the tree as they commit; a version bump from another worker reloads it
+REGION_TREE_VERSION_CHECK_SECONDS: float = config("REGION_TREE_VERSION_CHECK_SECONDS", cast=float, default=1.0)
+
+# List endpoints encode their responses with pydantic-core/orjson instead of FastAPI's
+# validate -> jsonable -> json.dumps pipeline (see src/responses.py)
+FAST_JSON_RESPONSES: bool = config("FAST_JSON_RESPONSES", cast=bool, default=True)
+
+# Most ids one batch fetch request (POST /ilpuser/batch, /school/batch, ...) may ask for
+BATCH_FETCH_MAX_IDS: int = config("BATCH_FETCH_MAX_IDS", cast=int, default=500)
@@ -1,5 +1,5 @@
 import jwt
-from fastapi import Header, HTTPException
+from fastapi import Header, HTTPException, Request
 
 from .database import AsyncSessionLocal
 
@@ -16,10 +16,28 @@ def decode(token):
 def encode():
     return jwt.encode({"some": "payload"}, "secret", algorithm="HS256")
 
-async def get_db_session():
-    async with AsyncSessionLocal() as session:
+async def get_db_session(request: Request):
+    '''
+    The request's unit of work. FastAPI resolves this once per request, and the session only
+    checks out a pooled connection when it first runs a statement, so requests that never touch
+    the database hold no connection. Writes a route left uncommitted are committed when it
+    returns, everything is rolled back if it raises, and the connection goes back to the pool
+    before the response is sent.
+    '''
+    session = AsyncSessionLocal()
+    request.state.db = session
+    try:
         yield session
-        await session.close() 
+        # Not only when the unit of work has pending objects: insert()/update() statements
+        # run through the session leave nothing in new/dirty/deleted
+        if session.in_transaction():
+            await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+        del request.state.db
 
 async def get_token_header(x_token: str = Header(...)):
     ''' Exemplo of header validation dependency '''
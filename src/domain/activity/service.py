@@ -5,11 +5,13 @@ from sqlalchemy import desc, asc, and_
 from datetime import datetime
 import re
 from . import models, schemas
+from ...rows import get_response_columns, get_field_columns, get_rows
 from fastapi import HTTPException
 from resources.strings import (
     ACTIVITY_CREATE_SUCCESSFUL, ACTIVITY_DELETE_SUCCESSFUL,
     ACTIVITY_UPDATE_SUCCESSFUL, ACTIVITY_DOES_NOT_EXIST_ERROR
 )
+from logger import logger
 
 
 async def get_activity(db: AsyncSession, activity_id: str):
@@ -18,8 +20,8 @@ async def get_activity(db: AsyncSession, activity_id: str):
 
 
 async def get_activities(db: AsyncSession, skip: int = 0, limit: int = 100):
-    result = await db.execute(select(models.Activity).offset(skip).limit(limit))
-    return result.scalars().all()
+    columns = get_response_columns(models.Activity, schemas.ActivityResponse)
+    return await get_rows(db, select(*columns).offset(skip).limit(limit))
 
 async def get_activities_with_assets(db: AsyncSession, filters: schemas.ActivityFilter, skip: int = 0, limit: int = 100
 ):
@@ -49,11 +51,8 @@ async def get_activities_with_assets(db: AsyncSession, filters: schemas.Activity
     return result.scalars().all()
 
 async def get_activities_by_params(db: AsyncSession, selected_fields: list, filters: list, ordering: list, skip: int = 0, limit: int = 100):
-    orm_attributes = [getattr(models.Activity, field) for field in selected_fields]
-    result = await db.execute(
-        select(*orm_attributes).filter(*filters).order_by(*ordering).offset(skip).limit(limit))
-    
-    return result.scalars().all()
+    columns = get_field_columns(models.Activity, selected_fields)
+    return await get_rows(db, select(*columns).filter(*filters).order_by(*ordering).offset(skip).limit(limit))
 
 
 async def get_activities_year(db: AsyncSession):
@@ -78,7 +77,7 @@ async def create_activity(db: AsyncSession, activity: schemas.ActivityBase):
         await db.commit()
         await db.refresh(db_activity)
     except Exception as e:
-        print(str(e))
+        logger.warning(str(e))
         raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
     return db_activity
 
@@ -97,7 +96,7 @@ async def update_activity(db: AsyncSession, activity_id: str, activity: schemas.
         await db.commit()
         await db.refresh(db_activity)
     except Exception as e:
-        print(str(e))
+        logger.warning(str(e))
         raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
     return {"message": ACTIVITY_UPDATE_SUCCESSFUL}
 
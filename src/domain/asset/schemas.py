@@ -40,6 +40,9 @@ class AssetResponse(BaseModel):
 class AssetCreate(AssetBase):
     pass
 
+class AssetUploadResponse(AssetResponse):
+    checksum: Optional[str] = None  # sha256 of the stored file, computed while it was written
+
 class Asset(AssetBase):
     id: str
 
@@ -8,6 +8,7 @@ from resources.strings import (
     ASSET_CREATE_SUCCESSFUL, ASSET_DELETE_SUCCESSFUL, 
     ASSET_DOES_NOT_EXIST_ERROR, ASSET_UPDATE_SUCCESSFUL
 )
+from logger import logger
 
 
 async def get_asset(db: AsyncSession, asset_id: str):
@@ -35,10 +36,24 @@ async def create_asset(db: AsyncSession, asset: schemas.AssetBase):
         await db.commit()
         await db.refresh(db_asset)
     except Exception as e:
-        print(str(e))
+        logger.warning(str(e))
         raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
     return db_asset
 
+async def create_activity_assets(db: AsyncSession, assets: list[schemas.AssetBase], activityAssetsAssociation: list[schemas.ActivityAssetBase]):
+    ''' Insert uploaded assets and their activity links in one transaction '''
+    try:
+        db_assets = [models.Asset(**asset.model_dump()) for asset in assets]
+        db.add_all(db_assets)
+        await db.flush()  # assets first, the links reference them
+        db.add_all([models.ActivityAsset(**link.model_dump()) for link in activityAssetsAssociation])
+        await db.commit()
+        return db_assets
+    except Exception as e:
+        logger.warning(str(e))
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
+
 async def link_assets_to_activity(db: AsyncSession, activityAssetsAssociation: list[schemas.ActivityAssetBase]):
     try:
         db_assets = [models.ActivityAsset(**asset.model_dump()) for asset in activityAssetsAssociation]
@@ -48,7 +63,7 @@ async def link_assets_to_activity(db: AsyncSession, activityAssetsAssociation: l
             await db.refresh(asset)
         return db_assets
     except Exception as e:
-        print(str(e))
+        logger.warning(str(e))
         await db.rollback()
         raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
     
@@ -66,7 +81,7 @@ async def update_asset(db: AsyncSession, asset_id: str, asset: schemas.AssetUpda
         await db.commit()
         await db.refresh(db_asset)
     except Exception as e:
-        print(str(e))
+        logger.warning(str(e))
         raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
     return {"message": ASSET_UPDATE_SUCCESSFUL}
 
@@ -82,7 +97,7 @@ async def delete_asset(db: AsyncSession, asset_id: str):
         await db.delete(db_asset)
         await db.commit()
     except Exception as e:
-        print("error is ------------ ", str(e))
+        logger.warning(f"Error deleting asset - {e}")
         raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
     return {"message": ASSET_DELETE_SUCCESSFUL}
 
@@ -98,7 +113,7 @@ async def delete_asset_activity_association(db: AsyncSession, asset_id: str):
         await db.delete(db_asset)
         await db.commit()
     except Exception as e:
-        print("error is 1------------ ", str(e))
+        logger.warning(f"Error deleting asset activity association - {e}")
         raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
     return {"message": ASSET_DELETE_SUCCESSFUL}
 
@@ -10,7 +10,7 @@ class Block(Base):
 
     id = Column(String, primary_key=True)
     name = Column(String, nullable=False)
-    district_id = Column(String, ForeignKey("districts.id"), nullable=False)  # Enforce foreign key
+    district_id = Column(String, ForeignKey("districts.id"), nullable=False, index=True)  # Enforce foreign key
     description = Column(String)
 
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=text("CURRENT_TIMESTAMP"))
@@ -3,11 +3,16 @@ from sqlalchemy.future import select
 from sqlalchemy import func
 import re
 from . import models, schemas
+from ...rows import get_response_columns, get_field_columns, get_rows
+from ..region_path import service as region_path_service
+from ..region_tree import service as region_tree_service
+from ..role_assignment.models import LevelEnum
 from fastapi import HTTPException
 from resources.strings import (
     BLOCK_CREATE_SUCCESSFUL, BLOCK_UPDATE_SUCCESSFUL,
     BLOCK_DELETE_SUCCESSFUL, BLOCK_DOES_NOT_EXIST_ERROR
 )
+from logger import logger
 
 
 async def get_block(db: AsyncSession, block_id: str):
@@ -21,26 +26,25 @@ async def get_block_by_name(db: AsyncSession, name: str):
     return result.scalar()
 
 async def get_blocks(db: AsyncSession, skip: int = 0, limit: int = 100):
-    result = await db.execute(select(models.Block).offset(skip).limit(limit))
-    return result.scalars().all()
+    columns = get_response_columns(models.Block, schemas.BlockResponse)
+    return await get_rows(db, select(*columns).offset(skip).limit(limit))
 
 
 async def get_blocks_by_params(db: AsyncSession, selected_fields: list, filters: list, ordering: list, skip: int = 0, limit: int = 100):
-    orm_attributes = [getattr(models.Block, field) for field in selected_fields]
-    result = await db.execute(
-        select(*orm_attributes).filter(*filters).order_by(*ordering).offset(skip).limit(limit)
-    )
-    return result.all()
+    columns = get_field_columns(models.Block, selected_fields)
+    return await get_rows(db, select(*columns).filter(*filters).order_by(*ordering).offset(skip).limit(limit))
 
 
 async def create_block(db: AsyncSession, block: schemas.BlockBase):
     try:
         db_block = models.Block(**block.model_dump())
         db.add(db_block)
+        await region_path_service.add_region_path(db, LevelEnum.BLOCK, db_block.id, db_block.name, db_block.district_id)
+        region_tree_service.add_region_node(db, LevelEnum.BLOCK, db_block.id, db_block.name, db_block.district_id)
         await db.commit()
         await db.refresh(db_block)
     except Exception as e:
-        print(str(e))
+        logger.warning(str(e))
         raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
     return db_block
 
@@ -56,10 +60,12 @@ async def update_block(db: AsyncSession, block_id: str, block: schemas.BlockUpda
         for key, value in block.model_dump(exclude_none=True).items():
             setattr(db_block, key, value)
 
+        await region_path_service.update_region_path(db, LevelEnum.BLOCK, db_block.id, db_block.name, db_block.district_id)
+        region_tree_service.update_region_node(db, LevelEnum.BLOCK, db_block.id, db_block.name, db_block.district_id)
         await db.commit()
         await db.refresh(db_block)
     except Exception as e:
-        print(str(e))
+        logger.warning(str(e))
         raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
     return {"message": BLOCK_UPDATE_SUCCESSFUL}
 
@@ -72,6 +78,8 @@ async def delete_block(db: AsyncSession, block_id: str):
         if not db_block:
             raise HTTPException(status_code=404, detail=BLOCK_DOES_NOT_EXIST_ERROR)
 
+        await region_path_service.delete_region_path(db, LevelEnum.BLOCK, block_id)
+        region_tree_service.delete_region_node(db, LevelEnum.BLOCK, block_id)
         await db.delete(db_block)
         await db.commit()
     except Exception as e:
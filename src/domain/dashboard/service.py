@@ -0,0 +1,132 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func, literal, union_all
+from typing import Optional
+import asyncio
+from ..ilpuser.models import ILPUser
+from ..role.models import Role
+from ..role_assignment.models import UserRole
+from ..state.models import State
+from ..zone.models import Zone
+from ..district.models import District
+from ..school.models import School, Class
+from ..block.models import Block
+from ...collection_versions import get_collection_versions
+from ...database import AsyncSessionLocal
+
+###
+# The summary is kept as a snapshot tagged with the "dashboard" collection version (see
+# src/collection_versions.py), which every commit writing to a table it counts bumps, whichever
+# worker made it. A request costs one primary key lookup while the version is unchanged; once it
+# moves, the summary's queries run concurrently, each on a session of its own.
+###
+
+_summary: Optional[dict] = None
+_summary_version: Optional[int] = None
+_summary_lock = asyncio.Lock()
+
+
+async def get_dashboard_summary(db: AsyncSession) -> dict:
+    global _summary, _summary_version
+    version = (await get_collection_versions(db, ("dashboard",)))["dashboard"]
+    if version == _summary_version:
+        return _summary
+
+    async with _summary_lock:
+        # Concurrent requests wait for the one that is already rebuilding the snapshot
+        if version == _summary_version:
+            return _summary
+        summary = await _load_dashboard_summary()
+        # The version was read before the queries ran, so a write that commits meanwhile moves it
+        # past this tag and the next request rebuilds the snapshot
+        if _summary_version is None or version > _summary_version:
+            _summary, _summary_version = summary, version
+        return summary
+
+
+async def _fetch_all(statement) -> list:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(statement)
+        return result.all()
+
+
+async def _load_dashboard_summary() -> dict:
+    # 1. Every count in one statement
+    counts_query = select(
+        select(func.count()).select_from(ILPUser).where(ILPUser.is_active == True).scalar_subquery().label("active_users"),
+        select(func.count()).select_from(State).scalar_subquery().label("states"),
+        select(func.count()).select_from(Zone).scalar_subquery().label("zones"),
+        select(func.count()).select_from(District).scalar_subquery().label("districts"),
+        select(func.count()).select_from(Block).scalar_subquery().label("blocks"),
+        select(func.count()).select_from(School).scalar_subquery().label("schools"),
+        select(func.count()).select_from(Class).scalar_subquery().label("classes"),
+    )
+
+    # 2. Role Distribution
+    role_dist_query = (
+        select(Role.name, func.count())
+        .select_from(Role)
+        .join(UserRole, Role.id == UserRole.role_id)
+        .group_by(Role.name)
+    )
+
+    # 3. Recent Regions (latest from all region levels)
+    region_union = union_all(
+        select(State.name.label("name"), literal("state").label("type"), State.created_at.label("created_at")),
+        select(Zone.name.label("name"), literal("zone").label("type"), Zone.created_at.label("created_at")),
+        select(District.name.label("name"), literal("district").label("type"), District.created_at.label("created_at")),
+        select(Block.name.label("name"), literal("block").label("type"), Block.created_at.label("created_at")),
+    ).subquery()
+    recent_regions_query = (
+        select(region_union.c.name, region_union.c.type, region_union.c.created_at)
+        .order_by(region_union.c.created_at.desc())
+        .limit(10)
+    )
+
+    # 4. Recent Schools (10 latest)
+    recent_schools_query = (
+        select(School.name.label("name"), School.city.label("city"), School.created_at.label("created_at"))
+        .order_by(School.created_at.desc())
+        .limit(10)
+    )
+
+    count_rows, role_rows, region_rows, school_rows = await asyncio.gather(
+        _fetch_all(counts_query), _fetch_all(role_dist_query), _fetch_all(recent_regions_query), _fetch_all(recent_schools_query),
+    )
+    counts = count_rows[0]
+    roles = [{"role": r[0], "count": r[1]} for r in role_rows]
+    recent_regions = [
+        {
+            "name": row.name,
+            "type": row.type,
+            "created_at": row.created_at.isoformat() if row.created_at else None
+        }
+        for row in region_rows
+    ]
+    recent_schools = [
+        {
+            "name": row.name,
+            "city": row.city,
+            "created_at": row.created_at.isoformat() if row.created_at else None
+        }
+        for row in school_rows
+    ]
+
+    summary = {
+        "active_users": counts.active_users,
+        "role_distribution": roles,
+        "region_counts": {
+            "states": counts.states,
+            "zones": counts.zones,
+            "districts": counts.districts,
+            "blocks": counts.blocks
+        },
+        "recent_regions": recent_regions,
+        "school_counts": {
+            "schools": counts.schools,
+            "classes": counts.classes
+        },
+        "recent_schools": recent_schools
+    }
+
+    return summary
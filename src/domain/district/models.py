@@ -11,7 +11,7 @@ class District(Base):
     id = Column(String, primary_key=True)
     name = Column(String, nullable=False)
     description = Column(String)
-    zone_id = Column(String, ForeignKey("zones.id"), nullable=False)  # Enforce foreign key
+    zone_id = Column(String, ForeignKey("zones.id"), nullable=False, index=True)  # Enforce foreign key
 
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=text("CURRENT_TIMESTAMP"))
     last_updated_at = Column(DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP"), onupdate=datetime.utcnow)
@@ -3,11 +3,16 @@ from sqlalchemy.future import select
 from sqlalchemy import func
 import re
 from . import models, schemas
+from ...rows import get_response_columns, get_field_columns, get_rows
+from ..region_path import service as region_path_service
+from ..region_tree import service as region_tree_service
+from ..role_assignment.models import LevelEnum
 from fastapi import HTTPException
 from resources.strings import (
     DISTRICT_CREATE_SUCCESSFUL, DISTRICT_UPDATE_SUCCESSFUL,
     DISTRICT_DELETE_SUCCESSFUL, DISTRICT_DOES_NOT_EXIST_ERROR
 )
+from logger import logger
 
 
 async def get_district(db: AsyncSession, district_id: str):
@@ -21,26 +26,25 @@ async def get_district_by_name(db: AsyncSession, name: str):
     return result.scalar()
 
 async def get_districts(db: AsyncSession, skip: int = 0, limit: int = 100):
-    result = await db.execute(select(models.District).offset(skip).limit(limit))
-    return result.scalars().all()
+    columns = get_response_columns(models.District, schemas.DistrictResponse)
+    return await get_rows(db, select(*columns).offset(skip).limit(limit))
 
 
 async def get_districts_by_params(db: AsyncSession, selected_fields: list, filters: list, ordering: list, skip: int = 0, limit: int = 100):
-    orm_attributes = [getattr(models.District, field) for field in selected_fields]
-    result = await db.execute(
-        select(*orm_attributes).filter(*filters).order_by(*ordering).offset(skip).limit(limit)
-    )
-    return result.all()
+    columns = get_field_columns(models.District, selected_fields)
+    return await get_rows(db, select(*columns).filter(*filters).order_by(*ordering).offset(skip).limit(limit))
 
 
 async def create_district(db: AsyncSession, district: schemas.DistrictBase):
     try:
         db_district = models.District(**district.model_dump())
         db.add(db_district)
+        await region_path_service.add_region_path(db, LevelEnum.DISTRICT, db_district.id, db_district.name, db_district.zone_id)
+        region_tree_service.add_region_node(db, LevelEnum.DISTRICT, db_district.id, db_district.name, db_district.zone_id)
         await db.commit()
         await db.refresh(db_district)
     except Exception as e:
-        print(str(e))
+        logger.warning(str(e))
         raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
     return db_district
 
@@ -56,10 +60,12 @@ async def update_district(db: AsyncSession, district_id: str, district: schemas.
         for key, value in district.model_dump(exclude_none=True).items():
             setattr(db_district, key, value)
 
+        await region_path_service.update_region_path(db, LevelEnum.DISTRICT, db_district.id, db_district.name, db_district.zone_id)
+        region_tree_service.update_region_node(db, LevelEnum.DISTRICT, db_district.id, db_district.name, db_district.zone_id)
         await db.commit()
         await db.refresh(db_district)
     except Exception as e:
-        print(str(e))
+        logger.warning(str(e))
         raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
     return {"message": DISTRICT_UPDATE_SUCCESSFUL}
 
@@ -72,6 +78,8 @@ async def delete_district(db: AsyncSession, district_id: str):
         if not db_district:
             raise HTTPException(status_code=404, detail=DISTRICT_DOES_NOT_EXIST_ERROR)
 
+        await region_path_service.delete_region_path(db, LevelEnum.DISTRICT, district_id)
+        region_tree_service.delete_region_node(db, LevelEnum.DISTRICT, district_id)
         await db.delete(db_district)
         await db.commit()
     except Exception as e:
@@ -0,0 +1,8 @@
+from typing import Optional, List, Dict, Any
+from pydantic import BaseModel
+
+class ExportQueryRequest(BaseModel):
+    # The *ByParams filter DSL without paging: every matching row is exported
+    fields: Optional[List[str]] = None
+    filters: Optional[Dict[str, Any]] = None
+    order_by: Optional[List[str]] = None
@@ -0,0 +1,73 @@
+from sqlalchemy.future import select
+from datetime import date, datetime, time
+from decimal import Decimal
+import csv
+import enum
+import io
+import json
+from ...config import EXPORT_BATCH_SIZE
+from ...database import AsyncSessionLocal
+from logger import logger
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def get_export_statement(model, selected_fields: list, filters: list, ordering: list):
+    ''' The *ByParams query without a page: selected columns, filters and ordering '''
+    orm_attributes = [getattr(model, field) for field in selected_fields]
+    return select(*orm_attributes).filter(*filters).order_by(*ordering)
+
+
+async def stream_export(statement, selected_fields: list, export_format: str):
+    '''
+    Encode the rows of statement as CSV or NDJSON, EXPORT_BATCH_SIZE rows per chunk.
+
+    The export runs on its own session because a StreamingResponse body is sent after the
+    request's session has been closed. Rows come off a server-side cursor and each batch is
+    encoded and handed to the client before the next one is fetched, so memory stays flat
+    whatever the size of the result.
+    '''
+    encode_rows = _encode_csv_rows if export_format == "csv" else _encode_ndjson_rows
+    if export_format == "csv":
+        yield _encode_csv_rows([selected_fields], selected_fields)
+
+    exported = 0
+    async with AsyncSessionLocal() as db:
+        try:
+            result = await db.stream(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            async for rows in result.partitions():
+                exported += len(rows)
+                yield encode_rows([_get_export_values(row) for row in rows], selected_fields)
+        except Exception:
+            # Headers are already sent, so the client only sees a truncated body
+            logger.exception(f"Export failed after {exported} rows")
+            raise
+    logger.info(f"Exported {exported} rows as {export_format}")
+
+
+def _get_export_values(row) -> list:
+    return [_get_export_value(value) for value in row]
+
+
+def _get_export_value(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _encode_csv_rows(rows: list, selected_fields: list) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _encode_ndjson_rows(rows: list, selected_fields: list) -> bytes:
+    lines = [json.dumps(dict(zip(selected_fields, row)), default=str) for row in rows]
+    return ("\n".join(lines) + "\n").encode("utf-8")
@@ -1,32 +1,81 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, text
+from sqlalchemy import func, text, insert
 from fastapi import HTTPException, UploadFile,  File, Depends, HTTPException, Form
+from concurrent.futures import ThreadPoolExecutor
+from pydantic import ValidationError
+import asyncio
 import bcrypt
+import uuid
+import numpy as np
+import pandas as pd
 import re
 import shutil
 import os
 from . import models, schemas
+from ...rows import get_response_columns, get_field_columns, get_rows, get_rows_by_ids
+from ...config import PASSWORD_HASH_ROUNDS, PASSWORD_HASH_WORKERS
 from ..role_assignment.models import UserRole
 from ..role.models import Role
-from ..role_assignment.service import get_user_roles_with_hierarchy, serialize_user_role
+from ..role_assignment.service import get_users_roles_with_hierarchy
+from ..role_assignment.schemas import UserRoleBase
+from ..role.models import RoleEnum
+from ..role.service import get_role_ids
+from ..school.models import School
 from resources.strings import (
     USER_DOES_NOT_EXIST_ERROR, USER_DELETE_SUCCESSFUL,
     USER_UPDATE_SUCCESSFUL, AUTHENTICATION_FAILED_ERROR
 )
+from logger import logger
 
 UPLOAD_DIR = "uploads/profile_pics"
+
+# Spreadsheet columns of a bulk user upload
+BULK_USER_COLUMNS = {
+    "First Name", "Last Name", "Email", "Username",
+    "Phone1", "Phone2", "Gender", "Address", "City", "State",
+    "Country", "Pincode", "School Dise Code", "Role",
+}
 os.makedirs(UPLOAD_DIR, exist_ok=True) 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+# bcrypt spends 100-300 ms of CPU per call; it runs on this bounded pool so the event loop keeps serving requests
+_password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+
+# Hashes of shared default passwords, computed once per process
+_shared_password_hashes: dict = {}
+
+
+def _hash_password(password: str) -> str:
+    salt = bcrypt.gensalt(rounds=PASSWORD_HASH_ROUNDS)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+
+def _check_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
 
 
+async def hash_password(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, _hash_password, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, _check_password, plain_password, hashed_password)
+
+
+async def get_shared_password_hash(password: str) -> str:
+    ''' Hash of a default password handed to many users (e.g. bulk imports), reused instead of rehashed per user '''
+    if password not in _shared_password_hashes:
+        _shared_password_hashes[password] = await hash_password(password)
+    return _shared_password_hashes[password]
+
+
 async def login_user(db: AsyncSession, email: str, password: str):
     result = await db.execute(select(models.ILPUser).filter(func.lower(models.ILPUser.email) == email.lower()))
     user = result.scalar()
 
-    if not user or not verify_password(password, user.password):
+    if not user or not await verify_password(password, user.password):
         raise HTTPException(status_code=401, detail=AUTHENTICATION_FAILED_ERROR)
 
     return user
@@ -36,23 +85,23 @@ async def get_user(db: AsyncSession, user_id: str):
     result = await db.execute(select(models.ILPUser).filter(models.ILPUser.id == user_id))
     return result.scalar()
 
+async def get_users_by_ids(db: AsyncSession, user_ids: list) -> dict:
+    return await get_rows_by_ids(db, models.ILPUser, schemas.ILPUserResponse, user_ids)
+
 
 async def get_user_by_email(db: AsyncSession, email: str):    
     result = await db.execute(select(models.ILPUser).filter(func.lower(models.ILPUser.email) == email.lower()))
     return result.scalar()
 
 
-async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100):    
-    result = await db.execute(select(models.ILPUser).offset(skip).limit(limit))    
-    return result.scalars().all()
+async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100):
+    columns = get_response_columns(models.ILPUser, schemas.ILPUserResponse)
+    return await get_rows(db, select(*columns).offset(skip).limit(limit))
 
 
 async def get_users_by_params(db: AsyncSession, selected_fields: list, filters: list, ordering: list, skip: int = 0, limit: int = 100):
-    orm_attributes = [getattr(models.ILPUser, field) for field in selected_fields]
-    result = await db.execute(
-        select(*orm_attributes).filter(*filters).order_by(*ordering).offset(skip).limit(limit)
-    )
-    return result.scalars().all()
+    columns = get_field_columns(models.ILPUser, selected_fields)
+    return await get_rows(db, select(*columns).filter(*filters).order_by(*ordering).offset(skip).limit(limit))
 
 async def get_users_with_roles_by_params(
     db: AsyncSession,
@@ -76,27 +125,20 @@ async def get_users_with_roles_by_params(
     ).distinct()  # Distinct to avoid duplicate users due to joins
 
     result = await db.execute(query)
-    users = result.all()
+    users = [dict(row._mapping) for row in result.all()]
 
-    enriched_users = []
-    for row in users:
-        user_dict = row._mapping if hasattr(row, "_mapping") else row.__dict__
-        user_id = user_dict.get("id")
+    # Fetch role + hierarchy for every user on the page in one go
+    user_ids = [user["id"] for user in users if user.get("id")]
+    roles_by_user = await get_users_roles_with_hierarchy(db, user_ids)
 
-        # Fetch role + hierarchy for this user
-        roles = await get_user_roles_with_hierarchy(db, user_id)
-        roles_data = [serialize_user_role(role) for role in roles]
-
-        enriched_users.append({
-            **user_dict,
-            "roles": roles_data
-        })
-
-    return enriched_users
+    return [
+        {**user, "roles": roles_by_user.get(user.get("id"), [])}
+        for user in users
+    ]
 
 async def get_users_with_roles_by_params_count(db: AsyncSession, filters: list  # This should include filters from ILPUser and joins (role name, user name etc.)
 ) -> int:
-    print("fileter ", filters)
+    logger.debug(f"User count filters {filters}")
     stmt = (
         select(func.count(func.distinct(models.ILPUser.id)))
         .select_from(models.ILPUser)
@@ -125,7 +167,7 @@ async def create_user(db: AsyncSession, user: schemas.ILPUserCreate):
         await db.commit()
         await db.refresh(db_user)
     except Exception as e:
-        print("Error creating db entry for user -", str(e))
+        logger.warning(f"Error creating db entry for user - {e}")
         raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
 
     return db_user
@@ -175,6 +217,148 @@ async def delete_user(db: AsyncSession, user_id: str):
 
     return {"message": USER_DELETE_SUCCESSFUL}
 
+async def bulk_import_users(db: AsyncSession, df: pd.DataFrame, hashed_password: str) -> dict:
+    '''
+    Import a bulk user upload as a set: the frame is validated column-wise, existing emails and
+    school DISE codes are resolved with one IN query each, and all users and their school role
+    assignments are inserted in batches inside a single transaction.
+    Returns the same per-row report as the row-by-row importer did.
+    '''
+    rows = _prepare_bulk_users(df)
+    report = {"created": 0, "rejected": 0, "errors": []}
+    row_errors = []  # (row number, message), sorted into sheet order at the end
+
+    # Stage 1: column-wise validation, first failing check wins as it did row by row
+    checks = [
+        ((rows["first_name"] == "") | (rows["last_name"] == ""), "First Name or Last Name is missing"),
+        (rows["email"] == "", "Email is missing"),
+        (~rows["role"].isin([role.value for role in RoleEnum]), "Invalid role '{role}'"),
+        ((rows["phone1"] == "") & (rows["phone2"] == ""), "Both phone numbers missing"),
+        (rows["phone1"] == "", "Phone1 is missing"),
+        (~rows["gender"].isin([gender.value for gender in models.GenderEnum]), "Invalid gender '{gender}'"),
+        (rows["dise_code"].isna(), "School Dise Code is missing"),
+    ]
+    rejected_by = np.select([mask.to_numpy() for mask, _ in checks], list(range(len(checks))), default=-1)
+    valid = rejected_by == -1
+    for position in np.flatnonzero(~valid):
+        row = rows.iloc[position]
+        row_errors.append((row["row_number"], checks[rejected_by[position]][1].format(**row)))
+
+    # Stage 2: one lookup for emails already registered; later duplicates inside the sheet count as existing too
+    email_keys = rows["email"].str.lower()
+    candidate_emails = list(email_keys[valid].unique())
+    existing_emails = set()
+    if candidate_emails:
+        result = await db.execute(
+            select(func.lower(models.ILPUser.email)).filter(func.lower(models.ILPUser.email).in_(candidate_emails))
+        )
+        existing_emails = set(result.scalars().all())
+    duplicate = valid & (email_keys.isin(existing_emails) | email_keys.where(valid).duplicated()).to_numpy()
+    for position in np.flatnonzero(duplicate):
+        row = rows.iloc[position]
+        row_errors.append((row["row_number"], f"User with email '{row['email']}' or username '{row['username']}' already exists"))
+    valid &= ~duplicate
+
+    # Stage 3: one lookup for every referenced school and the cached role ids
+    dise_codes = [int(code) for code in rows["dise_code"][valid].unique()]
+    school_ids = {}
+    if dise_codes:
+        result = await db.execute(select(School.dise_code, School.id).filter(School.dise_code.in_(dise_codes)))
+        school_ids = dict(result.all())
+    role_ids = await get_role_ids(db)
+
+    # Stage 4: build the insert batches
+    users_to_insert = []
+    user_roles_to_insert = []
+    for row in rows[valid].to_dict("records"):
+        full_name = row["first_name"] + " " + row["last_name"]
+        try:
+            user = schemas.ILPUserCreate(
+                id=str(uuid.uuid4()),
+                first_name=row["first_name"],
+                last_name=row["last_name"],
+                profile_pic_file=None,  # No file upload in bulk upload
+                email=row["email"],
+                password=hashed_password,
+                username=row["username"],
+                phone1=row["phone1"],
+                phone2=row["phone2"],
+                gender=row["gender"],
+                address=row["address"],
+                city=row["city"],
+                state=row["state"],
+                country=row["country"],
+                pincode=row["pincode"],
+            )
+        except ValidationError as e:
+            report["rejected"] += 1
+            row_errors.append((row["row_number"], "; ".join(f'{".".join(map(str, error["loc"]))}: {error["msg"]}' for error in e.errors())))
+            continue
+
+        user_dict = user.model_dump()
+        user_dict.pop("profile_pic_file", None)
+        users_to_insert.append(user_dict)
+        report["created"] += 1
+
+        school_id = school_ids.get(int(row["dise_code"]))
+        if not school_id:
+            report["rejected"] += 1
+            row_errors.append((row["row_number"], f"A school with dise code, '{int(row['dise_code'])}' doesnt exist. So, role is not created for user '{full_name}'"))
+            continue
+        role_id = role_ids.get(RoleEnum(row["role"]))
+        if not role_id:
+            row_errors.append((row["row_number"], f"A role with name, '{row['role']}' doesnt exist. So, role is not created for user '{full_name}'"))
+            continue
+        user_role = UserRoleBase(
+            id=str(uuid.uuid4()), user_id=user.id, role_id=role_id, access_type="WRITE", level="SCHOOL", level_id=school_id
+        )
+        user_roles_to_insert.append(user_role.model_dump())
+
+    report["rejected"] += int((~valid).sum())
+
+    # Stage 5: batched inserts, committed together
+    try:
+        if users_to_insert:
+            await db.execute(insert(models.ILPUser), users_to_insert)
+        if user_roles_to_insert:
+            await db.execute(insert(UserRole), user_roles_to_insert)
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
+
+    report["errors"] = [f"Row {row_number}: {message}" for row_number, message in sorted(row_errors, key=lambda error: error[0])]
+    return {"status": "completed", "total_rows": len(df), **report}
+
+
+def _prepare_bulk_users(df: pd.DataFrame) -> pd.DataFrame:
+    ''' Normalise the upload columns: blanks/NaN become "", DISE codes become nullable integers '''
+    def text_column(name: str) -> pd.Series:
+        return df[name].fillna("").astype(str).str.strip()
+
+    rows = pd.DataFrame({
+        "row_number": df.index.to_numpy() + 2,  # sheet row after the header; chunks keep the frame's index
+        "first_name": text_column("First Name"),
+        "last_name": text_column("Last Name"),
+        "email": text_column("Email"),
+        "username": text_column("Username"),
+        "role": text_column("Role"),
+        "phone1": text_column("Phone1"),
+        "phone2": text_column("Phone2"),
+        "gender": text_column("Gender"),
+        "address": text_column("Address"),
+        "city": text_column("City"),
+        "state": text_column("State"),
+        "country": text_column("Country"),
+        "pincode": text_column("Pincode"),
+        "dise_code": pd.to_numeric(text_column("School Dise Code"), errors="coerce").astype("Int64"),
+    }).reset_index(drop=True)
+    # Default username if not provided
+    missing_username = rows["username"] == ""
+    rows.loc[missing_username, "username"] = rows["first_name"].str.lower() + rows["last_name"].str.lower()
+    return rows
+
+
 async def get_enum_values(db: AsyncSession, enum_type_name:str):
     query = text(f"""
         SELECT unnest(enum_range(NULL::{enum_type_name})) AS value;
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, JSON, text, Enum as SqlEnum
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from enum import Enum
+from ...database import Base
+
+class ImportJobStatusEnum(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+
+    id = Column(String, primary_key=True)
+    kind = Column(String, nullable=False)  # What is being imported, e.g. "users"
+    file_name = Column(String)
+    status = Column(SqlEnum(ImportJobStatusEnum, name="importjobstatusenum"), nullable=False, default=ImportJobStatusEnum.PENDING)
+
+    total_rows = Column(Integer, nullable=False, default=0)
+    processed_rows = Column(Integer, nullable=False, default=0)
+    created = Column(Integer, nullable=False, default=0)
+    rejected = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON, nullable=False, default=list)  # Per-row error messages of the import report
+    failure_reason = Column(String)  # Set when the job stops before processing every row
+
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=text("CURRENT_TIMESTAMP"))
+    last_updated_at = Column(DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP"), onupdate=datetime.utcnow)
+    finished_at = Column(DateTime(timezone=True))
+
+    created_by = Column(String, ForeignKey("ilp_users.id"))
+
+    creator = relationship("ILPUser", foreign_keys=[created_by])
+
+    @classmethod
+    def get_valid_fields(cls):
+        return {column.name: column for column in cls.__table__.columns}
@@ -0,0 +1,26 @@
+from typing import List, Optional
+from pydantic import BaseModel
+from datetime import datetime
+
+class ImportJobBase(BaseModel):
+    id: Optional[str] = None
+    kind: str
+    file_name: Optional[str] = None
+    total_rows: int = 0
+    created_by: Optional[str] = "54be662c-eab6-4e60-8c43-40cd744d1fbd"
+
+class ImportJobResponse(BaseModel):
+    id: Optional[str] = None
+    kind: Optional[str] = None
+    file_name: Optional[str] = None
+    status: Optional[str] = None
+    total_rows: Optional[int] = None
+    processed_rows: Optional[int] = None
+    created: Optional[int] = None
+    rejected: Optional[int] = None
+    errors: List[str] = []
+    failure_reason: Optional[str] = None
+    created_at: Optional[datetime] = None
+    last_updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_by: Optional[str] = None
@@ -0,0 +1,91 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import update
+from fastapi import HTTPException
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import pandas as pd
+import re
+from . import models, schemas
+from ...config import IMPORT_JOB_CHUNK_SIZE, IMPORT_JOB_STALE_SECONDS
+from ...database import AsyncSessionLocal
+from ..ilpuser import service as ilpuser_service
+from resources.strings import IMPORT_JOB_STALLED_ERROR
+from logger import logger
+
+async def get_import_job(db: AsyncSession, job_id: str):
+    result = await db.execute(select(models.ImportJob).filter(models.ImportJob.id == job_id))
+    return result.scalar()
+
+async def create_import_job(db: AsyncSession, job: schemas.ImportJobBase):
+    try:
+        db_job = models.ImportJob(**job.model_dump(), status=models.ImportJobStatusEnum.PENDING)
+        db.add(db_job)
+        await db.commit()
+        await db.refresh(db_job)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
+
+    return db_job
+
+async def run_user_import_job(job_id: str, df: pd.DataFrame, hashed_password: str):
+    '''
+    Background worker for a queued bulk user upload. Runs outside the request with its own
+    session, importing and committing IMPORT_JOB_CHUNK_SIZE rows at a time and recording the
+    running totals on the job after every chunk so GET /importJobs/{id} can report progress.
+    '''
+    async with AsyncSessionLocal() as db:
+        db_job = await get_import_job(db, job_id)
+        db_job.status = models.ImportJobStatusEnum.RUNNING
+        await db.commit()
+
+        try:
+            for start in range(0, len(df), IMPORT_JOB_CHUNK_SIZE):
+                chunk = df.iloc[start:start + IMPORT_JOB_CHUNK_SIZE]
+                report = await ilpuser_service.bulk_import_users(db, chunk, hashed_password)
+
+                db_job.processed_rows += len(chunk)
+                db_job.created += report["created"]
+                db_job.rejected += report["rejected"]
+                db_job.errors = db_job.errors + report["errors"]  # reassigned so the JSON column is flagged dirty
+                await db.commit()
+
+            db_job.status = models.ImportJobStatusEnum.COMPLETED
+        except Exception as e:
+            await db.rollback()
+            db_job.status = models.ImportJobStatusEnum.FAILED
+            db_job.failure_reason = e.detail if isinstance(e, HTTPException) else str(e)
+
+        db_job.finished_at = datetime.now(timezone.utc)
+        await db.commit()
+
+async def expire_stale_import_jobs(db: AsyncSession, job_id: Optional[str] = None) -> int:
+    '''
+    Mark PENDING and RUNNING jobs, or just job_id, as FAILED once they have gone
+    IMPORT_JOB_STALE_SECONDS without reporting progress. A job runs as a background task of the
+    worker that queued it and touches last_updated_at with every chunk it commits, so a job that
+    quiet was left behind by a worker that stopped or restarted. Jobs still running elsewhere
+    are left alone.
+    '''
+    now = datetime.now(timezone.utc)
+    query = (
+        update(models.ImportJob)
+        .where(
+            models.ImportJob.status.in_([models.ImportJobStatusEnum.PENDING, models.ImportJobStatusEnum.RUNNING]),
+            models.ImportJob.last_updated_at < now - timedelta(seconds=IMPORT_JOB_STALE_SECONDS),
+        )
+        .values(status=models.ImportJobStatusEnum.FAILED, failure_reason=IMPORT_JOB_STALLED_ERROR, finished_at=now, last_updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    if job_id is not None:
+        query = query.where(models.ImportJob.id == job_id)
+    result = await db.execute(query)
+    await db.commit()
+
+    if result.rowcount:
+        logger.warning(f"Marked {result.rowcount} stalled import job(s) as failed")
+    return result.rowcount
+
+def _extract_detail_text(error_message: str) -> str:
+    match = re.search(r"DETAIL:\s+(.*)", error_message)
+    return match.group(1) if match else "Error occurred while processing the request"
@@ -7,6 +7,7 @@ from resources.strings import (
     ORG_DOES_NOT_EXIST_ERROR, ORG_DELETE_SUCCESSFUL,
     ORG_CREATE_SUCCESSFUL, ORG_UPDATE_SUCCESSFUL
 )
+from logger import logger
 
 
 async def get_organization(db: AsyncSession, org_id: str):
@@ -24,7 +25,7 @@ async def get_organizations_by_params(db: AsyncSession, selected_fields: list, f
     result = await db.execute(
         select(*orm_attributes).filter(*filters).order_by(*ordering).offset(skip).limit(limit)
     )
-    return result.scalars().all()
+    return result.all()
 
 
 async def create_organization(db: AsyncSession, organization: schemas.OrganizationBase):
@@ -34,7 +35,7 @@ async def create_organization(db: AsyncSession, organization: schemas.Organizati
         await db.commit()
         await db.refresh(db_organization)
     except Exception as e:
-        print("Error creating db entry for organization -", str(e))
+        logger.warning(f"Error creating db entry for organization - {e}")
         raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
 
     return db_organization
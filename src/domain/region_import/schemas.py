@@ -0,0 +1,24 @@
+from typing import List, Optional
+from pydantic import BaseModel
+
+class BlockImport(BaseModel):
+    name: str
+    description: Optional[str] = None
+
+class DistrictImport(BaseModel):
+    name: str
+    description: Optional[str] = None
+    blocks: List[BlockImport] = []
+
+class ZoneImport(BaseModel):
+    name: str
+    description: Optional[str] = None
+    districts: List[DistrictImport] = []
+
+class StateImport(BaseModel):
+    name: str
+    description: Optional[str] = None
+    zones: List[ZoneImport] = []
+
+class RegionImportRequest(BaseModel):
+    states: List[StateImport]
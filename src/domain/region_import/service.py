@@ -0,0 +1,206 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func, insert
+from fastapi import HTTPException
+import pandas as pd
+import re
+import uuid
+from . import schemas
+from ..region_path import service as region_path_service
+from ..region_path.models import RegionPath
+from ..region_tree import service as region_tree_service
+from ..role_assignment.models import LevelEnum
+from ..state import models as state_models, schemas as state_schemas
+from ..zone import models as zone_models, schemas as zone_schemas
+from ..district import models as district_models, schemas as district_schemas
+from ..block import models as block_models, schemas as block_schemas
+from logger import logger
+
+# Import levels from the root down: level, model, schema, parent id column and upload column
+REGION_IMPORT_LEVELS = [
+    (LevelEnum.STATE, state_models.State, state_schemas.StateBase, None, "State"),
+    (LevelEnum.ZONE, zone_models.Zone, zone_schemas.ZoneBase, "state_id", "Zone"),
+    (LevelEnum.DISTRICT, district_models.District, district_schemas.DistrictBase, "zone_id", "District"),
+    (LevelEnum.BLOCK, block_models.Block, block_schemas.BlockBase, "district_id", "Block"),
+]
+BULK_REGION_COLUMNS = {"State", "Zone", "District", "Block"}
+
+
+def get_region_rows_from_frame(df: pd.DataFrame) -> list:
+    '''
+    One region path per sheet row: State, Zone, District and Block columns, where trailing
+    columns may be blank. An optional Description column describes the deepest region of the row.
+    '''
+    columns = [column for _, _, _, _, column in REGION_IMPORT_LEVELS]
+    names = df[columns].fillna("").astype(str).apply(lambda column: column.str.strip())
+    descriptions = df["Description"].fillna("").astype(str).str.strip() if "Description" in df.columns else None
+
+    rows = []
+    for position, (row_number, values) in enumerate(zip(df.index + 2, names.itertuples(index=False))):
+        path = list(values)
+        depth = max((i + 1 for i, name in enumerate(path) if name), default=0)
+        row_descriptions = [None] * len(path)
+        if descriptions is not None and depth and descriptions.iloc[position]:
+            row_descriptions[depth - 1] = descriptions.iloc[position]
+        rows.append({"row": f"Row {row_number}", "names": path[:depth], "descriptions": row_descriptions[:depth]})
+    return rows
+
+
+def get_region_rows_from_tree(request: schemas.RegionImportRequest) -> list:
+    ''' One region path per node of the nested import, labelled by its names '''
+    rows = []
+
+    def add_row(path: list):
+        rows.append({
+            "row": " / ".join(node.name for node in path),
+            "names": [node.name.strip() for node in path],
+            "descriptions": [node.description for node in path],
+        })
+
+    for state in request.states:
+        add_row([state])
+        for zone in state.zones:
+            add_row([state, zone])
+            for district in zone.districts:
+                add_row([state, zone, district])
+                for block in district.blocks:
+                    add_row([state, zone, district, block])
+    return rows
+
+
+async def bulk_import_regions(db: AsyncSession, rows: list) -> dict:
+    '''
+    Import a region tree as a set. Regions are matched by case-insensitive name per level, the
+    same rule the single-row create endpoints enforce, so existing regions are reused as parents
+    instead of being created again. Each level is resolved with one IN query, and every new
+    region and its region path are inserted in batches inside a single transaction.
+    '''
+    row_errors = {}  # row label -> message, the first problem of a row wins
+    nodes = [{} for _ in REGION_IMPORT_LEVELS]  # per level: path key -> node
+
+    # Stage 1: collect the distinct regions of every level
+    for row in rows:
+        names = row["names"]
+        if "" in names:
+            missing = REGION_IMPORT_LEVELS[names.index("")][4]
+            row_errors.setdefault(row["row"], f"{missing} is missing")
+            continue
+        for depth, name in enumerate(names):
+            key = tuple(value.lower() for value in names[:depth + 1])
+            node = nodes[depth].setdefault(key, {"name": name, "description": None, "row": row["row"], "parent": key[:-1] or None})
+            if row["descriptions"][depth] and not node["description"]:
+                node["description"] = row["descriptions"][depth]
+
+    report = {
+        "created": {level.value.lower(): 0 for level, *_ in REGION_IMPORT_LEVELS},
+        "existing": {level.value.lower(): 0 for level, *_ in REGION_IMPORT_LEVELS},
+    }
+    regions_to_insert = []  # (model, rows) per level, in parent-first order
+    region_paths = {}       # region id -> path row, for new regions and the existing parents they hang from
+
+    # Stage 2: resolve one level at a time, parents first
+    for depth, (level, model, schema, parent_column, label) in enumerate(REGION_IMPORT_LEVELS):
+        level_nodes = nodes[depth]
+        if not level_nodes:
+            regions_to_insert.append((model, []))
+            continue
+
+        parent_label = REGION_IMPORT_LEVELS[depth - 1][4].lower() if depth else None
+        parents = nodes[depth - 1] if depth else {}
+
+        # Names are unique per level; the same name under two parents in one upload can't both be created
+        first_key_by_name = {}
+        for key, node in level_nodes.items():
+            first_key = first_key_by_name.setdefault(key[-1], key)
+            if first_key != key:
+                node["error"] = f"{label} '{node['name']}' appears under more than one {parent_label}"
+
+        # One lookup for the existing regions of this level
+        columns = [model.id, func.lower(model.name)]
+        if parent_column:
+            columns.append(getattr(model, parent_column))
+        result = await db.execute(select(*columns).filter(func.lower(model.name).in_(list(first_key_by_name))))
+        existing = {}
+        for region in result.all():
+            existing.setdefault(region[1], []).append(region)
+
+        new_rows = []
+        for key, node in level_nodes.items():
+            if "error" in node:
+                continue
+            parent = parents.get(node["parent"]) if parent_column else None
+            if parent_column and "id" not in parent:
+                node["error"] = f"Skipped because {parent_label} '{parent['name']}' was rejected"
+                continue
+
+            matches = existing.get(key[-1], [])
+            if matches:
+                match = next((region for region in matches if not parent_column or region[2] == parent["id"]), None)
+                if match is None:
+                    node["error"] = f"{label} '{node['name']}' already exists under a different {parent_label}"
+                    continue
+                node["id"] = match[0]
+                node["existing"] = True
+                report["existing"][level.value.lower()] += 1
+                continue
+
+            node["id"] = str(uuid.uuid4())
+            values = {"id": node["id"], "name": node["name"], "description": node["description"]}
+            if parent_column:
+                values[parent_column] = parent["id"]
+            # Validated above; the schema supplies the same defaults as the single-row endpoints.
+            # created_at is left to the database so rows get the import time.
+            new_rows.append(schema.model_construct(**values).model_dump(exclude={"created_at"}, warnings=False))
+            report["created"][level.value.lower()] += 1
+
+        regions_to_insert.append((model, new_rows))
+
+    # Stage 3: region paths of the new regions, built from their parents' paths
+    existing_parent_ids = {
+        nodes[depth - 1][node["parent"]]["id"]
+        for depth in range(1, len(REGION_IMPORT_LEVELS))
+        for node in nodes[depth].values()
+        if "id" in node and not node.get("existing") and nodes[depth - 1][node["parent"]].get("existing")
+    }
+    for region_id, path in (await region_path_service.get_region_paths(db, list(existing_parent_ids))).items():
+        region_paths[region_id] = {column.name: getattr(path, column.name) for column in RegionPath.__table__.columns}
+
+    paths_to_insert = []
+    for depth, (level, *_) in enumerate(REGION_IMPORT_LEVELS):
+        for node in nodes[depth].values():
+            if "id" not in node or node.get("existing"):
+                continue
+            parent_path = region_paths.get(nodes[depth - 1][node["parent"]]["id"], {}) if depth else {}
+            path = {column: parent_path.get(column) for ancestor, *_ in REGION_IMPORT_LEVELS[:depth] for column in region_path_service.get_path_columns(ancestor)}
+            id_column, name_column = region_path_service.get_path_columns(level)
+            path.update({"region_id": node["id"], "level": level.value, id_column: node["id"], name_column: node["name"]})
+            region_paths[node["id"]] = path
+            paths_to_insert.append(path)
+            region_tree_service.add_region_node(db, level, node["id"], node["name"], nodes[depth - 1][node["parent"]]["id"] if depth else None)
+
+    # Stage 4: batched inserts, committed together
+    try:
+        for model, new_rows in regions_to_insert:
+            if new_rows:
+                await db.execute(insert(model), new_rows)
+        if paths_to_insert:
+            await db.execute(insert(RegionPath), paths_to_insert)
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.warning(str(e))
+        raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
+
+    for level_nodes in nodes:
+        for node in level_nodes.values():
+            if "error" in node:
+                row_errors.setdefault(node["row"], node["error"])
+    # Report in upload order
+    errors = [f"{row['row']}: {row_errors[row['row']]}" for row in rows if row["row"] in row_errors]
+
+    return {"status": "completed", "total_rows": len(rows), **report, "rejected": len(errors), "errors": errors}
+
+
+def _extract_detail_text(error_message: str) -> str:
+    match = re.search(r"DETAIL:\s+(.*)", error_message)
+    return match.group(1) if match else "Error occurred while processing the request"
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, String, DateTime, text
+from datetime import datetime
+from ...database import Base
+
+
+class RegionPath(Base):
+    """
+    One row per region (state, zone, district, block, school or class) carrying the ids and
+    names of all its ancestors, so ancestor and descendant lookups are a single indexed read.
+    Maintained by the region services on every create, update and delete.
+    """
+    __tablename__ = "region_paths"
+
+    region_id = Column(String, primary_key=True)
+    level = Column(String, nullable=False)  # LevelEnum value of the region itself
+
+    state_id = Column(String, index=True)
+    state_name = Column(String)
+    zone_id = Column(String, index=True)
+    zone_name = Column(String)
+    district_id = Column(String, index=True)
+    district_name = Column(String)
+    block_id = Column(String, index=True)
+    block_name = Column(String)
+    school_id = Column(String, index=True)
+    school_name = Column(String)
+    class_id = Column(String)
+    class_name = Column(String)
+
+    last_updated_at = Column(DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP"), onupdate=datetime.utcnow)
+
+    @classmethod
+    def get_valid_fields(cls):
+        return {column.name: column for column in cls.__table__.columns}
@@ -0,0 +1,172 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import insert, update, delete, exists, literal, case
+from sqlalchemy.exc import IntegrityError
+from typing import Optional
+from . import models
+from ..role_assignment.models import LevelEnum
+from ..state.models import State
+from ..zone.models import Zone
+from ..district.models import District
+from ..block.models import Block
+from ..school.models import School, Class
+from logger import logger
+
+# Region levels from the root down, the order path columns are filled in
+REGION_HIERARCHY = [
+    LevelEnum.STATE,
+    LevelEnum.ZONE,
+    LevelEnum.DISTRICT,
+    LevelEnum.BLOCK,
+    LevelEnum.SCHOOL,
+    LevelEnum.CLASS,
+]
+
+
+def get_class_name(grade: str, section: Optional[str]) -> str:
+    return grade + " " + section if section else grade
+
+
+def get_path_columns(level: LevelEnum) -> list:
+    ''' Names of the id/name columns owned by a level '''
+    prefix = level.value.lower()
+    return [f"{prefix}_id", f"{prefix}_name"]
+
+
+async def get_region_path(db: AsyncSession, region_id: str):
+    result = await db.execute(select(models.RegionPath).filter(models.RegionPath.region_id == region_id))
+    return result.scalar()
+
+
+async def get_region_paths(db: AsyncSession, region_ids: list) -> dict:
+    if not region_ids:
+        return {}
+    result = await db.execute(select(models.RegionPath).filter(models.RegionPath.region_id.in_(region_ids)))
+    return {path.region_id: path for path in result.scalars().all()}
+
+
+async def get_descendant_ids(db: AsyncSession, level: LevelEnum, region_id: str, descendant_level: LevelEnum) -> list:
+    ''' Ids of every region at descendant_level below the given region '''
+    ancestor_column = getattr(models.RegionPath, get_path_columns(level)[0])
+    result = await db.execute(
+        select(models.RegionPath.region_id).filter(
+            ancestor_column == region_id,
+            models.RegionPath.level == descendant_level.value,
+        )
+    )
+    return result.scalars().all()
+
+
+async def add_region_path(db: AsyncSession, level: LevelEnum, region_id: str, name: str, parent_id: Optional[str] = None):
+    ''' Record the path of a newly created region. Runs inside the caller's transaction. '''
+    path = await _build_region_path(db, level, region_id, name, parent_id)
+    db.add(models.RegionPath(**path))
+
+
+async def update_region_path(db: AsyncSession, level: LevelEnum, region_id: str, name: str, parent_id: Optional[str] = None):
+    '''
+    Refresh the path of a renamed or re-parented region together with every descendant
+    path in one UPDATE. Runs inside the caller's transaction.
+    '''
+    path = await _build_region_path(db, level, region_id, name, parent_id)
+    values = {column: value for column, value in path.items() if column not in ("region_id", "level")}
+    own_id_column = getattr(models.RegionPath, get_path_columns(level)[0])
+    await db.execute(
+        update(models.RegionPath)
+        .where(own_id_column == region_id)
+        .values(**values)
+    )
+
+
+async def delete_region_path(db: AsyncSession, level: LevelEnum, region_id: str):
+    ''' Drop the path of a deleted region and of everything below it. Runs inside the caller's transaction. '''
+    own_id_column = getattr(models.RegionPath, get_path_columns(level)[0])
+    await db.execute(
+        delete(models.RegionPath)
+        .where(own_id_column == region_id)
+    )
+
+
+async def rebuild_region_paths(db: AsyncSession):
+    ''' Recompute the whole table from the region tables with one INSERT ... SELECT per level '''
+    await db.execute(delete(models.RegionPath))
+    for level, _, level_select in _get_level_selects():
+        await _insert_region_paths(db, level, level_select)
+
+
+async def ensure_region_paths(db: AsyncSession):
+    '''
+    Insert the paths of regions that have none, with one INSERT ... SELECT ... WHERE NOT EXISTS per
+    level: every region of a database created before region paths were maintained, and any region
+    written since without its path. Existing paths are left as they are.
+    '''
+    for level, region_model, level_select in _get_level_selects():
+        has_path = exists().where(models.RegionPath.region_id == region_model.id)
+        await _insert_region_paths(db, level, level_select.where(~has_path))
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Another worker starting at the same time inserted some of the same paths first
+        await db.rollback()
+        logger.warning("Region paths were backfilled by another worker")
+
+
+def _get_level_selects() -> list:
+    '''
+    (level, model, select) per level. Each select returns region_id, level and then the ids/names
+    of the path in REGION_HIERARCHY order.
+    '''
+    class_name = case(
+        (Class.section == None, Class.grade),
+        else_=Class.grade + literal(" ") + Class.section,
+    )
+    return [
+        (LevelEnum.STATE, State, select(State.id, literal(LevelEnum.STATE.value), State.id, State.name)),
+        (LevelEnum.ZONE, Zone, select(Zone.id, literal(LevelEnum.ZONE.value), State.id, State.name, Zone.id, Zone.name)
+            .join(State, State.id == Zone.state_id)),
+        (LevelEnum.DISTRICT, District, select(District.id, literal(LevelEnum.DISTRICT.value), State.id, State.name, Zone.id, Zone.name, District.id, District.name)
+            .join(Zone, Zone.id == District.zone_id)
+            .join(State, State.id == Zone.state_id)),
+        (LevelEnum.BLOCK, Block, select(Block.id, literal(LevelEnum.BLOCK.value), State.id, State.name, Zone.id, Zone.name, District.id, District.name, Block.id, Block.name)
+            .join(District, District.id == Block.district_id)
+            .join(Zone, Zone.id == District.zone_id)
+            .join(State, State.id == Zone.state_id)),
+        (LevelEnum.SCHOOL, School, select(School.id, literal(LevelEnum.SCHOOL.value), State.id, State.name, Zone.id, Zone.name, District.id, District.name, Block.id, Block.name, School.id, School.name)
+            .join(Block, Block.id == School.block_id)
+            .join(District, District.id == Block.district_id)
+            .join(Zone, Zone.id == District.zone_id)
+            .join(State, State.id == Zone.state_id)),
+        (LevelEnum.CLASS, Class, select(Class.id, literal(LevelEnum.CLASS.value), State.id, State.name, Zone.id, Zone.name, District.id, District.name, Block.id, Block.name, School.id, School.name, Class.id, class_name)
+            .join(School, School.id == Class.school_id)
+            .join(Block, Block.id == School.block_id)
+            .join(District, District.id == Block.district_id)
+            .join(Zone, Zone.id == District.zone_id)
+            .join(State, State.id == Zone.state_id)),
+    ]
+
+
+async def _insert_region_paths(db: AsyncSession, level: LevelEnum, level_select):
+    path_columns = [
+        column
+        for ancestor in REGION_HIERARCHY[:REGION_HIERARCHY.index(level) + 1]
+        for column in get_path_columns(ancestor)
+    ]
+    await db.execute(
+        insert(models.RegionPath).from_select(["region_id", "level", *path_columns], level_select)
+    )
+
+
+async def _build_region_path(db: AsyncSession, level: LevelEnum, region_id: str, name: str, parent_id: Optional[str]) -> dict:
+    path = {"region_id": region_id, "level": level.value}
+    position = REGION_HIERARCHY.index(level)
+
+    if position > 0 and parent_id:
+        parent_path = await get_region_path(db, parent_id)
+        for ancestor in REGION_HIERARCHY[:position]:
+            for column in get_path_columns(ancestor):
+                path[column] = getattr(parent_path, column) if parent_path else None
+
+    id_column, name_column = get_path_columns(level)
+    path[id_column] = region_id
+    path[name_column] = name
+    return path
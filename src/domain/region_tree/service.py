@@ -0,0 +1,138 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import event, literal, union_all, String
+from sqlalchemy.orm import Session
+from typing import Optional
+import asyncio
+import time
+from .tree import RegionTree
+from ..role_assignment.models import LevelEnum
+from ..state.models import State
+from ..zone.models import Zone
+from ..district.models import District
+from ..block.models import Block
+from ...collection_versions import get_collection_versions, get_committed_version
+from ...config import REGION_TREE_VERSION_CHECK_SECONDS
+from logger import logger
+
+# Levels held in the tree from the root down, with their model and parent id column
+REGION_TREE_LEVELS = [
+    (LevelEnum.STATE, State, None),
+    (LevelEnum.ZONE, Zone, "state_id"),
+    (LevelEnum.DISTRICT, District, "zone_id"),
+    (LevelEnum.BLOCK, Block, "district_id"),
+]
+_tree_levels = {level for level, _, _ in REGION_TREE_LEVELS}
+# The collection version bumped by a write to any region table (see src/collection_versions.py)
+REGION_TREE_COLLECTION = "block"
+
+# Process-wide tree, loaded at startup and patched as region writes in this process commit. It is
+# tagged with the database version of the region tables. A commit whose bump is the next version
+# moves the tag along with the patch; otherwise another worker wrote in between, and the tree is
+# reloaded the next time the version is checked, at most every REGION_TREE_VERSION_CHECK_SECONDS.
+_tree: Optional[RegionTree] = None
+_tree_version: Optional[int] = None
+_version_checked_at: Optional[float] = None
+_tree_lock = asyncio.Lock()
+
+
+async def get_region_tree(db: AsyncSession) -> RegionTree:
+    if _is_version_recent():
+        return _tree
+
+    async with _tree_lock:
+        # Concurrent requests wait for the one that is already checking or loading the tree
+        if _is_version_recent():
+            return _tree
+        return await _check_region_tree(db)
+
+
+def add_region_node(db: AsyncSession, level: LevelEnum, region_id: str, name: str, parent_id: Optional[str] = None):
+    ''' Add a new region to the tree once the caller's transaction commits '''
+    _stage_change(db, ("add", level, region_id, name, parent_id))
+
+
+def update_region_node(db: AsyncSession, level: LevelEnum, region_id: str, name: str, parent_id: Optional[str] = None):
+    ''' Rename or move a region in the tree once the caller's transaction commits '''
+    _stage_change(db, ("update", level, region_id, name, parent_id))
+
+
+def delete_region_node(db: AsyncSession, level: LevelEnum, region_id: str):
+    ''' Drop a region and its subtree from the tree once the caller's transaction commits '''
+    _stage_change(db, ("delete", level, region_id, None, None))
+
+
+def _stage_change(db: AsyncSession, change: tuple):
+    if change[1] in _tree_levels:
+        db.info.setdefault("region_tree_changes", []).append(change)
+
+
+def _is_version_recent() -> bool:
+    return _version_checked_at is not None and time.monotonic() - _version_checked_at < REGION_TREE_VERSION_CHECK_SECONDS
+
+
+async def _check_region_tree(db: AsyncSession) -> RegionTree:
+    global _version_checked_at
+    versions = await get_collection_versions(db, (REGION_TREE_COLLECTION,))
+    version = versions[REGION_TREE_COLLECTION]
+    if _tree is None or version != _tree_version:
+        await _load_region_tree(db, version)
+    _version_checked_at = time.monotonic()
+    return _tree
+
+
+async def _load_region_tree(db: AsyncSession, version: int):
+    global _tree, _tree_version
+
+    # Every region in one round trip; parents are added before their children
+    statement = union_all(*[
+        select(
+            literal(level.value).label("level"),
+            model.id,
+            model.name,
+            (getattr(model, parent_column) if parent_column else literal(None, String)).label("parent_id"),
+        )
+        for level, model, parent_column in REGION_TREE_LEVELS
+    ])
+    rows = (await db.execute(statement)).all()
+
+    rows_by_level = {level.value: [] for level, _, _ in REGION_TREE_LEVELS}
+    for row in rows:
+        rows_by_level[row.level].append(row)
+    tree = RegionTree()
+    for level, _, _ in REGION_TREE_LEVELS:
+        for row in rows_by_level[level.value]:
+            tree.add(level, row.id, row.name, row.parent_id)
+
+    # A write committed since version was read is newer than the tag, so the next check reloads
+    _tree = tree
+    _tree_version = version
+    logger.info(f"Loaded region tree with {len(tree.nodes)} regions")
+
+
+def _apply_changes(session, changes: list):
+    global _tree_version
+    for action, level, region_id, name, parent_id in changes:
+        if action == "add":
+            _tree.add(level, region_id, name, parent_id)
+        elif action == "update":
+            _tree.update(region_id, name, parent_id)
+        else:
+            _tree.remove(region_id)
+
+    # Nothing else was written since the tree's version, so the patched tree is current
+    version = get_committed_version(session, REGION_TREE_COLLECTION)
+    if version is not None and _tree_version is not None and version == _tree_version + 1:
+        _tree_version = version
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_after_commit(session):
+    changes = session.info.pop("region_tree_changes", None)
+    if changes and _tree is not None:
+        _apply_changes(session, changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_changes(session):
+    session.info.pop("region_tree_changes", None)
@@ -0,0 +1,93 @@
+from typing import Optional
+import bisect
+
+
+class RegionNode:
+    ''' One state, zone, district or block. Slots keep a node to its five references, with no per-node dict. '''
+    __slots__ = ("id", "level", "name", "parent", "children")
+
+    def __init__(self, region_id: str, level, name: str, parent: Optional["RegionNode"] = None):
+        self.id = region_id
+        self.level = level
+        self.name = name
+        self.parent = parent
+        self.children = []
+
+
+def _get_sort_key(node: RegionNode) -> str:
+    return node.name.lower()
+
+
+def _insert_sorted(siblings: list, node: RegionNode):
+    # bisect's key argument is Python 3.10+, so search a list of the sibling keys instead
+    position = bisect.bisect_right([_get_sort_key(sibling) for sibling in siblings], _get_sort_key(node))
+    siblings.insert(position, node)
+
+
+class RegionTree:
+    '''
+    The state -> zone -> district -> block hierarchy, indexed by region id. Children are kept
+    sorted by name, so subtrees can be served in display order without sorting.
+    '''
+
+    def __init__(self):
+        self.nodes = {}
+        self.roots = []
+
+    def get(self, region_id: str) -> Optional[RegionNode]:
+        return self.nodes.get(region_id)
+
+    def add(self, level, region_id: str, name: str, parent_id: Optional[str] = None):
+        parent = self.nodes.get(parent_id) if parent_id else None
+        if parent_id and parent is None:
+            # The parent is unknown to this tree, the region can't be placed
+            return
+        node = RegionNode(region_id, level, name, parent)
+        self.nodes[region_id] = node
+        _insert_sorted(self._get_siblings(parent), node)
+
+    def update(self, region_id: str, name: str, parent_id: Optional[str] = None):
+        node = self.nodes.get(region_id)
+        if node is None:
+            return
+        parent = self.nodes.get(parent_id) if parent_id else None
+        if parent_id and parent is None:
+            # Moved under a region this tree doesn't know, drop it rather than serve a wrong path
+            self.remove(region_id)
+            return
+        # Re-inserted so the siblings stay sorted after a rename or a move
+        self._get_siblings(node.parent).remove(node)
+        node.name = name
+        node.parent = parent
+        _insert_sorted(self._get_siblings(parent), node)
+
+    def remove(self, region_id: str):
+        ''' Remove a region and everything below it, as the database's cascading delete does '''
+        node = self.nodes.get(region_id)
+        if node is None:
+            return
+        self._get_siblings(node.parent).remove(node)
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            self.nodes.pop(current.id, None)
+            stack.extend(current.children)
+
+    def get_ancestors(self, region_id: str) -> list:
+        ''' The region followed by its ancestors up to the state; empty for an unknown region '''
+        ancestors = []
+        node = self.nodes.get(region_id)
+        while node is not None:
+            ancestors.append(node)
+            node = node.parent
+        return ancestors
+
+    def to_dict(self, node: RegionNode, depth: Optional[int] = None) -> dict:
+        ''' A node with its children down to depth levels below it, all of them when depth is None '''
+        result = {"id": node.id, "level": node.level.value, "name": node.name}
+        if depth is None or depth > 0:
+            result["children"] = [self.to_dict(child, None if depth is None else depth - 1) for child in node.children]
+        return result
+
+    def _get_siblings(self, parent: Optional[RegionNode]) -> list:
+        return parent.children if parent is not None else self.roots
@@ -2,8 +2,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from fastapi import HTTPException
 from enum import Enum
+from typing import Optional
+import asyncio
 import re
+import time
 from . import models, schemas
+from ...rows import get_response_columns, get_field_columns, get_rows
+from ...config import ROLE_CACHE_TTL_SECONDS
 from resources.strings import (
      ROLE_DELETE_SUCCESSFUL,
     ROLE_UPDATE_SUCCESSFUL, ROLE_DOES_NOT_EXIST_ERROR
@@ -14,25 +19,51 @@ async def get_role(db: AsyncSession, rolr_id: str):
     return result.scalar()
 
 async def get_roles(db: AsyncSession, skip: int = 0, limit: int = 100):
-    result = await db.execute(select(models.Role).offset(skip).limit(limit))
-    return result.scalars().all()
+    columns = get_response_columns(models.Role, schemas.RoleResponse)
+    return await get_rows(db, select(*columns).offset(skip).limit(limit))
 
 async def get_role_by_name(name: Enum, db: AsyncSession):
     result = await db.execute(select(models.Role).filter(models.Role.name == name))
     return result.scalars().first()
 
+# Role name -> id registry. The roles table holds one row per RoleEnum member and
+# rarely changes, so it is loaded once and reused until the TTL lapses or a role
+# is created, updated or deleted.
+_role_ids: dict = {}
+_role_ids_loaded_at: Optional[float] = None
+_role_ids_lock = asyncio.Lock()
+
+async def get_role_ids(db: AsyncSession) -> dict:
+    global _role_ids, _role_ids_loaded_at
+    if _role_ids_loaded_at is not None and time.monotonic() - _role_ids_loaded_at < ROLE_CACHE_TTL_SECONDS:
+        return _role_ids
+
+    async with _role_ids_lock:
+        # Another request may have reloaded the registry while this one waited
+        if _role_ids_loaded_at is None or time.monotonic() - _role_ids_loaded_at >= ROLE_CACHE_TTL_SECONDS:
+            result = await db.execute(select(models.Role.name, models.Role.id))
+            _role_ids = {models.RoleEnum(name): role_id for name, role_id in result.all()}
+            _role_ids_loaded_at = time.monotonic()
+    return _role_ids
+
+async def get_role_id(db: AsyncSession, name: Enum) -> Optional[str]:
+    role_ids = await get_role_ids(db)
+    return role_ids.get(models.RoleEnum(name))
+
+def invalidate_role_cache():
+    global _role_ids_loaded_at
+    _role_ids_loaded_at = None
+
 async def get_roles_by_params(db: AsyncSession, selected_fields: list, filters: list, ordering: list, skip: int = 0, limit: int = 100):
-    orm_attributes = [getattr(models.Role, field) for field in selected_fields]
-    result = await db.execute(
-        select(*orm_attributes).filter(*filters).order_by(*ordering).offset(skip).limit(limit)
-    )
-    return result.scalars().all()
+    columns = get_field_columns(models.Role, selected_fields)
+    return await get_rows(db, select(*columns).filter(*filters).order_by(*ordering).offset(skip).limit(limit))
 
 async def create_role(db: AsyncSession, role: schemas.RoleBase):
     try:
         db_role = models.Role(**role.model_dump())
         db.add(db_role)
         await db.commit()
+        invalidate_role_cache()
         await db.refresh(db_role)
     except Exception as e:
         raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
@@ -52,6 +83,7 @@ async def update_role(db: AsyncSession, role_id: str, role: schemas.RoleUpdate):
             setattr(db_role, key, value)
 
         await db.commit()
+        invalidate_role_cache()
         await db.refresh(db_role)
     except Exception as e:
         raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
@@ -69,6 +101,7 @@ async def delete_role(db: AsyncSession, role_id: str):
 
         await db.delete(db_role)
         await db.commit()
+        invalidate_role_cache()
     except Exception as e:
         raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SqlEnum, text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, Enum as SqlEnum, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from enum import Enum
@@ -23,9 +23,14 @@ class LevelEnum(str, Enum):
 
 class UserRole(Base):
     __tablename__ = "user_role_assignments"
+    __table_args__ = (
+        # Rosters, hierarchy lookups and class subqueries filter on level_id + level (+ role_id);
+        # level_id leads so joins on level_id alone can use the index too
+        Index("ix_user_role_assignments_level_id_level_role_id", "level_id", "level", "role_id"),
+    )
 
     id = Column(String, primary_key=True)
-    user_id = Column(String, ForeignKey("ilp_users.id"), nullable=False)
+    user_id = Column(String, ForeignKey("ilp_users.id"), nullable=False, index=True)
     role_id = Column(String, ForeignKey("roles.id"), nullable=False)
 
     access_type = Column(SqlEnum(AccessTypeEnum), nullable=False, default=AccessTypeEnum.WRITE)
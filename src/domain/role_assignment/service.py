@@ -1,11 +1,11 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import or_
+from sqlalchemy import or_, and_
 from fastapi import HTTPException
-from typing import Optional, List
+from typing import List
 import re
 from ..school.models import Class, School
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import joinedload, selectinload, noload
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 from ..block.models import Block
 from ..district.models import District
@@ -13,13 +13,24 @@ from ..zone.models import Zone
 from ..state.models import State
 from . import models, schemas
 from ..ilpuser.models import ILPUser
-from ..role.service import get_role_by_name
-from ..role.models import Role, RoleEnum
+from ..role.service import get_role_id
+from ..role.models import RoleEnum
 from ..role_assignment.models import UserRole, LevelEnum
+from ..region_path import service as region_path_service
+from ..region_tree import service as region_tree_service
+from ..region_tree.tree import RegionTree
 from resources.strings import (
     USER_ROLE_ASSOCIATION_DOES_NOT_EXIST_ERROR, ROLE_DELETE_SUCCESSFUL,
     ROLE_UPDATE_SUCCESSFUL, TEACHER_UPDATE_SUCCESSFUL
 )
+from logger import logger
+
+# Region levels from the most specific to the least, the order ancestors are reported in
+REGION_LEVELS = ["CLASS", "SCHOOL", "BLOCK", "DISTRICT", "ZONE", "STATE"]
+
+# Levels get_user_role_by_heirarchy walks up from, below ROOT
+HEIRARCHY_LEVELS = [LevelEnum.BLOCK, LevelEnum.DISTRICT, LevelEnum.ZONE, LevelEnum.STATE]
+HEIRARCHY_LEVEL_NAMES = [level.name for level in HEIRARCHY_LEVELS]
 
 async def get_users_roles(db: AsyncSession, skip: int = 0, limit: int = 100):
     result = await db.execute(select(models.UserRole).offset(skip).limit(limit))
@@ -208,53 +219,36 @@ async def get_user_role_by_field(db: AsyncSession, field_name: str, field_value:
 async def get_user_role_by_heirarchy(db: AsyncSession, region_level: LevelEnum, region_id: str):
     region_chain = []
 
-    # Step 1: walk up the region hierarchy
-    if region_level == LevelEnum.BLOCK:
-        block = await db.get(Block, region_id)
-        region_chain.append((LevelEnum.BLOCK, block.id, block.name))
-        district = await db.get(District, block.district_id)
-        region_chain.append((LevelEnum.DISTRICT, district.id, district.name))
-        zone = await db.get(Zone, district.zone_id)
-        region_chain.append((LevelEnum.ZONE, zone.id, zone.name))
-        state = await db.get(State, zone.state_id)
-        region_chain.append((LevelEnum.STATE, state.id, state.name))
-        region_chain.append((LevelEnum.ROOT, None, "ROOT"))
+    # Step 1: walk up to the state in the in-memory region tree
+    if region_level in HEIRARCHY_LEVELS:
+        tree = await region_tree_service.get_region_tree(db)
+        node = tree.get(region_id)
+        if node is None or node.level != region_level:
+            return []
+        region_chain = [(ancestor.level, ancestor.id, ancestor.name) for ancestor in tree.get_ancestors(region_id)]
 
-    elif region_level == LevelEnum.DISTRICT:
-        district = await db.get(District, region_id)
-        region_chain.append((LevelEnum.DISTRICT, district.id, district.name))
-        zone = await db.get(Zone, district.zone_id)
-        region_chain.append((LevelEnum.ZONE, zone.id, zone.name))
-        state = await db.get(State, zone.state_id)
-        region_chain.append((LevelEnum.STATE, state.id, state.name))
+    if region_level in HEIRARCHY_LEVELS or region_level == LevelEnum.ROOT:
         region_chain.append((LevelEnum.ROOT, None, "ROOT"))
 
-    elif region_level == LevelEnum.ZONE:
-        zone = await db.get(Zone, region_id)
-        region_chain.append((LevelEnum.ZONE, zone.id, zone.name))
-        state = await db.get(State, zone.state_id)
-        region_chain.append((LevelEnum.STATE, state.id, state.name))
-        region_chain.append((LevelEnum.ROOT, None, "ROOT"))
+    if not region_chain:
+        return []
 
-    elif region_level == LevelEnum.STATE:
-        state = await db.get(State, region_id)
-        region_chain.append((LevelEnum.STATE, state.id, state.name))
-        region_chain.append((LevelEnum.ROOT, None, "ROOT"))
-
-    elif region_level == LevelEnum.ROOT:
-        region_chain.append((LevelEnum.ROOT, None, "ROOT"))
+    # Step 2: query UserRole for every level in the chain at once
+    stmt = (
+        select(UserRole)
+        .where(or_(*[
+            and_(UserRole.level == level, UserRole.level_id == level_id)
+            for level, level_id, _ in region_chain
+        ]))
+        .options(selectinload(UserRole.user), selectinload(UserRole.role))
+    )
+    role_assignments = (await db.execute(stmt)).scalars().all()
 
-    # Step 2: query UserRole for each level in chain
     results = []
     for level, level_id, region_name in region_chain:
-        stmt = (
-            select(UserRole)
-            .where(UserRole.level == level, UserRole.level_id == level_id)
-            .options(selectinload(UserRole.user), selectinload(UserRole.role))
-        )
-        role_assignment = (await db.execute(stmt)).scalars().all()
-
-        for ra in role_assignment:
+        for ra in role_assignments:
+            if ra.level != level or ra.level_id != level_id:
+                continue
             results.append({
                 "id": ra.id,
                 "user_id": ra.user.id,
@@ -269,19 +263,14 @@ async def get_user_role_by_heirarchy(db: AsyncSession, region_level: LevelEnum,
     return results
 
 async def get_teachers(school_id: str, db: AsyncSession, skip: int = 0, limit: int = 100):
-    student_role_id_subquery = (
-        select(Role.id)
-        .filter(Role.name == RoleEnum.TEACHER)
-        .limit(1)
-        .scalar_subquery()
-    )
-        
+    teacher_role_id = await get_role_id(db, RoleEnum.TEACHER)
+
     result = await db.execute(
         select(models.UserRole.user_id)
         .filter(
             (models.UserRole.level == models.LevelEnum.SCHOOL) &
             ((models.UserRole.level_id == school_id) | (models.UserRole.level_id == None)),
-            models.UserRole.role_id == student_role_id_subquery
+            models.UserRole.role_id == teacher_role_id
         )
         .offset(skip)
         .limit(limit)
@@ -296,10 +285,10 @@ async def get_teachers(school_id: str, db: AsyncSession, skip: int = 0, limit: i
 
 
 async def assign_teacher_to_class(teacherDetails: schemas.TeacherCreate, db: AsyncSession):
-    role = await get_role_by_name(RoleEnum.TEACHER, db=db)
+    teacher_role_id = await get_role_id(db, RoleEnum.TEACHER)
     teacher_items = teacherDetails.model_dump()
     updated_details = {
-            "role_id": role.id, 
+            "role_id": teacher_role_id, 
             'level': models.LevelEnum.CLASS, 
             'access_type': models.AccessTypeEnum.WRITE,
             'level_id': teacher_items['class_id'],
@@ -332,12 +321,7 @@ async def update_teacher_to_class(teacherDetails: schemas.TeacherUpdate, assignm
 
 async def get_school_class_students(db: AsyncSession, class_id: str):
     try:
-        student_role_id_subquery = (
-            select(Role.id)
-            .filter(Role.name == RoleEnum.STUDENT)
-            .limit(1)
-            .scalar_subquery()
-        )
+        student_role_id = await get_role_id(db, RoleEnum.STUDENT)
         # Query to get all students in a given class
         result = await db.execute(
             select(ILPUser)
@@ -345,7 +329,7 @@ async def get_school_class_students(db: AsyncSession, class_id: str):
             .filter(
                 UserRole.level_id == class_id,
                 UserRole.level == LevelEnum.CLASS,
-                UserRole.role_id == student_role_id_subquery
+                UserRole.role_id == student_role_id
             )
         )
         students = result.scalars().all()
@@ -369,12 +353,7 @@ async def update_school_class_students(db: AsyncSession, class_id: str, students
     
 async def get_unassigned_school_students(db: AsyncSession, school_id: str):
     try:
-        student_role_id_subquery = (
-            select(Role.id)
-            .filter(Role.name == RoleEnum.STUDENT)
-            .limit(1)
-            .scalar_subquery()
-        )
+        student_role_id = await get_role_id(db, RoleEnum.STUDENT)
         # Query to get all students in a given class
         result = await db.execute(
             select(ILPUser)
@@ -382,7 +361,7 @@ async def get_unassigned_school_students(db: AsyncSession, school_id: str):
             .filter(
                 UserRole.level_id == school_id,
                 UserRole.level == LevelEnum.SCHOOL,
-                UserRole.role_id == student_role_id_subquery
+                UserRole.role_id == student_role_id
             )
         )
         students = result.scalars().all()
@@ -407,47 +386,56 @@ async def update_unassigned_school_students(db: AsyncSession, school_id: str, st
         raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
     
 
-async def get_user_roles_with_hierarchy(session, user_id: str):
-    query = (
+def _get_user_roles_query():
+    # serialize_user_role reads the block -> state chain off the region tree, so only the
+    # class and school of an assignment are joined
+    return (
         select(UserRole)
         .options(
             joinedload(UserRole.role),  # Load role details (role_name)
             joinedload(UserRole.user),  # Load user details (user_name)
 
-            # Load hierarchy relationships
-            joinedload(UserRole.class_info).joinedload(Class.school).joinedload(School.block)
-            .joinedload(Block.district).joinedload(District.zone).joinedload(Zone.state),
-            
-            joinedload(UserRole.school_info).joinedload(School.block)
-            .joinedload(Block.district).joinedload(District.zone).joinedload(Zone.state),
+            joinedload(UserRole.class_info).joinedload(Class.school),
+            joinedload(UserRole.school_info),
+            noload(UserRole.block_info),
+            noload(UserRole.district_info),
+            noload(UserRole.zone_info),
+            noload(UserRole.state_info),
+        )
+    )
 
-            joinedload(UserRole.block_info).joinedload(Block.district)
-            .joinedload(District.zone).joinedload(Zone.state),
+async def get_user_roles_with_hierarchy(session, user_id: str):
+    ''' Assignments of a user, loaded for serialize_user_role '''
+    result = await session.execute(_get_user_roles_query().where(UserRole.user_id == user_id))
+    return result.scalars().all()
 
-            joinedload(UserRole.district_info).joinedload(District.zone).joinedload(Zone.state),
+async def get_users_roles_with_hierarchy(session, user_ids: list) -> dict:
+    """
+    Serialized role assignments for many users at once, keyed by user id.
+    The assignments of every user come back from one query, and their block -> state chain
+    from the region tree, so the cost does not grow with the number of users.
+    """
+    roles_by_user = {user_id: [] for user_id in user_ids}
+    if not user_ids:
+        return roles_by_user
 
-            joinedload(UserRole.zone_info).joinedload(Zone.state),
+    tree = await region_tree_service.get_region_tree(session)
+    result = await session.execute(_get_user_roles_query().where(UserRole.user_id.in_(user_ids)))
 
-            joinedload(UserRole.state_info),
-        )
-        .where(UserRole.user_id == user_id)
-    )
-    result = await session.execute(query)
-    return result.scalars().all()
+    for user_role in result.scalars().all():
+        roles_by_user.setdefault(user_role.user_id, []).append(serialize_user_role(user_role, tree))
 
-def serialize_user_role(user_role: UserRole):
+    return roles_by_user
+
+def serialize_user_role(user_role: UserRole, tree: RegionTree):
+    ''' An assignment loaded by get_user_roles_with_hierarchy, with the ids and names of its region's ancestors '''
     level = user_role.level.name
 
     # Fetch role and user details
     role_name = user_role.role.name if user_role.role else None
     user_name = f"{user_role.user.first_name} {user_role.user.last_name}" if user_role.user else None
 
-    class_info = user_role.class_info if level == "CLASS" else None
-    school = class_info.school if class_info else (user_role.school_info if level == "SCHOOL" else None)
-    block = school.block if school else (user_role.block_info if level == "BLOCK" else None)
-    district = block.district if block else (user_role.district_info if level == "DISTRICT" else None)
-    zone = district.zone if district else (user_role.zone_info if level == "ZONE" else None)
-    state = zone.state if zone else (user_role.state_info if level == "STATE" else None)
+    region_path = _get_region_path(user_role, tree)
 
     response = {
         "id": user_role.id,
@@ -460,71 +448,43 @@ def serialize_user_role(user_role: UserRole):
         "level_id": user_role.level_id,
     }
 
-    if level == "CLASS":
-        response.update({
-            "class_id": user_role.level_id,
-            "class_name": class_info.grade+" "+class_info.section if class_info else None,
-            "school_id": school.id if school else None,
-            "school_name": school.name if school else None,
-            "block_id": block.id if block else None,
-            "block_name": block.name if block else None,
-            "district_id": district.id if district else None,
-            "district_name": district.name if district else None,
-            "zone_id": zone.id if zone else None,
-            "zone_name": zone.name if zone else None,
-            "state_id": state.id if state else None,
-            "state_name": state.name if state else None,
-        })
-    elif level == "SCHOOL":
-        response.update({
-            "school_id": user_role.level_id,
-            "school_name": school.name if school else None,
-            "block_id": block.id if block else None,
-            "block_name": block.name if block else None,
-            "district_id": district.id if district else None,
-            "district_name": district.name if district else None,
-            "zone_id": zone.id if zone else None,
-            "zone_name": zone.name if zone else None,
-            "state_id": state.id if state else None,
-            "state_name": state.name if state else None,
-        })
-    elif level == "BLOCK":
-        response.update({
-            "block_id": user_role.level_id,
-            "block_name": block.name if block else None,
-            "district_id": district.id if district else None,
-            "district_name": district.name if district else None,
-            "zone_id": zone.id if zone else None,
-            "zone_name": zone.name if zone else None,
-            "state_id": state.id if state else None,
-            "state_name": state.name if state else None,
-        })
-    elif level == "DISTRICT":
-        response.update({
-            "district_id": user_role.level_id,
-            "district_name": district.name if district else None,
-            "zone_id": zone.id if zone else None,
-            "zone_name": zone.name if zone else None,
-            "state_id": state.id if state else None,
-            "state_name": state.name if state else None,
-        })
-    elif level == "ZONE":
-        response.update({
-            "zone_id": user_role.level_id,
-            "zone_name": zone.name if zone else None,
-            "state_id": state.id if state else None,
-            "state_name": state.name if state else None,
-        })
-    elif level == "STATE":
-        response.update({
-            "state_id": user_role.level_id,
-            "state_name": state.name if state else None,
-        })
+    if level in REGION_LEVELS:
+        for region_level in REGION_LEVELS[REGION_LEVELS.index(level):]:
+            prefix = region_level.lower()
+            response.update({
+                f"{prefix}_id": user_role.level_id if region_level == level else region_path.get(f"{prefix}_id"),
+                f"{prefix}_name": region_path.get(f"{prefix}_name"),
+            })
 
     return response
 
+def _get_region_path(user_role: UserRole, tree: RegionTree) -> dict:
+    # The class and school come from the joined relationships, the block and everything above it from the tree
+    level = user_role.level.name
+
+    class_info = user_role.class_info if level == "CLASS" else None
+    school = class_info.school if class_info else (user_role.school_info if level == "SCHOOL" else None)
+    region_path = {
+        "class_id": class_info.id if class_info else None,
+        "class_name": region_path_service.get_class_name(class_info.grade, class_info.section) if class_info else None,
+        "school_id": school.id if school else None,
+        "school_name": school.name if school else None,
+    }
+
+    if school:
+        region_id = school.block_id
+    elif level in HEIRARCHY_LEVEL_NAMES:
+        region_id = user_role.level_id
+    else:
+        region_id = None
+
+    for node in tree.get_ancestors(region_id) if region_id else []:
+        prefix = node.level.value.lower()
+        region_path.update({f"{prefix}_id": node.id, f"{prefix}_name": node.name})
+    return region_path
+
 def _extract_detail_text(error_message: str) -> str:
-    print("!!! Error !!! ", error_message)
+    logger.warning(error_message)
     match = re.search(r"DETAIL:\s+(.*)", error_message)
     return match.group(1) if match else "Error occurred while processing the request"
 
@@ -7,6 +7,7 @@ from ..block.models import Block
 from ..district.models import District
 from ..zone.models import Zone
 from ..state.models import State
+from ..region_path.models import RegionPath
 
 class School(Base):
     __tablename__ = "schools"
@@ -15,7 +16,7 @@ class School(Base):
     name = Column(String, nullable=False)
     long_name = Column(String)
     dise_code = Column(BigInteger, unique=True)
-    block_id = Column(String, ForeignKey("blocks.id", ondelete="CASCADE"), nullable=False)
+    block_id = Column(String, ForeignKey("blocks.id", ondelete="CASCADE"), nullable=False, index=True)
     address = Column(String)
     city = Column(String)
     pincode = Column(Integer)
@@ -47,22 +48,18 @@ class School(Base):
         model_fields = cls.get_valid_fields()
 
         # Aliased models for relationships
-        Block_alias = aliased(Block)
-        District_alias = aliased(District)
-        Zone_alias = aliased(Zone)
-        State_alias = aliased(State)
         Creator = aliased(ILPUser)
         Updater = aliased(ILPUser)
 
-        # Additional computed fields (from relationships)
+        # Additional computed fields (ancestors come from the region path table)
         relation_mapping = {
-            "block_name": Block_alias.name,
-            "district_name": District_alias.name,
-            "district_id": District_alias.id,
-            "zone_id": Zone_alias.id,
-            "zone_name": Zone_alias.name,
-            "state_id": State_alias.id,
-            "state_name": State_alias.name,
+            "block_name": RegionPath.block_name,
+            "district_name": RegionPath.district_name,
+            "district_id": RegionPath.district_id,
+            "zone_id": RegionPath.zone_id,
+            "zone_name": RegionPath.zone_name,
+            "state_id": RegionPath.state_id,
+            "state_name": RegionPath.state_name,
             "created_by": Creator.email,
             "updated_by": Updater.email,
         }
@@ -78,7 +75,7 @@ class Class(Base):
     id = Column(String, primary_key=True)
     grade = Column(String, nullable=False)
     section = Column(String)
-    school_id = Column(String, ForeignKey("schools.id", ondelete="CASCADE"), nullable=False)
+    school_id = Column(String, ForeignKey("schools.id", ondelete="CASCADE"), nullable=False, index=True)
 
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=text("CURRENT_TIMESTAMP"))
     last_updated_at = Column(DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP"), onupdate=datetime.utcnow)
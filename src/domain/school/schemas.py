@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 
@@ -112,6 +112,31 @@ class ClassDetailsBase(BaseModel):
     created_at: Optional[datetime] = datetime.now()
     created_by: Optional[str] = "54be662c-eab6-4e60-8c43-40cd744d1fbd"
 
+class ClassStudentBase(BaseModel):
+    id: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
+    gender: Optional[str] = None
+    is_active: Optional[bool] = None
+
+    class Config:
+        from_attributes = True
+
+class ClassDetailsWithStudentsBase(ClassDetailsBase):
+    students: List[ClassStudentBase]
+
+class BulkClassBase(BaseModel):
+    grade: str
+    section: Optional[str] = None
+
+class BulkSchoolBase(SchoolBase):
+    classes: List[BulkClassBase] = []
+
+class BulkSchoolRequest(BaseModel):
+    # Validated school by school, so one bad row is reported instead of failing the whole upload
+    schools: List[dict]
+
 class ClassCreate(ClassBase):
  pass
 
@@ -1,69 +1,77 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, literal, String, cast
+from sqlalchemy import func, literal, String, cast, case, insert, bindparam
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from fastapi import HTTPException
 from typing import Optional
+from pydantic import ValidationError
 import re
+import uuid
 from . import models, schemas
+from ...rows import get_response_columns, get_field_columns, get_rows, get_rows_by_ids
+from ..region_path import service as region_path_service
+from ..region_path.models import RegionPath
 from ..role_assignment.models import UserRole, AccessTypeEnum, LevelEnum
 from ..ilpuser.models import ILPUser
-from ..role.models import Role, RoleEnum
+from ..organization.models import Organization
+from ..role.models import RoleEnum
+from ..role import service as role_service
 from resources.strings import (
     SCHOOL_DOES_NOT_EXIST_ERROR, SCHOOL_DELETE_SUCCESSFUL, SCHOOL_UPDATE_SUCCESSFUL, CLASS_DOES_NOT_EXIST_ERROR, CLASS_UPDATE_SUCCESSFUL
 )
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, aliased
+from logger import logger
+
+# Columns a bulk upsert refreshes on schools that already exist, and the schools written per statement
+BULK_SCHOOL_UPDATE_COLUMNS = ["name", "long_name", "block_id", "address", "city", "pincode", "organization_id"]
+BULK_SCHOOL_BATCH_SIZE = 1000
 
 async def get_school(db: AsyncSession, school_id: str):
     result = await db.execute(select(models.School).filter(models.School.id == school_id))
     return result.scalar()
 
+async def get_schools_by_ids(db: AsyncSession, school_ids: list) -> dict:
+    return await get_rows_by_ids(db, models.School, schemas.SchoolResponse, school_ids)
+
+async def get_school_classes_by_ids(db: AsyncSession, class_ids: list) -> dict:
+    return await get_rows_by_ids(db, models.Class, schemas.ClassResponse, class_ids)
+
 async def get_school_by_dise_code(db: AsyncSession, dise_code: int):
     result = await db.execute(select(models.School).filter(models.School.dise_code == dise_code))
     return result.scalar()
 
 async def get_schools(db: AsyncSession, skip: int = 0, limit: int = 100):
-    result = await db.execute(select(models.School).offset(skip).limit(limit))
-    return result.scalars().all()
+    columns = get_response_columns(models.School, schemas.SchoolResponse)
+    return await get_rows(db, select(*columns).offset(skip).limit(limit))
 
 async def get_school_details(db: AsyncSession, school_id: str = None):
-    query = select(models.School).options(
-        selectinload(models.School.block)
-        .selectinload(models.Block.district)
-        .selectinload(models.District.zone)
-        .selectinload(models.Zone.state),
-        selectinload(models.School.creator),  # Load creator relationship
-        selectinload(models.School.updater),  # Load updater relationship
+    query = (
+        select(models.School, RegionPath)
+        .outerjoin(RegionPath, RegionPath.region_id == models.School.id)
+        .options(
+            selectinload(models.School.creator),  # Load creator relationship
+            selectinload(models.School.updater),  # Load updater relationship
+        )
     )
 
     result = await db.execute(query.where(models.School.id == school_id))
-    school = result.scalars().first()
-
-    school_data = {}
-    school_data = {
-        "id": school.id,
-        "name": school.name,
-        **{field: getattr(school, field) for field in school.__table__.columns.keys()},
-        "block_id": school.block.id if school.block else None,
-        "block_name": school.block.name if school.block else None,
-        "district_id": school.block.district.id if school.block and school.block.district else None,            
-        "district_name": school.block.district.name if school.block and school.block.district else None,
-        "zone_id": school.block.district.zone.id if school.block and school.block.district and school.block.district.zone else None,            
-        "zone_name": school.block.district.zone.name if school.block and school.block.district and school.block.district.zone else None,
-        "state_id": school.block.district.zone.state.id if school.block and school.block.district and school.block.district.zone and school.block.district.zone.state else None,           
-        "state_name": school.block.district.zone.state.name if school.block and school.block.district and school.block.district.zone and school.block.district.zone.state else None,
-        "created_by": school.creator.email if school.creator else None,
-        "updated_by": school.updater.email if school.updater else None,
-    }
-    return school_data
-
-async def get_all_schools_details(db: AsyncSession, selected_fields: list, filters: dict, ordering: list, skip: int = 0, limit: int = 100):
-    query = select(models.School).options(
-        selectinload(models.School.block)
-        .selectinload(models.Block.district)
-        .selectinload(models.District.zone)
-        .selectinload(models.Zone.state),
-        selectinload(models.School.creator),  # Load creator relationship
-        selectinload(models.School.updater),  # Load updater relationship
+    row = result.first()
+    if row is None:
+        return None
+
+    school, region_path = row
+    return _get_school_details_dict(school, region_path)
+
+async def get_all_schools_details(db: AsyncSession, selected_fields: list, filters: dict, ordering: list, skip: int = 0, limit: int = 100, keyset_conditions: Optional[list] = None):
+    # Ancestors come from the region path table, so one join covers block, district, zone and state
+    query = (
+        select(models.School, RegionPath)
+        .outerjoin(RegionPath, RegionPath.region_id == models.School.id)
+        .options(
+            selectinload(models.School.creator),  # Load creator relationship
+            selectinload(models.School.updater),  # Load updater relationship
+        )
     )
     # Map search fields to models and relationships
     search_field_mapping = {
@@ -72,16 +80,16 @@ async def get_all_schools_details(db: AsyncSession, selected_fields: list, filte
         "dise_code": models.School.dise_code,
         "address": models.School.address,  # Assuming description is part of address
         # Related fields
-        "block_name": models.Block.name,
-        "district_name": models.District.name,
-        "zone_name": models.Zone.name,
-        "state_name": models.State.name,
+        "block_name": RegionPath.block_name,
+        "district_name": RegionPath.district_name,
+        "zone_name": RegionPath.zone_name,
+        "state_name": RegionPath.state_name,
         "created_by": models.ILPUser.email,
         "updated_by": models.ILPUser.email,
-        "state_id":  models.State.id, 
-        "block_id": models.Block.id, 
-        "district_id": models.District.id, 
-        "zone_id": models.Zone.id
+        "state_id":  RegionPath.state_id, 
+        "block_id": models.School.block_id, 
+        "district_id": RegionPath.district_id, 
+        "zone_id": RegionPath.zone_id
     }
     # Join related tables and apply filters
     filter_data = []
@@ -93,14 +101,6 @@ async def get_all_schools_details(db: AsyncSession, selected_fields: list, filte
                 filter_data.append(cast(search_field_mapping[key], String).ilike(f"%{value}%"))  # Convert non-string columns to text
 
         # Perform joins if necessary
-        if key in ["block_name", "district_name", "zone_name", "state_id", "block_id", "district_id", "zone_id", "state_id"]:
-            query = query.join(models.School.block)
-        if key in ["district_name", "zone_name", "state_name", "district_id", "zone_id", "state_id"]:
-            query = query.join(models.Block.district)
-        if key in ["zone_name", "state_name", "zone_id", "state_id"]:
-            query = query.join(models.District.zone)
-        if key in ["state_name", "state_id"]:
-            query = query.join(models.Zone.state)
         if key in ["created_by", "updated_by"]:
             query = query.join(models.School.creator) if key == "created_by" else query.join(models.School.updater)
 
@@ -108,6 +108,10 @@ async def get_all_schools_details(db: AsyncSession, selected_fields: list, filte
     for each_filter in filter_data:
         query = query.filter(each_filter)
 
+    # Rows after the keyset pagination cursor
+    if keyset_conditions:
+        query = query.filter(*keyset_conditions)
+
     if ordering:
         query = query.order_by(*ordering)
 
@@ -116,26 +120,11 @@ async def get_all_schools_details(db: AsyncSession, selected_fields: list, filte
 
     # Execute query
     result = await db.execute(query)
-    schools = result.scalars().all()
 
     # Process results based on requested fields
     school_data = []
-    for school in schools:
-        school_dict = {
-            "id": school.id,
-            "name": school.name,
-            **{field: getattr(school, field) for field in school.__table__.columns.keys()},
-            "block_id": school.block.id if school.block else None,
-            "block_name": school.block.name if school.block else None,
-            "district_id": school.block.district.id if school.block and school.block.district else None,            
-            "district_name": school.block.district.name if school.block and school.block.district else None,
-            "zone_id": school.block.district.zone.id if school.block and school.block.district and school.block.district.zone else None,            
-            "zone_name": school.block.district.zone.name if school.block and school.block.district and school.block.district.zone else None,
-            "state_id": school.block.district.zone.state.id if school.block and school.block.district and school.block.district.zone and school.block.district.zone.state else None,           
-            "state_name": school.block.district.zone.state.name if school.block and school.block.district and school.block.district.zone and school.block.district.zone.state else None,
-            "created_by": school.creator.email if school.creator else None,
-            "updated_by": school.updater.email if school.updater else None,
-        }
+    for school, region_path in result.all():
+        school_dict = _get_school_details_dict(school, region_path)
 
         # Return only requested fields
         filtered_data = {key: school_dict[key] for key in selected_fields if key in school_dict}
@@ -144,15 +133,15 @@ async def get_all_schools_details(db: AsyncSession, selected_fields: list, filte
     return school_data
 
 async def get_schools_by_params(db: AsyncSession, selected_fields: list, filters: list, ordering: list, skip: int = 0, limit: int = 100):
-    orm_attributes = [getattr(models.School, field) for field in selected_fields]
-    result = await db.execute(select(*orm_attributes).filter(*filters).order_by(*ordering).offset(skip).limit(limit))
-    return result.all()
+    columns = get_field_columns(models.School, selected_fields)
+    return await get_rows(db, select(*columns).filter(*filters).order_by(*ordering).offset(skip).limit(limit))
 
 
 async def create_school(db: AsyncSession, school: schemas.SchoolBase):
     try:
         db_school = models.School(**school.model_dump())
         db.add(db_school)
+        await region_path_service.add_region_path(db, LevelEnum.SCHOOL, db_school.id, db_school.name, db_school.block_id)
         await db.commit()
         await db.refresh(db_school)
     except Exception as e:
@@ -161,6 +150,144 @@ async def create_school(db: AsyncSession, school: schemas.SchoolBase):
     return db_school
 
 
+async def bulk_upsert_schools(db: AsyncSession, schools: list) -> dict:
+    '''
+    Create or refresh schools keyed on their unique dise_code, with their classes, in one
+    transaction. Existing schools, blocks, organizations and classes are each looked up with
+    one IN query; schools are written with INSERT ... ON CONFLICT (dise_code) DO UPDATE in
+    batches, and new classes and region paths are inserted in batches as well.
+    '''
+    report = {"created": 0, "updated": 0, "unchanged": 0, "skipped": 0, "classes_created": 0, "errors": []}
+
+    # Stage 1: validate every school on its own, later duplicates of a dise code are skipped
+    valid_schools = {}
+    for position, school in enumerate(schools):
+        try:
+            bulk_school = schemas.BulkSchoolBase(**school)
+        except ValidationError as e:
+            report["errors"].append(f"School {position + 1}: " + "; ".join(f'{".".join(map(str, error["loc"]))}: {error["msg"]}' for error in e.errors()))
+            continue
+        if bulk_school.dise_code in valid_schools:
+            report["errors"].append(f"School {position + 1}: dise code {bulk_school.dise_code} appears more than once")
+            continue
+        valid_schools[bulk_school.dise_code] = (position, bulk_school)
+
+    # Stage 2: one lookup each for existing schools, referenced blocks and organizations
+    dise_codes = list(valid_schools)
+    existing_schools = {}
+    if dise_codes:
+        result = await db.execute(select(models.School).filter(models.School.dise_code.in_(dise_codes)))
+        existing_schools = {school.dise_code: school for school in result.scalars().all()}
+    block_paths = await region_path_service.get_region_paths(db, list({school.block_id for _, school in valid_schools.values()}))
+    organization_ids = set()
+    if valid_schools:
+        result = await db.execute(
+            select(Organization.id).filter(Organization.id.in_(list({school.organization_id for _, school in valid_schools.values()})))
+        )
+        organization_ids = set(result.scalars().all())
+
+    # Stage 3: classify schools as new, changed or unchanged
+    schools_to_upsert = []
+    school_paths = {}       # school id -> path, for every school that is kept
+    paths_to_insert = []
+    paths_to_update = []    # schools whose name or block changed
+    school_classes = {}     # school id -> requested (grade, section) pairs
+    for dise_code, (position, school) in valid_schools.items():
+        if school.block_id not in block_paths:
+            report["errors"].append(f"School {position + 1}: block '{school.block_id}' does not exist")
+            continue
+        if school.organization_id not in organization_ids:
+            report["errors"].append(f"School {position + 1}: organization '{school.organization_id}' does not exist")
+            continue
+
+        values = school.model_dump(exclude={"classes", "created_at"})
+        existing = existing_schools.get(dise_code)
+        values["id"] = existing.id if existing else str(uuid.uuid4())
+        changed = existing is None or any(getattr(existing, column) != values[column] for column in BULK_SCHOOL_UPDATE_COLUMNS)
+        if existing is None:
+            report["created"] += 1
+        elif changed:
+            report["updated"] += 1
+        else:
+            report["unchanged"] += 1
+        if changed:
+            schools_to_upsert.append(values)
+
+        block_path = block_paths[school.block_id]
+        path = {
+            column: getattr(block_path, column)
+            for level in region_path_service.REGION_HIERARCHY[:region_path_service.REGION_HIERARCHY.index(LevelEnum.SCHOOL)]
+            for column in region_path_service.get_path_columns(level)
+        }
+        path.update({"school_id": values["id"], "school_name": school.name})
+        school_paths[values["id"]] = path
+        if existing is None:
+            paths_to_insert.append({"region_id": values["id"], "level": LevelEnum.SCHOOL.value, **path})
+        elif existing.name != school.name or existing.block_id != school.block_id:
+            paths_to_update.append({"target_school_id": values["id"], **path})
+
+        school_classes[values["id"]] = (school.created_by, list(dict.fromkeys((item.grade.strip(), (item.section or "").strip() or None) for item in school.classes)))
+    report["skipped"] = len(schools) - report["created"] - report["updated"] - report["unchanged"]
+
+    # Stage 4: classes the schools don't have yet
+    existing_classes = set()
+    existing_school_ids = [school.id for school in existing_schools.values() if school.id in school_classes]
+    if existing_school_ids:
+        result = await db.execute(
+            select(models.Class.school_id, models.Class.grade, models.Class.section).filter(models.Class.school_id.in_(existing_school_ids))
+        )
+        existing_classes = set(result.all())
+    classes_to_insert = []
+    for school_id, (created_by, classes) in school_classes.items():
+        for grade, section in classes:
+            if (school_id, grade, section) in existing_classes:
+                continue
+            class_id = str(uuid.uuid4())
+            classes_to_insert.append({"id": class_id, "school_id": school_id, "grade": grade, "section": section, "created_by": created_by})
+            paths_to_insert.append({
+                **school_paths[school_id],
+                "region_id": class_id,
+                "level": LevelEnum.CLASS.value,
+                "class_id": class_id,
+                "class_name": region_path_service.get_class_name(grade, section),
+            })
+    report["classes_created"] = len(classes_to_insert)
+
+    # Stage 5: batched writes, committed together
+    upsert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    try:
+        for start in range(0, len(schools_to_upsert), BULK_SCHOOL_BATCH_SIZE):
+            statement = upsert(models.School).values(schools_to_upsert[start:start + BULK_SCHOOL_BATCH_SIZE])
+            await db.execute(statement.on_conflict_do_update(
+                index_elements=[models.School.dise_code],
+                set_={
+                    **{column: statement.excluded[column] for column in BULK_SCHOOL_UPDATE_COLUMNS},
+                    "last_updated_at": func.now(),
+                    "last_updated_by": statement.excluded.created_by,
+                },
+            ))
+        if classes_to_insert:
+            await db.execute(insert(models.Class), classes_to_insert)
+        if paths_to_insert:
+            await db.execute(insert(RegionPath), paths_to_insert)
+        if paths_to_update:
+            # Renamed or moved schools: refresh the school and class paths below them
+            path_table = RegionPath.__table__
+            await db.execute(
+                path_table.update()
+                .where(path_table.c.school_id == bindparam("target_school_id"))
+                .values({column: bindparam(column) for column in paths_to_update[0] if column != "target_school_id"}),
+                paths_to_update,
+            )
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.warning(str(e))
+        raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
+
+    return {"status": "completed", "total_rows": len(schools), **report}
+
+
 async def update_school(db: AsyncSession, school_id: str, school: schemas.SchoolUpdate):
     try:
         result = await db.execute(select(models.School).filter(models.School.id == school_id))
@@ -172,6 +299,7 @@ async def update_school(db: AsyncSession, school_id: str, school: schemas.School
         for key, value in school.model_dump(exclude_none=True).items():
             setattr(db_school, key, value)
 
+        await region_path_service.update_region_path(db, LevelEnum.SCHOOL, db_school.id, db_school.name, db_school.block_id)
         await db.commit()
         await db.refresh(db_school)
     except Exception as e:
@@ -188,6 +316,7 @@ async def delete_school(db: AsyncSession, school_id: str):
         if not db_school:
             raise HTTPException(status_code=404, detail=SCHOOL_DOES_NOT_EXIST_ERROR)
 
+        await region_path_service.delete_region_path(db, LevelEnum.SCHOOL, school_id)
         await db.delete(db_school)
         await db.commit()
     except Exception as e:
@@ -199,52 +328,27 @@ async def get_school_class(db: AsyncSession, class_id: str):
     result = await db.execute(select(models.Class).filter(models.Class.id == class_id))
     return result.scalar()
 
-async def get_school_classes(db: AsyncSession, school_id: str):
-    # Fetch role_id for RoleEnum.STUDENT
-    student_role_id_subquery = (
-        select(Role.id)
-        .filter(Role.name == RoleEnum.STUDENT)
-        .limit(1)
-        .scalar_subquery()
-    )
-
-    # Subquery to get class teacher's user_id
-    subquery_teacher = (
-        select(UserRole.user_id)
-        .filter(UserRole.level_id == models.Class.id, UserRole.level == LevelEnum.CLASS)
-        .limit(1)
-        .scalar_subquery()
-    )
-
-    subquery_teacher_assignment_id = (
-        select(UserRole.id)
-        .filter(UserRole.level_id == models.Class.id, UserRole.level == LevelEnum.CLASS)
-        .limit(1)
-        .scalar_subquery()
-    )
+async def get_school_classes(db: AsyncSession, school_id: str, include_students: bool = False):
+    student_role_id = await role_service.get_role_id(db, RoleEnum.STUDENT)
+    teacher_role_id = await role_service.get_role_id(db, RoleEnum.TEACHER)
 
-    # Subquery to count students in each class
-    subquery_student_count = (
-        select(func.count())
-        .filter(
-            UserRole.level_id == models.Class.id,
-            UserRole.level == LevelEnum.CLASS,
-            UserRole.role_id == student_role_id_subquery  # Filter by student role_id
+    # One pass over the class-level assignments of this school gives the student count
+    # and the class teacher's assignment of every class
+    class_assignments = (
+        select(
+            UserRole.level_id.label('class_id'),
+            func.count(case((UserRole.role_id == student_role_id, UserRole.id))).label('student_count'),
+            func.min(case((UserRole.role_id == teacher_role_id, UserRole.id))).label('teacher_assignment_id'),
         )
-        .scalar_subquery()
-    )
-
-    # Correlated subquery to get teacher's name
-    subquery_teacher_name = (
-        select(func.concat(ILPUser.first_name, literal(" "), ILPUser.last_name))
-        .join(UserRole, UserRole.user_id == ILPUser.id)
+        .join(models.Class, models.Class.id == UserRole.level_id)
         .filter(
-            UserRole.level_id == models.Class.id,
-            UserRole.level == LevelEnum.CLASS
+            models.Class.school_id == school_id,
+            UserRole.level == LevelEnum.CLASS,
         )
-        .limit(1)
-        .scalar_subquery()
+        .group_by(UserRole.level_id)
+        .subquery()
     )
+    teacher_assignment = aliased(UserRole)
 
     # Main query to fetch class information with teacher's name and student count
     result = await db.execute(
@@ -252,18 +356,45 @@ async def get_school_classes(db: AsyncSession, school_id: str):
             models.Class.id.label('class_id'),
             models.Class.grade,
             models.Class.section,
-            subquery_teacher.label('class_teacher_id'),
-            subquery_teacher_name.label('class_teacher_name'),
-            subquery_student_count.label('student_count'),
-            subquery_teacher_assignment_id.label('teacher_assignment_id'),
-        ).filter(models.Class.school_id == school_id))
+            teacher_assignment.user_id.label('class_teacher_id'),
+            case((ILPUser.id != None, func.concat(ILPUser.first_name, literal(" "), ILPUser.last_name))).label('class_teacher_name'),
+            func.coalesce(class_assignments.c.student_count, 0).label('student_count'),
+            class_assignments.c.teacher_assignment_id,
+        )
+        .outerjoin(class_assignments, class_assignments.c.class_id == models.Class.id)
+        .outerjoin(teacher_assignment, teacher_assignment.id == class_assignments.c.teacher_assignment_id)
+        .outerjoin(ILPUser, ILPUser.id == teacher_assignment.user_id)
+        .filter(models.Class.school_id == school_id)
+    )
+    classes = result.mappings().all()
+    if not include_students:
+        return classes
 
-    return result.mappings().all()
+    # Rosters of every class in the school come from one more query, not one per class
+    result = await db.execute(
+        select(UserRole.level_id, ILPUser)
+        .join(ILPUser, ILPUser.id == UserRole.user_id)
+        .join(models.Class, models.Class.id == UserRole.level_id)
+        .filter(
+            models.Class.school_id == school_id,
+            UserRole.level == LevelEnum.CLASS,
+            UserRole.role_id == student_role_id,
+        )
+        .order_by(UserRole.level_id, ILPUser.first_name, ILPUser.last_name)
+    )
+    students = {}
+    for class_id, student in result.all():
+        students.setdefault(class_id, []).append(student)
+
+    return [{**school_class, "students": students.get(school_class["class_id"], [])} for school_class in classes]
 
 async def create_school_class(db: AsyncSession, school_class: schemas.ClassBase):
     try:
         db_class = models.Class(**school_class.model_dump())
         db.add(db_class)
+        await region_path_service.add_region_path(
+            db, LevelEnum.CLASS, db_class.id, region_path_service.get_class_name(db_class.grade, db_class.section), db_class.school_id
+        )
         await db.commit()
         await db.refresh(db_class)
     except Exception as e:
@@ -282,6 +413,9 @@ async def update_school_class(db: AsyncSession, class_id: str, school_class: sch
         for key, value in school_class.model_dump(exclude_none=True).items():
             setattr(db_school, key, value)
 
+        await region_path_service.update_region_path(
+            db, LevelEnum.CLASS, db_school.id, region_path_service.get_class_name(db_school.grade, db_school.section), db_school.school_id
+        )
         await db.commit()
         await db.refresh(db_school)
     except Exception as e:
@@ -302,6 +436,7 @@ async def delete_school_class(db: AsyncSession, class_id: str):
         if not db_class:
             raise HTTPException(status_code=404, detail=CLASS_DOES_NOT_EXIST_ERROR)
 
+        await region_path_service.delete_region_path(db, LevelEnum.CLASS, class_id)
         await db.delete(db_class)
         await db.commit()
     except Exception as e:
@@ -310,7 +445,25 @@ async def delete_school_class(db: AsyncSession, class_id: str):
     return {"message": SCHOOL_DELETE_SUCCESSFUL}
 
 
+def _get_school_details_dict(school: models.School, region_path: Optional[RegionPath]) -> dict:
+    return {
+        "id": school.id,
+        "name": school.name,
+        **{field: getattr(school, field) for field in school.__table__.columns.keys()},
+        "block_id": school.block_id,
+        "block_name": region_path.block_name if region_path else None,
+        "district_id": region_path.district_id if region_path else None,
+        "district_name": region_path.district_name if region_path else None,
+        "zone_id": region_path.zone_id if region_path else None,
+        "zone_name": region_path.zone_name if region_path else None,
+        "state_id": region_path.state_id if region_path else None,
+        "state_name": region_path.state_name if region_path else None,
+        "created_by": school.creator.email if school.creator else None,
+        "updated_by": school.updater.email if school.updater else None,
+    }
+
+
 def _extract_detail_text(error_message: str) -> str:
-    print(error_message)
+    logger.warning(error_message)
     match = re.search(r"DETAIL:\s+(.*)", error_message)
     return match.group(1) if match else "Error occurred while processing the request"
@@ -0,0 +1,99 @@
+from typing import Optional
+from functools import lru_cache
+import heapq
+import re
+
+_word_pattern = re.compile(r"\w+")
+
+
+def get_words(value: str) -> list:
+    return _word_pattern.findall(value.lower())
+
+
+def get_trigrams(value: str) -> set:
+    ''' Trigrams of every word padded the way pg_trgm does, so scores line up with similarity() '''
+    trigrams = set()
+    for word in get_words(value):
+        trigrams.update(get_word_trigrams(word))
+    return trigrams
+
+
+@lru_cache(maxsize=65536)
+def get_word_trigrams(word: str) -> frozenset:
+    padded = f"  {word} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class InMemorySearchIndex:
+    '''
+    Trigram inverted index over search documents. Every query term must appear in a document's
+    text (the same rule as the ILIKE '%term%' filters); matches are ranked by trigram similarity.
+    '''
+
+    def __init__(self, documents: list):
+        # documents: dicts with id, group, type, name, description and the text to match against
+        self.documents = documents
+        self.document_text = []
+        self.document_trigram_counts = []
+        self.postings = {}
+        for position, document in enumerate(documents):
+            words = get_words(document["text"])
+            trigrams = frozenset().union(*map(get_word_trigrams, words))
+            self.document_text.append(" ".join(words))
+            self.document_trigram_counts.append(len(trigrams))
+            for trigram in trigrams:
+                postings = self.postings.get(trigram)
+                if postings is None:
+                    self.postings[trigram] = postings = set()
+                postings.add(position)
+
+    def search(self, query: str, groups: Optional[set] = None, limit: int = 20) -> list:
+        terms = get_words(query)
+        if not terms:
+            return []
+
+        candidates = None
+        for term in terms:
+            term_candidates = self._get_term_candidates(term)
+            candidates = term_candidates if candidates is None else candidates & term_candidates
+            if not candidates:
+                return []
+
+        query_trigrams = get_trigrams(query)
+        results = []
+        for position in candidates:
+            document = self.documents[position]
+            if groups and document["group"] not in groups:
+                continue
+            document_text = self.document_text[position]
+            if not all(term in document_text for term in terms):
+                continue
+            results.append({
+                "id": document["id"],
+                "type": document["type"],
+                "name": document["name"],
+                "description": document["description"],
+                "score": self._get_similarity(query_trigrams, position),
+            })
+
+        # Short type-ahead prefixes match most documents; only the top few need ordering
+        return heapq.nsmallest(limit, results, key=lambda result: (-result["score"], result["name"]))
+
+    def _get_similarity(self, query_trigrams: set, position: int) -> float:
+        # Only trigram counts are kept per document; the shared ones are looked up in the postings
+        shared = sum(1 for trigram in query_trigrams if position in self.postings.get(trigram, ()))
+        total = len(query_trigrams) + self.document_trigram_counts[position] - shared
+        return shared / total if total else 0.0
+
+    def _get_term_candidates(self, term: str) -> set:
+        if len(term) < 3:
+            # Too short for an inner trigram: match words that start with the term
+            padded = f"  {term}"
+            trigrams = {padded[i:i + 3] for i in range(len(padded) - 2)}
+        else:
+            trigrams = {term[i:i + 3] for i in range(len(term) - 2)}
+
+        postings = sorted((self.postings.get(trigram, set()) for trigram in trigrams), key=len)
+        if not postings or not postings[0]:
+            return set()
+        return set.intersection(*postings)
@@ -0,0 +1,9 @@
+from typing import Optional
+from pydantic import BaseModel
+
+class SearchResult(BaseModel):
+    id: str
+    type: str
+    name: str
+    description: Optional[str] = None
+    score: float = 0
@@ -0,0 +1,161 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func, literal, or_, cast, String, union_all
+from typing import Optional
+import asyncio
+import time
+from .index import InMemorySearchIndex
+from ..ilpuser.models import ILPUser
+from ..school.models import School
+from ..state.models import State
+from ..zone.models import Zone
+from ..district.models import District
+from ..block.models import Block
+from ...config import SEARCH_BACKEND, SEARCH_INDEX_TTL_SECONDS
+from ...write_tracking import on_committed_write
+
+SEARCH_GROUPS = ("user", "school", "region")
+REGION_MODELS = {"state": State, "zone": Zone, "district": District, "block": Block}
+
+# Tables the in-memory index is built from; a committed write to any of them drops the index
+SEARCH_TABLES = {model.__tablename__ for model in (ILPUser, School, *REGION_MODELS.values())}
+
+# In-memory index, used when SEARCH_BACKEND is "memory" or the database has no pg_trgm.
+# The generation counter is bumped on every invalidation, so an index built while a write
+# committed is used for that request but not kept.
+_index: Optional[InMemorySearchIndex] = None
+_index_loaded_at: Optional[float] = None
+_index_generation = 0
+_index_lock = asyncio.Lock()
+
+
+async def search(db: AsyncSession, query: str, groups: list, limit: int = 20) -> list:
+    ''' Users, schools and regions matching every term of the query, best matches first '''
+    if _use_memory_index(db):
+        index = await get_search_index(db)
+        return index.search(query, set(groups), limit)
+
+    terms = [_escape_like(term) for term in query.split()]
+    if not terms:
+        return []
+
+    results = []
+    if "user" in groups:
+        results += await _search_users(db, query, terms, limit)
+    if "school" in groups:
+        results += await _search_schools(db, query, terms, limit)
+    if "region" in groups:
+        results += await _search_regions(db, query, terms, limit)
+
+    results.sort(key=lambda result: (-result["score"], result["name"]))
+    return results[:limit]
+
+
+async def get_search_index(db: AsyncSession) -> InMemorySearchIndex:
+    if _is_index_fresh():
+        return _index
+
+    async with _index_lock:
+        # Concurrent requests wait for the one that is already building the index
+        if _is_index_fresh():
+            return _index
+        return await _load_search_index(db)
+
+
+def invalidate_search_index():
+    global _index_loaded_at, _index_generation
+    _index_loaded_at = None
+    _index_generation += 1
+
+
+def _use_memory_index(db: AsyncSession) -> bool:
+    return SEARCH_BACKEND == "memory" or db.get_bind().dialect.name != "postgresql"
+
+
+def _is_index_fresh() -> bool:
+    return _index_loaded_at is not None and time.monotonic() - _index_loaded_at < SEARCH_INDEX_TTL_SECONDS
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+def _get_term_conditions(terms: list, columns: list) -> list:
+    ''' Every term has to match one of the columns, the same ILIKE '%term%' the list filters use '''
+    return [or_(*(column.ilike(f"%{term}%", escape="!") for column in columns)) for term in terms]
+
+
+async def _search_users(db: AsyncSession, query: str, terms: list, limit: int) -> list:
+    full_name = ILPUser.first_name + literal(" ") + ILPUser.last_name
+    score = func.greatest(func.word_similarity(query, full_name), func.word_similarity(query, ILPUser.email))
+    result = await db.execute(
+        select(ILPUser.id, full_name.label("name"), ILPUser.email.label("description"), score.label("score"))
+        .filter(*_get_term_conditions(terms, [ILPUser.first_name, ILPUser.last_name, ILPUser.email]))
+        .order_by(score.desc())
+        .limit(limit)
+    )
+    return [{"type": "user", **row} for row in result.mappings().all()]
+
+
+async def _search_schools(db: AsyncSession, query: str, terms: list, limit: int) -> list:
+    dise_code = cast(School.dise_code, String)
+    score = func.greatest(
+        func.word_similarity(query, School.name),
+        func.word_similarity(query, School.long_name),
+        func.word_similarity(query, dise_code),
+    )
+    result = await db.execute(
+        select(School.id, School.name, dise_code.label("description"), score.label("score"))
+        .filter(*_get_term_conditions(terms, [School.name, School.long_name, dise_code]))
+        .order_by(score.desc())
+        .limit(limit)
+    )
+    return [{"type": "school", **row} for row in result.mappings().all()]
+
+
+async def _search_regions(db: AsyncSession, query: str, terms: list, limit: int) -> list:
+    regions = union_all(*(
+        select(
+            model.id,
+            model.name,
+            literal(region_type).label("type"),
+            func.word_similarity(query, model.name).label("score"),
+        ).filter(*_get_term_conditions(terms, [model.name]))
+        for region_type, model in REGION_MODELS.items()
+    )).subquery()
+    result = await db.execute(select(regions).order_by(regions.c.score.desc()).limit(limit))
+    return [{"description": None, **row} for row in result.mappings().all()]
+
+
+async def _load_search_index(db: AsyncSession) -> InMemorySearchIndex:
+    global _index, _index_loaded_at
+    generation = _index_generation
+
+    documents = []
+    result = await db.execute(select(ILPUser.id, ILPUser.first_name, ILPUser.last_name, ILPUser.email))
+    for user_id, first_name, last_name, email in result.all():
+        name = f"{first_name} {last_name}"
+        documents.append({"id": user_id, "group": "user", "type": "user", "name": name, "description": email, "text": f"{name} {email}"})
+
+    result = await db.execute(select(School.id, School.name, School.long_name, School.dise_code))
+    for school_id, name, long_name, dise_code in result.all():
+        description = str(dise_code) if dise_code is not None else None
+        text = " ".join(value for value in (name, long_name, description) if value)
+        documents.append({"id": school_id, "group": "school", "type": "school", "name": name, "description": description, "text": text})
+
+    for region_type, model in REGION_MODELS.items():
+        result = await db.execute(select(model.id, model.name))
+        for region_id, name in result.all():
+            documents.append({"id": region_id, "group": "region", "type": region_type, "name": name, "description": None, "text": name})
+
+    # Building the postings is CPU work proportional to the number of rows, keep it off the event loop
+    index = await asyncio.to_thread(InMemorySearchIndex, documents)
+
+    if generation == _index_generation:
+        _index = index
+        _index_loaded_at = time.monotonic()
+    return index
+
+
+# Invalidation: the index is dropped once a write to a searched table commits
+on_committed_write(SEARCH_TABLES, lambda tables: invalidate_search_index())
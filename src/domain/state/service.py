@@ -3,8 +3,13 @@ from sqlalchemy.future import select
 from sqlalchemy import func
 import re
 from . import models, schemas
+from ...rows import get_response_columns, get_field_columns, get_rows
+from ..region_path import service as region_path_service
+from ..region_tree import service as region_tree_service
+from ..role_assignment.models import LevelEnum
 from fastapi import HTTPException
 from resources.strings import STATE_CREATE_SUCCESSFUL, STATE_DELETE_SUCCESSFUL, STATE_UPDATE_SUCCESSFUL, STATE_DOES_NOT_EXIST_ERROR
+from logger import logger
 
 
 async def get_state(db: AsyncSession, state_id: str):
@@ -18,28 +23,27 @@ async def get_state_by_name(db: AsyncSession, name: str):
     return result.scalar()
 
 async def get_states(db: AsyncSession, skip: int = 0, limit: int = 100):
-    result = await db.execute(select(models.State).offset(skip).limit(limit))
-    return result.scalars().all()
+    columns = get_response_columns(models.State, schemas.StateResponse)
+    return await get_rows(db, select(*columns).offset(skip).limit(limit))
 
 
 async def get_states_by_params(
     db: AsyncSession, selected_fields: list, filters: list, ordering: list, skip: int = 0, limit: int = 100
 ):
-    orm_attributes = [getattr(models.State, field) for field in selected_fields]
-    result = await db.execute(
-        select(*orm_attributes).filter(*filters).order_by(*ordering).offset(skip).limit(limit)
-    )
-    return result.all()
+    columns = get_field_columns(models.State, selected_fields)
+    return await get_rows(db, select(*columns).filter(*filters).order_by(*ordering).offset(skip).limit(limit))
 
 
 async def create_state(db: AsyncSession, state: schemas.StateBase):
     try:
         db_state = models.State(**state.model_dump())
         db.add(db_state)
+        await region_path_service.add_region_path(db, LevelEnum.STATE, db_state.id, db_state.name)
+        region_tree_service.add_region_node(db, LevelEnum.STATE, db_state.id, db_state.name)
         await db.commit()
         await db.refresh(db_state)
     except Exception as e:
-        print(str(e))
+        logger.warning(str(e))
         raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
     return db_state
 
@@ -54,10 +58,12 @@ async def update_state(db: AsyncSession, state_id: str, state: schemas.StateUpda
         for key, value in state.model_dump(exclude_none=True).items():
             setattr(db_state, key, value)
 
+        await region_path_service.update_region_path(db, LevelEnum.STATE, db_state.id, db_state.name)
+        region_tree_service.update_region_node(db, LevelEnum.STATE, db_state.id, db_state.name)
         await db.commit()
         await db.refresh(db_state)
     except Exception as e:
-        print(str(e))
+        logger.warning(str(e))
         raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
     return {"message": STATE_UPDATE_SUCCESSFUL}
 
@@ -69,6 +75,8 @@ async def delete_state(db: AsyncSession, state_id: str):
         if not db_state:
             raise HTTPException(status_code=404, detail=STATE_DOES_NOT_EXIST_ERROR)
 
+        await region_path_service.delete_region_path(db, LevelEnum.STATE, state_id)
+        region_tree_service.delete_region_node(db, LevelEnum.STATE, state_id)
         await db.delete(db_state)
         await db.commit()
     except Exception as e:
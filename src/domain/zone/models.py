@@ -10,7 +10,7 @@ class Zone(Base):
 
     id = Column(String, primary_key=True)
     name = Column(String, nullable=False)
-    state_id = Column(String, ForeignKey("states.id"), nullable=False)  # Enforcing foreign key
+    state_id = Column(String, ForeignKey("states.id"), nullable=False, index=True)  # Enforcing foreign key
     description = Column(String)
 
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=text("CURRENT_TIMESTAMP"))
@@ -3,8 +3,13 @@ from sqlalchemy.future import select
 from sqlalchemy import func
 import re
 from . import models, schemas
+from ...rows import get_response_columns, get_field_columns, get_rows
+from ..region_path import service as region_path_service
+from ..region_tree import service as region_tree_service
+from ..role_assignment.models import LevelEnum
 from fastapi import HTTPException
 from resources.strings import ZONE_UPDATE_SUCCESSFUL, ZONE_DOES_NOT_EXIST_ERROR, ZONE_DELETE_SUCCESSFUL
+from logger import logger
 
 
 async def get_zone(db: AsyncSession, zone_id: str):
@@ -18,27 +23,26 @@ async def get_zone_by_name(db: AsyncSession, name: str):
     return result.scalar()
 
 async def get_zones(db: AsyncSession, skip: int = 0, limit: int = 100):
-    result = await db.execute(select(models.Zone).offset(skip).limit(limit))
-    return result.scalars().all()
+    columns = get_response_columns(models.Zone, schemas.ZoneResponse)
+    return await get_rows(db, select(*columns).offset(skip).limit(limit))
 
 
 async def get_zones_by_params(
     db: AsyncSession, selected_fields: list, filters: list, ordering: list, skip: int = 0, limit: int = 100
 ):
-    orm_attributes = [getattr(models.Zone, field) for field in selected_fields]
-    result = await db.execute(
-        select(*orm_attributes).filter(*filters).order_by(*ordering).offset(skip).limit(limit)
-    )
-    return result.all()
+    columns = get_field_columns(models.Zone, selected_fields)
+    return await get_rows(db, select(*columns).filter(*filters).order_by(*ordering).offset(skip).limit(limit))
 
 async def create_zone(db: AsyncSession, zone: schemas.ZoneBase):    
     try:
         db_zone = models.Zone(**zone.model_dump())
         db.add(db_zone)
+        await region_path_service.add_region_path(db, LevelEnum.ZONE, db_zone.id, db_zone.name, db_zone.state_id)
+        region_tree_service.add_region_node(db, LevelEnum.ZONE, db_zone.id, db_zone.name, db_zone.state_id)
         await db.commit()
         await db.refresh(db_zone)
     except Exception as e:
-        print(str(e))
+        logger.warning(str(e))
         raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
     return db_zone
 
@@ -53,10 +57,12 @@ async def update_zone(db: AsyncSession, zone_id: str, zone: schemas.ZoneUpdate):
         for key, value in zone.model_dump(exclude_none=True).items():
             setattr(db_zone, key, value)
 
+        await region_path_service.update_region_path(db, LevelEnum.ZONE, db_zone.id, db_zone.name, db_zone.state_id)
+        region_tree_service.update_region_node(db, LevelEnum.ZONE, db_zone.id, db_zone.name, db_zone.state_id)
         await db.commit()
         await db.refresh(db_zone)
     except Exception as e:
-        print(str(e))
+        logger.warning(str(e))
         raise HTTPException(status_code=400, detail=_extract_detail_text(str(e)))
     return {"message": ZONE_UPDATE_SUCCESSFUL}
 
@@ -68,6 +74,8 @@ async def delete_zone(db: AsyncSession, zone_id: str):
         if not db_zone:
             raise HTTPException(status_code=404, detail=ZONE_DOES_NOT_EXIST_ERROR)
 
+        await region_path_service.delete_region_path(db, LevelEnum.ZONE, zone_id)
+        region_tree_service.delete_region_node(db, LevelEnum.ZONE, zone_id)
         await db.delete(db_zone)
         await db.commit()
     except Exception as e:
@@ -0,0 +1,201 @@
+from contextvars import ContextVar
+from typing import Optional
+import bisect
+import time
+from sqlalchemy import event
+from .config import REQUEST_QUERY_BUDGET
+from .database import engine, get_pool_metrics
+from logger import logger
+
+###
+# Request and query instrumentation, exported in the Prometheus text format.
+# Everything is kept in process memory, so no collector or client library is needed: point a
+# scraper (or a test) at GET /metrics.
+###
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Route label for requests that matched no route, so unknown paths don't create new series
+UNMATCHED_ROUTE = "unmatched"
+
+# Query count and database time of the request being handled, shared with the SQLAlchemy hooks
+_request_stats: ContextVar[Optional[dict]] = ContextVar("request_stats", default=None)
+
+_requests_total = {}          # (method, route, status) -> count
+_request_latency = {}         # (method, route) -> histogram
+_request_queries = {}         # (method, route) -> histogram
+_db_seconds_total = {}        # (method, route) -> seconds
+_query_budget_exceeded = {}   # (method, route) -> count
+_requests_in_flight = 0
+_queries_total = 0
+
+
+class PrometheusMiddleware:
+    ''' ASGI middleware timing every HTTP request and the queries it runs '''
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        global _requests_in_flight
+        status = 500
+        stats = {"queries": 0, "db_seconds": 0.0}
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        _requests_in_flight += 1
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _requests_in_flight -= 1
+            _request_stats.reset(token)
+            _record_request(scope, status, time.perf_counter() - started, stats)
+
+
+def _get_route(scope) -> str:
+    # The router stores the matched route on the scope; its path template keeps the labels bounded
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def _observe(histograms: dict, key: tuple, buckets: tuple, value: float):
+    histogram = histograms.get(key)
+    if histogram is None:
+        histogram = histograms[key] = {"buckets": [0] * len(buckets), "sum": 0.0, "count": 0}
+    # Per-bucket counts; they are made cumulative when rendered, values above the last bound only reach +Inf
+    position = bisect.bisect_left(buckets, value)
+    if position < len(buckets):
+        histogram["buckets"][position] += 1
+    histogram["sum"] += value
+    histogram["count"] += 1
+
+
+def _record_request(scope, status: int, seconds: float, stats: dict):
+    method = scope["method"]
+    route = _get_route(scope)
+    key = (method, route)
+
+    status_key = (method, route, str(status))
+    _requests_total[status_key] = _requests_total.get(status_key, 0) + 1
+    _observe(_request_latency, key, LATENCY_BUCKETS, seconds)
+    _observe(_request_queries, key, QUERY_COUNT_BUCKETS, stats["queries"])
+    _db_seconds_total[key] = _db_seconds_total.get(key, 0.0) + stats["db_seconds"]
+
+    if REQUEST_QUERY_BUDGET and stats["queries"] > REQUEST_QUERY_BUDGET:
+        # Usually one query per row of the response (N+1)
+        _query_budget_exceeded[key] = _query_budget_exceeded.get(key, 0) + 1
+        logger.warning(f"{method} {route} ran {stats['queries']} queries (budget {REQUEST_QUERY_BUDGET})")
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    global _queries_total
+    started = conn.info["query_started"].pop()
+    _queries_total += 1
+    stats = _request_stats.get()
+    if stats is not None:
+        stats["queries"] += 1
+        stats["db_seconds"] += time.perf_counter() - started
+
+
+@event.listens_for(engine.sync_engine, "handle_error")
+def _drop_query_timer(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+def render_metrics() -> str:
+    lines = []
+
+    def add_metric(name: str, metric_type: str, help_text: str, samples: list):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for sample_name, labels, value in samples:
+            lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+
+    add_metric(
+        "http_requests_total", "counter", "HTTP requests by method, route and status code.",
+        [("http_requests_total", {"method": m, "route": r, "status": s}, v) for (m, r, s), v in sorted(_requests_total.items())],
+    )
+    add_metric(
+        "http_requests_in_flight", "gauge", "HTTP requests currently being handled.",
+        [("http_requests_in_flight", {}, _requests_in_flight)],
+    )
+    add_metric(
+        "http_request_duration_seconds", "histogram", "HTTP request latency by method and route.",
+        _get_histogram_samples("http_request_duration_seconds", _request_latency, LATENCY_BUCKETS),
+    )
+    add_metric(
+        "http_request_db_queries", "histogram", "Database queries run per HTTP request.",
+        _get_histogram_samples("http_request_db_queries", _request_queries, QUERY_COUNT_BUCKETS),
+    )
+    add_metric(
+        "http_request_db_seconds_total", "counter", "Time spent in database queries by method and route.",
+        [("http_request_db_seconds_total", {"method": m, "route": r}, v) for (m, r), v in sorted(_db_seconds_total.items())],
+    )
+    add_metric(
+        "http_request_query_budget_exceeded_total", "counter", f"Requests that ran more than {REQUEST_QUERY_BUDGET} queries.",
+        [("http_request_query_budget_exceeded_total", {"method": m, "route": r}, v) for (m, r), v in sorted(_query_budget_exceeded.items())],
+    )
+    add_metric(
+        "db_queries_total", "counter", "Database queries run, including those outside requests.",
+        [("db_queries_total", {}, _queries_total)],
+    )
+
+    pool = get_pool_metrics()
+    for name in ("size", "checked_in", "checked_out", "overflow"):
+        if name in pool:
+            add_metric(f"db_pool_{name}", "gauge", f"Connection pool {name.replace('_', ' ')}.", [(f"db_pool_{name}", {}, pool[name])])
+    for name in ("checkouts", "connections_created", "connections_invalidated", "checkout_timeouts", "checkout_wait_seconds_total"):
+        metric_name = f"db_pool_{name}" if name.endswith("_total") else f"db_pool_{name}_total"
+        add_metric(metric_name, "counter", f"Connection pool {name.replace('_', ' ')} since startup.", [(metric_name, {}, pool[name])])
+
+    return "\n".join(lines) + "\n"
+
+
+def _get_histogram_samples(name: str, histograms: dict, buckets: tuple) -> list:
+    samples = []
+    for (method, route), histogram in sorted(histograms.items()):
+        labels = {"method": method, "route": route}
+        cumulative = 0
+        for bound, count in zip(buckets, histogram["buckets"]):
+            cumulative += count
+            samples.append((f"{name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+        samples.append((f"{name}_bucket", {**labels, "le": "+Inf"}, histogram["count"]))
+        samples.append((f"{name}_sum", labels, histogram["sum"]))
+        samples.append((f"{name}_count", labels, histogram["count"]))
+    return samples
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label_value(value)}"' for key, value in labels.items()) + "}"
+
+
+def _escape_label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float):
+        return repr(value) if not value.is_integer() else f"{value:.1f}"
+    return str(value)
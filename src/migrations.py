@@ -0,0 +1,152 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index, text, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.schema import CreateIndex
+import re
+from .database import Base
+from .collection_versions import CollectionVersion, COLLECTION_TABLES
+from .domain.role_assignment.models import UserRole
+from .domain.school.models import School, Class
+from .domain.zone.models import Zone
+from .domain.district.models import District
+from .domain.block.models import Block
+from logger import logger
+
+###
+# Versioned schema migrations.
+# create_all only creates missing tables, so changes to existing tables (new indexes, columns)
+# are added here as numbered steps. Each step runs once per database and is recorded in
+# schema_migrations. Steps run outside a transaction so PostgreSQL can build indexes
+# CONCURRENTLY, without blocking writes to a live table, and a session advisory lock keeps
+# workers that start together from running them twice. Steps must be idempotent: on a fresh
+# database create_all has already built the final schema, and a step interrupted halfway is
+# run again in full.
+###
+
+# pg_advisory_lock key held while migrations run
+MIGRATION_LOCK_ID = 4711001
+
+class SchemaMigration(Base):
+    __tablename__ = "schema_migrations"
+
+    version = Column(Integer, primary_key=True)
+    description = Column(String, nullable=False)
+    applied_at = Column(DateTime(timezone=True), nullable=False, server_default=text("CURRENT_TIMESTAMP"))
+
+
+def _get_index(model, name: str) -> Index:
+    return next(index for index in model.__table__.indexes if index.name == name)
+
+
+def _drop_invalid_index(connection, name: str):
+    # A CONCURRENTLY build that fails leaves an invalid index behind, which IF NOT EXISTS would keep
+    invalid = connection.execute(text(
+        "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid WHERE c.relname = :name AND NOT i.indisvalid"
+    ), {"name": name}).first()
+    if invalid:
+        connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+
+def _create_trigram_indexes(*columns: tuple):
+    '''
+    GIN trigram indexes let PostgreSQL serve ILIKE '%value%' filters and similarity ranking.
+    Other databases have no pg_trgm, so the step only gets recorded there.
+    '''
+    def upgrade(connection):
+        if connection.dialect.name != "postgresql":
+            return
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for table, name, expression in columns:
+            _drop_invalid_index(connection, f"ix_{table}_{name}_trgm")
+            connection.execute(text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_{name}_trgm ON {table} USING gin (({expression}) gin_trgm_ops)"
+            ))
+    return upgrade
+
+
+def _create_indexes(*indexes: Index):
+    def upgrade(connection):
+        for index in indexes:
+            statement = str(CreateIndex(index, if_not_exists=True).compile(dialect=connection.dialect))
+            if connection.dialect.name == "postgresql":
+                _drop_invalid_index(connection, index.name)
+                statement = re.sub(r"^CREATE (UNIQUE )?INDEX", r"CREATE \1INDEX CONCURRENTLY", statement)
+            connection.execute(text(statement))
+    return upgrade
+
+
+def _seed_collection_versions(connection):
+    existing = set(connection.execute(select(CollectionVersion.collection)).scalars().all())
+    missing = [
+        {"collection": collection, "version": 0}
+        for collection, tables in COLLECTION_TABLES.items()
+        if tables and collection not in existing
+    ]
+    if missing:
+        connection.execute(CollectionVersion.__table__.insert(), missing)
+
+
+MIGRATIONS = [
+    (
+        1,
+        "Index role assignment access paths and region foreign keys",
+        _create_indexes(
+            _get_index(UserRole, "ix_user_role_assignments_user_id"),
+            _get_index(UserRole, "ix_user_role_assignments_level_id_level_role_id"),
+            _get_index(School, "ix_schools_block_id"),
+            _get_index(Class, "ix_classes_school_id"),
+            _get_index(Zone, "ix_zones_state_id"),
+            _get_index(District, "ix_districts_zone_id"),
+            _get_index(Block, "ix_blocks_district_id"),
+        ),
+    ),
+    (
+        2,
+        "Trigram indexes for name, email and dise code search",
+        _create_trigram_indexes(
+            ("ilp_users", "first_name", "first_name"),
+            ("ilp_users", "last_name", "last_name"),
+            ("ilp_users", "email", "email"),
+            ("schools", "name", "name"),
+            ("schools", "long_name", "long_name"),
+            # Matches the CAST(dise_code AS VARCHAR) the school filters and search compare against
+            ("schools", "dise_code", "CAST(dise_code AS VARCHAR)"),
+            ("states", "name", "name"),
+            ("zones", "name", "name"),
+            ("districts", "name", "name"),
+            ("blocks", "name", "name"),
+        ),
+    ),
+    (
+        3,
+        "Version counters behind the region, role and enum list ETags",
+        _seed_collection_versions,
+    ),
+    (
+        4,
+        "Version counter behind the dashboard summary snapshot",
+        _seed_collection_versions,
+    ),
+]
+
+
+async def run_migrations(engine: AsyncEngine):
+    ''' Apply every migration newer than the database's recorded versions '''
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        is_postgresql = conn.dialect.name == "postgresql"
+        if is_postgresql:
+            # Other workers wait here, then find the versions this one recorded
+            await conn.execute(text("SELECT pg_advisory_lock(:lock_id)"), {"lock_id": MIGRATION_LOCK_ID})
+        try:
+            result = await conn.execute(select(SchemaMigration.version))
+            applied = set(result.scalars().all())
+
+            for version, description, upgrade in MIGRATIONS:
+                if version in applied:
+                    continue
+                await conn.run_sync(upgrade)
+                await conn.execute(SchemaMigration.__table__.insert().values(version=version, description=description))
+                logger.info(f"Applied schema migration {version}: {description}")
+        finally:
+            if is_postgresql:
+                await conn.execute(text("SELECT pg_advisory_unlock(:lock_id)"), {"lock_id": MIGRATION_LOCK_ID})
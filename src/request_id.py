@@ -0,0 +1,35 @@
+import re
+import uuid
+from logger import request_id_var
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Ids supplied by clients or proxies are reused only if they are short and plain
+_valid_request_id = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class RequestIdMiddleware:
+    ''' Gives every HTTP request an id, logged with each record and returned as X-Request-ID '''
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header_name = REQUEST_ID_HEADER.lower().encode()
+        supplied = next((value.decode("latin-1") for name, value in scope["headers"] if name == header_name), "")
+        request_id = supplied if _valid_request_id.match(supplied) else uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", []).append((header_name, request_id.encode()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
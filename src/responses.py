@@ -0,0 +1,81 @@
+from decimal import Decimal
+from functools import lru_cache
+from typing import Optional
+from fastapi import Response
+from pydantic import TypeAdapter
+import orjson
+from .config import FAST_JSON_RESPONSES
+
+###
+# Fast JSON path for the list endpoints.
+# FastAPI validates a route's return value against its response_model, dumps the result to
+# JSON-compatible Python objects and then encodes those with the stdlib json module. Routes that
+# opt in return a ready Response instead, which FastAPI sends as is: ORM rows are validated once
+# and encoded to bytes by pydantic-core in the same pass, and dicts the server built itself are
+# encoded by orjson without being validated. response_model stays on the route for the OpenAPI
+# schema. FastAPI doesn't copy the headers a route set on its injected Response (ETag,
+# X-Next-Cursor) onto a returned one, so routes pass that Response along and the helpers carry
+# its headers over. With FAST_JSON_RESPONSES off the helpers hand the content back unchanged, so the route
+# falls back to FastAPI's own serialization.
+###
+
+
+class FastJSONResponse(Response):
+    ''' application/json response rendered with orjson; bytes are sent as they are '''
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        # OPT_UTC_Z writes UTC datetimes with a Z suffix, as pydantic does
+        return orjson.dumps(content, default=_encode_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z)
+
+
+def _encode_default(value):
+    # Types orjson leaves to the caller
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(response_type) -> TypeAdapter:
+    ''' One adapter per response type; building its validator and serializer is the expensive part '''
+    return TypeAdapter(response_type)
+
+
+def _get_fast_response(content, response: Optional[Response]) -> FastJSONResponse:
+    fast_response = FastJSONResponse(content)
+    if response is not None:
+        fast_response.headers.raw.extend(response.headers.raw)
+    return fast_response
+
+
+def get_model_response(content, response_type, exclude_none: bool = False, response: Optional[Response] = None):
+    ''' Validate ORM objects or rows against response_type and encode them to JSON in one pass '''
+    if not FAST_JSON_RESPONSES:
+        return content
+    adapter = get_type_adapter(response_type)
+    validated = adapter.validate_python(content, from_attributes=True)
+    return _get_fast_response(adapter.dump_json(validated, exclude_none=exclude_none), response)
+
+
+def get_trusted_response(content, response: Optional[Response] = None):
+    ''' Encode lists and dicts of plain values built by the server itself, without validation '''
+    if not FAST_JSON_RESPONSES:
+        return content
+    return _get_fast_response(content, response)
+
+
+def get_rows_response(rows: list, fields, exclude_none: bool = False, response: Optional[Response] = None):
+    '''
+    Encode column rows from src/rows.py without validation, shaped to fields: fields a row
+    lacks are null, or left out along with null values when exclude_none is set
+    '''
+    if exclude_none:
+        content = [{field: row[field] for field in fields if row.get(field) is not None} for row in rows]
+    else:
+        content = [{field: row.get(field) for field in fields} for row in rows]
+    return get_trusted_response(content, response)
@@ -1,14 +1,18 @@
 from typing import List
+import asyncio
+import contextlib
+import hashlib
 import os
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request, Response
 from sqlalchemy.orm import Session
 from ..dependencies import get_db_session
 from ..domain.activity import service, schemas, models
 from ..domain.asset import service as assetService, schemas as assetSchemas, models as assetModels
-from .util_functions import UserQueryRequest, LoginQueryRequest, generate_uuid, string_hash, success_message_response, get_order_by_conditions, get_filter_conditions, get_select_fields
+from .util_functions import UserQueryRequest, LoginQueryRequest, generate_uuid, success_message_response, get_order_by_conditions, get_filter_conditions, get_select_fields, get_cursor_pagination, set_next_cursor, get_file_response
+from ..responses import get_model_response, get_trusted_response, get_rows_response
 from resources.strings import ASSET_DOES_NOT_EXIST_ERROR, ACTIVITY_DOES_NOT_EXIST_ERROR
 from starlette.config import Config
-from fastapi.responses import StreamingResponse
 import mimetypes
 
 config = Config(".env")  # Automatically loads variables from .env file
@@ -18,6 +22,10 @@ router = APIRouter(tags=["activities"])
 ASSET_FILES_PATH = os.path.join(config("UPLOAD_FOLDER", default="/"), "assets")
 os.makedirs(ASSET_FILES_PATH, exist_ok=True)
 
+# Uploads are copied to disk in pieces of this size so a large video never sits in memory whole
+ASSET_UPLOAD_CHUNK_SIZE = 1024 * 1024
+UPLOAD_PART_SUFFIX = ".part"
+
 ALLOWED_TYPES = {
     "image": assetModels.AssetTypeEnum.IMAGE,
     "application": assetModels.AssetTypeEnum.DOCUMENT,  # like PDF, DOCX
@@ -38,7 +46,7 @@ async def read_activities(page_no: int = 1, page_size: int = 100, db: Session =
     limit = page_size
     skip = (page_no - 1) * page_size  # Offset calculation        
     activities = await service.get_activities(db, skip=skip, limit=limit)  # ✅ Await the async function
-    return activities
+    return get_trusted_response(activities)
 
 @router.get("/activity/{activity_id}", response_model=schemas.ActivityResponse)
 async def read_activity(activity_id: str, db: Session = Depends(get_db_session)):
@@ -57,6 +65,7 @@ async def get_academic_years(db: Session = Depends(get_db_session)):
 @router.post("/getActivitiesByParams/", response_model=List[schemas.ActivityResponse])
 async def read_activities_by_params(
         request: UserQueryRequest, 
+        response: Response,
         db: Session = Depends(get_db_session)):
 
     # Get all valid columns from the activity model
@@ -72,8 +81,12 @@ async def read_activities_by_params(
     limit = request.page_size
     skip = (request.page_no - 1) * request.page_size  # Offset calculation
 
-    db_activities = await service.get_activities_by_params(db, selected_fields, filter_cond, ordering, skip=skip, limit=limit)    
-    return db_activities
+    # A cursor switches to keyset pagination instead of skipping rows
+    query_fields, filter_cond, ordering, skip = get_cursor_pagination(request, table_fields, selected_fields, filter_cond, ordering, skip)
+
+    db_activities = await service.get_activities_by_params(db, query_fields, filter_cond, ordering, skip=skip, limit=limit)
+    set_next_cursor(response, request, db_activities, table_fields)
+    return get_rows_response(db_activities, schemas.ActivityResponse.model_fields, response=response)
 
 @router.put("/activity/{activity_id}", response_model=success_message_response)
 async def update_activity(activity_id: str, activity: schemas.ActivityUpdate, db: Session = Depends(get_db_session)):
@@ -134,7 +147,7 @@ async def read_asset_with_filters(
         filters=filters,
         skip=skip, limit=limit
     )
-    return db_asset
+    return get_model_response(db_asset, List[schemas.ActivityWithAssetsResponse])
 
 @router.get("/activityAssets/{activity_id}", response_model=List[assetSchemas.AssetResponse])
 async def read_asset(activity_id: str, db: Session = Depends(get_db_session)):
@@ -143,7 +156,7 @@ async def read_asset(activity_id: str, db: Session = Depends(get_db_session)):
         raise HTTPException(status_code=404, detail=ASSET_DOES_NOT_EXIST_ERROR)
     return db_data
 
-@router.post("/uploadAsset")
+@router.post("/uploadAsset", response_model=List[assetSchemas.AssetUploadResponse])
 async def upload_assets(
     activity_id: str = Form(...),
     files: List[UploadFile] = File(...),
@@ -153,71 +166,97 @@ async def upload_assets(
     if not activity_id:
         raise HTTPException(status_code=400, detail="Activity ID is required")
 
-    uploaded_assets = []
-    activityAssetsAssociation = []
-
+    # Check every file type before anything is written to disk
+    uploads = []
     for idx, file in enumerate(files):
         if not file:
             continue
 
-        file_location = os.path.join(ASSET_FILES_PATH, file.filename)
         mime_type = file.content_type
         main_type = mime_type.split("/")[0]
 
         if main_type not in ALLOWED_TYPES:
             raise HTTPException(status_code=400, detail=f"Unsupported file type: {mime_type}")
 
-        asset_type = ALLOWED_TYPES[main_type]
-
-        with open(file_location, "wb") as f:
-            content = await file.read()
-            f.write(content)
-
-        asset = assetSchemas.AssetBase(
-            id=str(generate_uuid()),
-            name=file.filename,
-            description=descriptions[idx] if idx < len(descriptions) else "",
-            type=asset_type,
-            url=file_location,
-            size=os.path.getsize(file_location),
-            mime_type=mime_type
-        )
-
-        created_asset = await assetService.create_asset(db=db, asset=asset)
-        uploaded_assets.append(created_asset)
-
-        activityAssetsAssociation.append(
-            assetSchemas.ActivityAssetBaseCreate(
+        file_location = os.path.join(ASSET_FILES_PATH, file.filename)
+        # Asset urls are unique, two files of one upload can't share a name
+        if any(location == file_location for _, _, _, location in uploads):
+            raise HTTPException(status_code=400, detail=f"Duplicate file name: {file.filename}")
+
+        uploads.append((idx, file, ALLOWED_TYPES[main_type], file_location))
+
+    # Stream all files to disk concurrently, each in fixed-size chunks on a worker thread.
+    # They land in temporary files that only replace the final paths once the rows are committed;
+    # part names are unique so uploads sharing a filename never write the same part.
+    part_locations = [f"{file_location}.{generate_uuid().hex}{UPLOAD_PART_SUFFIX}" for _, _, _, file_location in uploads]
+    try:
+        written = await asyncio.gather(*[
+            anyio.to_thread.run_sync(_save_upload, file.file, part_location)
+            for (_, file, _, _), part_location in zip(uploads, part_locations)
+        ], return_exceptions=True)
+        # Every copy has finished by now, so a failure leaves no part still being written
+        for result in written:
+            if isinstance(result, BaseException):
+                raise result
+
+        uploaded_assets = []
+        activityAssetsAssociation = []
+        for (idx, file, asset_type, file_location), (size, _) in zip(uploads, written):
+            asset = assetSchemas.AssetBase(
                 id=str(generate_uuid()),
-                activity_id=activity_id,
-                asset_id=created_asset.id
-            ))
-
-        # Optionally link to the activity
-    await assetService.link_assets_to_activity(db=db, activityAssetsAssociation=activityAssetsAssociation)    
-
-    return uploaded_assets
+                name=file.filename,
+                description=descriptions[idx] if idx < len(descriptions) else "",
+                type=asset_type,
+                url=file_location,
+                size=size,
+                mime_type=file.content_type
+            )
+            uploaded_assets.append(asset)
+
+            activityAssetsAssociation.append(
+                assetSchemas.ActivityAssetBaseCreate(
+                    id=str(generate_uuid()),
+                    activity_id=activity_id,
+                    asset_id=asset.id
+                ))
+
+        # Assets and their activity links are inserted together
+        await assetService.create_activity_assets(db=db, assets=uploaded_assets, activityAssetsAssociation=activityAssetsAssociation)
+
+        for (_, _, _, file_location), part_location in zip(uploads, part_locations):
+            os.replace(part_location, file_location)
+    finally:
+        # Parts left over from a failed copy or insert; moved parts are already gone
+        for part_location in part_locations:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(part_location)
+
+    return [
+        assetSchemas.AssetUploadResponse(**asset.model_dump(), checksum=checksum)
+        for asset, (_, checksum) in zip(uploaded_assets, written)
+    ]
+
+def _save_upload(source, file_location: str) -> tuple:
+    ''' Copy an upload to disk chunk by chunk, returning its size and sha256 '''
+    size = 0
+    checksum = hashlib.sha256()
+    source.seek(0)
+    with open(file_location, "wb") as f:
+        while chunk := source.read(ASSET_UPLOAD_CHUNK_SIZE):
+            f.write(chunk)
+            checksum.update(chunk)
+            size += len(chunk)
+    return size, checksum.hexdigest()
 
 @router.get("/downloadAsset/{asset_id}")
-async def download_asset(asset_id: str, db: Session = Depends(get_db_session)):
+async def download_asset(asset_id: str, request: Request, db: Session = Depends(get_db_session)):
     # Fetch from DB
     asset = await assetService.get_asset(db=db, asset_id=asset_id)
     if not asset:
         raise HTTPException(status_code=404, detail="Asset not found")
 
-    file_path = asset.url
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="File not found on server")
-
-    # Open file as binary stream
-    file_stream = open(file_path, mode="rb")
-
     # Guess mime type if not stored
-    media_type = asset.mime_type or mimetypes.guess_type(file_path)[0] or "application/octet-stream"
-
-    # Force download with Content-Disposition
-    headers = {
-        "Content-Disposition": f'attachment; filename="{asset.name}"'
-    }
+    media_type = asset.mime_type or mimetypes.guess_type(asset.url)[0] or "application/octet-stream"
 
-    return StreamingResponse(file_stream, media_type=media_type, headers=headers)
+    # Force download with Content-Disposition; Range requests let video players seek
+    return await get_file_response(request, asset.url, media_type=media_type, filename=asset.name)
\ No newline at end of file
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from . import ilpuser, auth, organization, school, state, teacher, zone, district, block, school_class, role, common, activity
+from . import ilpuser, auth, organization, school, state, teacher, zone, district, block, school_class, role, common, activity, import_job, search, metrics, region, export
 from ..config import ROUTE_PREFIX_V1
 
 router = APIRouter()
@@ -21,5 +21,10 @@ def include_api_routes():
     router.include_router(role.router, prefix=ROUTE_PREFIX_V1)
     router.include_router(activity.router, prefix=ROUTE_PREFIX_V1)
     router.include_router(common.router, prefix=ROUTE_PREFIX_V1)
+    router.include_router(import_job.router, prefix=ROUTE_PREFIX_V1)
+    router.include_router(search.router, prefix=ROUTE_PREFIX_V1)
+    router.include_router(metrics.router, prefix=ROUTE_PREFIX_V1)
+    router.include_router(region.router, prefix=ROUTE_PREFIX_V1)
+    router.include_router(export.router, prefix=ROUTE_PREFIX_V1)
 
 include_api_routes()
@@ -1,9 +1,10 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from ..dependencies import get_db_session
 from ..domain.block import service, schemas, models
-from .util_functions import UserQueryRequest, LoginQueryRequest, generate_uuid, string_hash, success_message_response, get_order_by_conditions, get_filter_conditions, get_select_fields
+from .util_functions import UserQueryRequest, LoginQueryRequest, generate_uuid, success_message_response, get_order_by_conditions, get_filter_conditions, get_select_fields, get_cursor_pagination, set_next_cursor, get_collection_not_modified
+from ..responses import get_trusted_response, get_rows_response
 from resources.strings import BLOCK_DOES_NOT_EXIST_ERROR, BLOCK_ALREADY_EXISTS_ERROR
 
 router = APIRouter(tags=["blocks"])
@@ -18,11 +19,14 @@ async def create_block(block: schemas.BlockBase, db: Session = Depends(get_db_se
     return await service.create_block(db=db, block=updated_block)
 
 @router.get("/block/", response_model=List[schemas.BlockResponse])
-async def read_blocks(page_no: int = 1, page_size: int = 100, db: Session = Depends(get_db_session)):
+async def read_blocks(request: Request, response: Response, page_no: int = 1, page_size: int = 100, db: Session = Depends(get_db_session)):
+    not_modified = await get_collection_not_modified(request, response, db, "block")
+    if not_modified:
+        return not_modified
     limit = page_size
     skip = (page_no - 1) * page_size  # Offset calculation        
     blocks = await service.get_blocks(db, skip=skip, limit=limit)  # ✅ Await the async function
-    return blocks
+    return get_trusted_response(blocks, response)
 
 @router.get("/block/{block_id}", response_model=schemas.BlockResponse)
 async def read_block(block_id: str, db: Session = Depends(get_db_session)):
@@ -34,6 +38,7 @@ async def read_block(block_id: str, db: Session = Depends(get_db_session)):
 @router.post("/getBlocksByParams/", response_model=List[schemas.BlockResponse])
 async def read_blocks_by_params(
         request: UserQueryRequest, 
+        response: Response,
         db: Session = Depends(get_db_session)):
 
     # Get all valid columns from the block model
@@ -49,8 +54,12 @@ async def read_blocks_by_params(
     limit = request.page_size
     skip = (request.page_no - 1) * request.page_size  # Offset calculation
 
-    db_blocks = await service.get_blocks_by_params(db, selected_fields, filter_cond, ordering, skip=skip, limit=limit)    
-    return db_blocks
+    # A cursor switches to keyset pagination instead of skipping rows
+    query_fields, filter_cond, ordering, skip = get_cursor_pagination(request, table_fields, selected_fields, filter_cond, ordering, skip)
+
+    db_blocks = await service.get_blocks_by_params(db, query_fields, filter_cond, ordering, skip=skip, limit=limit)
+    set_next_cursor(response, request, db_blocks, table_fields)
+    return get_rows_response(db_blocks, schemas.BlockResponse.model_fields, response=response)
 
 @router.put("/block/{block_id}", response_model=success_message_response)
 async def update_block(block_id: str, block: schemas.BlockUpdate, db: Session = Depends(get_db_session)):
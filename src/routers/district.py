@@ -1,9 +1,10 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from ..dependencies import get_db_session
 from ..domain.district import service, schemas, models
-from .util_functions import UserQueryRequest, LoginQueryRequest, generate_uuid, string_hash, success_message_response, get_order_by_conditions, get_filter_conditions, get_select_fields
+from .util_functions import UserQueryRequest, LoginQueryRequest, generate_uuid, success_message_response, get_order_by_conditions, get_filter_conditions, get_select_fields, get_cursor_pagination, set_next_cursor, get_collection_not_modified
+from ..responses import get_trusted_response, get_rows_response
 from resources.strings import DISTRICT_DOES_NOT_EXIST_ERROR, DISTRICT_ALREADY_EXISTS_ERROR
 
 router = APIRouter(tags=["districts"])
@@ -18,11 +19,14 @@ async def create_district(district: schemas.DistrictBase, db: Session = Depends(
     return await service.create_district(db=db, district=updated_district)
 
 @router.get("/district/", response_model=List[schemas.DistrictResponse])
-async def read_districts(page_no: int = 1, page_size: int = 100, db: Session = Depends(get_db_session)):
+async def read_districts(request: Request, response: Response, page_no: int = 1, page_size: int = 100, db: Session = Depends(get_db_session)):
+    not_modified = await get_collection_not_modified(request, response, db, "district")
+    if not_modified:
+        return not_modified
     limit = page_size
     skip = (page_no - 1) * page_size  # Offset calculation        
     districts = await service.get_districts(db, skip=skip, limit=limit)  # ✅ Await the async function
-    return districts
+    return get_trusted_response(districts, response)
 
 @router.get("/district/{district_id}", response_model=schemas.DistrictResponse)
 async def read_district(district_id: str, db: Session = Depends(get_db_session)):
@@ -34,6 +38,7 @@ async def read_district(district_id: str, db: Session = Depends(get_db_session))
 @router.post("/getDistrictsByParams/", response_model=List[schemas.DistrictResponse])
 async def read_districts_by_params(
         request: UserQueryRequest, 
+        response: Response,
         db: Session = Depends(get_db_session)):
 
     # Get all valid columns from the district model
@@ -49,8 +54,12 @@ async def read_districts_by_params(
     limit = request.page_size
     skip = (request.page_no - 1) * request.page_size  # Offset calculation
 
-    db_districts = await service.get_districts_by_params(db, selected_fields, filter_cond, ordering, skip=skip, limit=limit)    
-    return db_districts
+    # A cursor switches to keyset pagination instead of skipping rows
+    query_fields, filter_cond, ordering, skip = get_cursor_pagination(request, table_fields, selected_fields, filter_cond, ordering, skip)
+
+    db_districts = await service.get_districts_by_params(db, query_fields, filter_cond, ordering, skip=skip, limit=limit)
+    set_next_cursor(response, request, db_districts, table_fields)
+    return get_rows_response(db_districts, schemas.DistrictResponse.model_fields, response=response)
 
 @router.put("/district/{district_id}", response_model=success_message_response)
 async def update_district(district_id: str, district: schemas.DistrictUpdate, db: Session = Depends(get_db_session)):
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from ..domain.export import service, schemas
+from ..domain.ilpuser.models import ILPUser
+from ..domain.school.models import School
+from ..domain.role_assignment.models import UserRole
+from .util_functions import get_filter_conditions, get_order_by_conditions, get_select_fields
+from resources.strings import INVALID_FIELDS_IN_REQUEST_ERROR
+
+router = APIRouter(tags=["export"])
+
+EXPORT_FORMAT_PATTERN = "^(" + "|".join(service.EXPORT_FORMATS) + ")$"
+
+
+def get_export_response(model, request: schemas.ExportQueryRequest, export_format: str, filename: str, excluded_fields: set = frozenset()):
+    table_fields = {name: column for name, column in model.get_valid_fields().items() if name not in excluded_fields}
+    selected_fields = get_select_fields(request.fields, table_fields)
+    if not selected_fields:
+        raise HTTPException(status_code=400, detail=INVALID_FIELDS_IN_REQUEST_ERROR)
+
+    filter_cond = get_filter_conditions(request.filters, table_fields)
+    # "id" breaks ties so repeated exports list rows in the same order
+    ordering = get_order_by_conditions((request.order_by or []) + ["id"], table_fields)
+
+    statement = service.get_export_statement(model, selected_fields, filter_cond, ordering)
+    return StreamingResponse(
+        service.stream_export(statement, selected_fields, export_format),
+        media_type=service.EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
+
+@router.post("/exportIlpusers")
+async def export_users(request: schemas.ExportQueryRequest, format: str = Query("csv", pattern=EXPORT_FORMAT_PATTERN)):
+    # Password hashes never leave the database
+    return get_export_response(ILPUser, request, format, "users", excluded_fields={"password"})
+
+@router.post("/exportSchools")
+async def export_schools(request: schemas.ExportQueryRequest, format: str = Query("csv", pattern=EXPORT_FORMAT_PATTERN)):
+    return get_export_response(School, request, format, "schools")
+
+@router.post("/exportUserRoleAssignments")
+async def export_user_role_assignments(request: schemas.ExportQueryRequest, format: str = Query("csv", pattern=EXPORT_FORMAT_PATTERN)):
+    return get_export_response(UserRole, request, format, "user_role_assignments")
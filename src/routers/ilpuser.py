@@ -1,6 +1,5 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Request, Response
 from sqlalchemy import or_, cast, String
 from sqlalchemy.orm import Session
 import pandas as pd
@@ -10,9 +9,11 @@ from ..domain.ilpuser import service, schemas, models
 from ..domain.role import service as roleService, schemas as roleSchemas, models as roleModels
 from ..domain.role_assignment import service as userRoleService, schemas as userRoleSchemas, models as userRoleModels
 from ..domain.school import service as schoolService
-from .util_functions import UserQueryRequest, LoginQueryRequest, generate_uuid, string_hash, success_message_response, get_order_by_conditions, get_filter_conditions, get_select_fields
+from ..domain.import_job import service as importJobService, schemas as importJobSchemas
+from .util_functions import UserQueryRequest, LoginQueryRequest, BatchFetchRequest, get_batch_result, generate_uuid, success_message_response, get_order_by_conditions, get_filter_conditions, get_select_fields, get_cursor_pagination, set_next_cursor, get_file_response, get_collection_not_modified
+from ..responses import get_trusted_response, get_rows_response
 from resources.strings import USER_DOES_NOT_EXIST_ERROR, EMAIL_ALREADY_EXISTS_ERROR, AUTHENTICATION_FAILED_ERROR, PROFILE_PIC_DOESNT_EXIST
-import math
+from logger import logger
 
 router = APIRouter(tags=["ilpuser"])
 COMMON_PASSWORD = "common_password!123"
@@ -32,12 +33,12 @@ async def create_user(user: schemas.ILPUserCreate, db: Session = Depends(get_db_
         if db_user:
             raise HTTPException(status_code=400, detail=EMAIL_ALREADY_EXISTS_ERROR)
         unique_id = str(generate_uuid())
-        hashed_password = string_hash(user.password)    
+        hashed_password = await service.hash_password(user.password)
         updated_user = user.model_copy(update={"id": unique_id, "password": hashed_password})   
-        print("updated_user ------------- ", updated_user)
+        logger.debug(f"Creating user {unique_id}")
         return await service.create_user(db=db, user=updated_user)
     except Exception as e:
-        print("Error creating db entry for user -", str(e))
+        logger.exception("Error creating db entry for user")
         return {}
 
 @router.get("/ilpuser/", response_model=List[schemas.ILPUserResponse])
@@ -45,7 +46,7 @@ async def read_users(page_no: int = 1, page_size: int = 100, db: Session = Depen
     limit = page_size
     skip = (page_no - 1) * page_size  # Offset calculation    
     users = await service.get_users(db, skip=skip, limit=limit)  # ✅ Await the async function
-    return users
+    return get_trusted_response(users)
 
 @router.get("/ilpuser/{user_id}", response_model=schemas.ILPUserResponse)
 async def read_user(user_id: str, db: Session = Depends(get_db_session)):
@@ -54,6 +55,11 @@ async def read_user(user_id: str, db: Session = Depends(get_db_session)):
         raise HTTPException(status_code=404, detail=USER_DOES_NOT_EXIST_ERROR)
     return db_user
 
+@router.post("/ilpuser/batch", response_model=dict)
+async def read_users_batch(request: BatchFetchRequest, db: Session = Depends(get_db_session)):
+    users = await service.get_users_by_ids(db, request.ids)
+    return get_trusted_response(get_batch_result(request.ids, users))
+
 @router.post("/allIlpusersWithRoles", response_model=list)
 async def read_user(request: UserQueryRequest, db: Session = Depends(get_db_session)):
      # Get all valid columns from the User model
@@ -71,7 +77,7 @@ async def read_user(request: UserQueryRequest, db: Session = Depends(get_db_sess
     skip = (request.page_no - 1) * request.page_size  # Offset calculation
 
     db_user = await service.get_users_with_roles_by_params(db, selected_fields, filter_cond, ordering, skip=skip, limit=limit)
-    return db_user
+    return get_trusted_response(db_user)
 
 @router.post("/allIlpusersWithRolesCount")
 async def read_user(request: UserQueryRequest, db: Session = Depends(get_db_session)):
@@ -81,18 +87,19 @@ async def read_user(request: UserQueryRequest, db: Session = Depends(get_db_sess
     return {"count": count}
 
 @router.get("/ilpuser/{user_id}/profile-pic")
-async def get_profile_pic(user_id: int, db: Session = Depends(get_db_session)):
+async def get_profile_pic(user_id: str, request: Request, db: Session = Depends(get_db_session)):
     db_user = await service.get_user(db, user_id=user_id)
     if db_user is None:
         raise HTTPException(status_code=404, detail=USER_DOES_NOT_EXIST_ERROR)
-    if db_user.profile_pic is None:
+    if db_user.profile_pic_url is None:
         raise HTTPException(status_code=404, detail=PROFILE_PIC_DOESNT_EXIST)
 
-    return FileResponse(db_user.profile_pic_url)
+    return await get_file_response(request, db_user.profile_pic_url, content_disposition_type="inline")
 
 @router.post("/getIlpusersByParams/", response_model=list, response_model_exclude_none=True)
 async def read_users(
         request: UserQueryRequest, 
+        response: Response,
         db: Session = Depends(get_db_session)):
 
     # Get all valid columns from the User model
@@ -108,8 +115,12 @@ async def read_users(
     limit = request.page_size
     skip = (request.page_no - 1) * request.page_size  # Offset calculation
 
-    db_users = await service.get_users_by_params(db, selected_fields, filter_cond, ordering, skip=skip, limit=limit)
-    return [dict(zip(selected_fields, user)) for user in db_users]
+    # A cursor switches to keyset pagination instead of skipping rows
+    query_fields, filter_cond, ordering, skip = get_cursor_pagination(request, table_fields, selected_fields, filter_cond, ordering, skip)
+
+    db_users = await service.get_users_by_params(db, query_fields, filter_cond, ordering, skip=skip, limit=limit)
+    set_next_cursor(response, request, db_users, table_fields)
+    return get_rows_response(db_users, selected_fields, response=response)
 
 @router.put("/ilpuser/{user_id}", response_model=success_message_response)
 async def update_user(user_id: str, user: schemas.ILPUserUpdate, db: Session = Depends(get_db_session)):
@@ -126,15 +137,18 @@ async def delete_user(user_id: str, db: Session = Depends(get_db_session)):
     return await service.delete_user(db=db, user_id=user_id)
 
 @router.get("/getTypesValues/{types}", response_model=dict)
-async def get_types_values(types: str, db: Session = Depends(get_db_session)):  
+async def get_types_values(types: str, request: Request, response: Response, db: Session = Depends(get_db_session)):
+    not_modified = await get_collection_not_modified(request, response, db, "enum")
+    if not_modified:
+        return not_modified
     types_list = types.split(',')
-    response = {}
+    types_values = {}
     for type in types_list:
         values = await service.get_enum_values(db, enum_type_name=type) 
-        response.update({
+        types_values.update({
             type: values
         })
-    return response
+    return types_values
     
 def get_user_details_filter_conditions(filters: dict):
     conditions = []
@@ -156,7 +170,7 @@ def get_user_details_filter_conditions(filters: dict):
     return conditions
 
 @router.post("/bulkUploadUserData")
-async def read_user(file: UploadFile = File(...), db: Session = Depends(get_db_session)):
+async def read_user(background_tasks: BackgroundTasks, file: UploadFile = File(...), background: bool = False, db: Session = Depends(get_db_session)):
     try:        
         # Read the uploaded file into a dataframe
         if file.filename.endswith(".csv"):
@@ -164,125 +178,23 @@ async def read_user(file: UploadFile = File(...), db: Session = Depends(get_db_s
         else:
             df = pd.read_excel(file.file)
 
-        validateFieldForNaN = lambda x: "" if isinstance(x, float) and math.isnan(x) else str(x).strip()
-
-        validateIntField = lambda x: str(int(float(str(x).strip()))) if x and str(x).strip().lower() not in ["", "null"] else None
-        
-        print("df.columns ", df.columns)
-       
-        required_columns = {
-            "First Name", "Last Name", "Email", "Username", 
-            "Phone1", "Phone2", "Gender", "Address", "City", "State",
-            "Country", "Pincode", "School Dise Code", "Role",         }
-       
-        if not required_columns.issubset(set(df.columns)):
+        logger.debug(f"Bulk user upload columns {list(df.columns)}")
+
+        if not service.BULK_USER_COLUMNS.issubset(set(df.columns)):
             raise HTTPException(status_code=400, detail="Missing required columns")
 
-        created = 0
-        rejected = 0
-        errors: List[str] = []
-
-        # Convert the DataFrame to a list of dictionaries and validate them
-        for index, row in df.iterrows():            
-            first_name= validateFieldForNaN(row["First Name"])
-            last_name= validateFieldForNaN(row["Last Name"])
-            if first_name == "" or last_name == "":
-                rejected += 1
-                errors.append(f"Row {index + 2}: First Name or Last Name is missing")
-                continue
-            email = validateFieldForNaN(row["Email"])
-            if email == "":
-                rejected += 1
-                errors.append(f"Row {index + 2}: Email is missing")
-                continue                        
-            username = validateFieldForNaN(row["Username"])
-            if username == "":
-                username = first_name.lower() + last_name.lower() # Default username if not provided
-            role = validateFieldForNaN(row["Role"])                        
-            if role not in roleModels.RoleEnum.__members__.values():
-                rejected += 1
-                errors.append(f"Row {index + 2}: Invalid role '{role}'")
-                continue
-            phone1 = validateFieldForNaN(row["Phone1"]).strip()
-            phone2 = validateFieldForNaN(row["Phone2"]).strip()
-            if phone1 == "" and phone2 == "":
-                rejected += 1
-                errors.append(f"Row {index + 2}: Both phone numbers missing")
-                continue
-            gender = validateFieldForNaN(row["Gender"])
-            address = validateFieldForNaN(row["Address"])
-            city = validateFieldForNaN(row["City"])
-            state = validateFieldForNaN(row["State"])
-            country = validateFieldForNaN(row["Country"])
-            pincode = validateFieldForNaN(row["Pincode"])
-            school_dise_code = validateIntField(row["School Dise Code"])
-            if school_dise_code == "":
-                rejected += 1
-                errors.append(f"Row {index + 2}: School Dise Code is missing")
-                continue
-            
-            db_user = await service.get_user_by_email(db, email=email)
-            if db_user:
-                print("row", 6)
-                rejected += 1
-                errors.append(f"Row {index + 2}: User with email '{email}' or username '{username}' already exists")
-                continue
-            new_user = schemas.ILPUserCreate(
-                first_name=first_name,                
-                last_name=last_name,                
-                profile_pic_file=None,  # No file upload in bulk upload
-                email=email,
-                password= COMMON_PASSWORD, # Default password
-                username=username,
-                phone1=phone1,
-                phone2=phone2,
-                gender=gender,
-                address=address,
-                city=city,
-                state=state,
-                country=country,
-                pincode=pincode
-            )            
-            
-            unique_id = str(generate_uuid())
-            hashed_password = string_hash(COMMON_PASSWORD)    
-            updated_user = new_user.model_copy(update={"id": unique_id, "password": hashed_password})   
-            response = await service.create_user(db=db, user=updated_user)                        
-            created += 1
-            user_id = response.id
-
-            db_school = await schoolService.get_school_by_dise_code(db, dise_code=int(school_dise_code))
-            if not db_school:
-                rejected += 1
-                errors.append(f"Row {index + 2}: A school with dise code, '{school_dise_code}' doesnt exist. So, role is not created for user '{first_name + ' ' + last_name}'")
-                continue      
-            print("db_school ", db_school)                  
-            school_id = db_school.id
-            db_role = await roleService.get_role_by_name(name=roleModels.RoleEnum(role), db=db)
-            if not db_role:
-                errors.append(f"Row {index + 2}: A role with name, '{role}' doesnt exist. So, role is not created for user '{first_name + ' ' + last_name}'")
-                continue
-            print("db_role  ", db_role)
-            role_id = db_role.id
-
-            # create user role assignment
-            user_role_data = userRoleSchemas.UserRoleBase(user_id=user_id, role_id=role_id, access_type="WRITE", level="SCHOOL", level_id=school_id)
-            unique_id = str(generate_uuid())
-            updated_user_role = user_role_data.model_copy(update={"id": unique_id})
-            response = await userRoleService.create_user_role(db=db, user_role=updated_user_role)
-            if response:
-                print("User role assignment created successfully")
-            else:
-                errors.append(f"Row {index + 2}: Failed to create user role assignment for '{first_name + ' ' + last_name}'")            
-
-        return {
-            "status": "completed",
-            "total_rows": len(df),
-            "created": created,
-            "rejected": rejected,
-            "errors": errors
-        }
+        # Every imported user starts with the same default password, so its hash is computed once and reused
+        hashed_password = await service.get_shared_password_hash(COMMON_PASSWORD)
+
+        # Large uploads can run as an import job: reply with the job id now and poll /importJobs/{job_id}
+        if background:
+            job = importJobSchemas.ImportJobBase(id=str(generate_uuid()), kind="users", file_name=file.filename, total_rows=len(df))
+            db_job = await importJobService.create_import_job(db, job)
+            background_tasks.add_task(importJobService.run_user_import_job, db_job.id, df, hashed_password)
+            return {"status": "queued", "job_id": db_job.id, "total_rows": len(df)}
+
+        return await service.bulk_import_users(db, df, hashed_password)
 
     except Exception as e:
-        print(e)
+        logger.exception("Bulk user upload failed")
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")    
\ No newline at end of file
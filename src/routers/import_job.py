@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from ..dependencies import get_db_session
+from ..domain.import_job import service, schemas
+from resources.strings import IMPORT_JOB_DOES_NOT_EXIST_ERROR
+
+router = APIRouter(tags=["importJobs"])
+
+@router.get("/importJobs/{job_id}", response_model=schemas.ImportJobResponse)
+async def read_import_job(job_id: str, db: Session = Depends(get_db_session)):
+    # A job whose worker went away would otherwise be reported as running forever
+    await service.expire_stale_import_jobs(db, job_id=job_id)
+    db_job = await service.get_import_job(db, job_id=job_id)
+    if db_job is None:
+        raise HTTPException(status_code=404, detail=IMPORT_JOB_DOES_NOT_EXIST_ERROR)
+    return db_job
@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from ..database import get_pool_metrics
+from ..metrics import render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+@router.get("/metrics/pool", response_model=dict)
+async def read_pool_metrics():
+    # Occupancy of the database connection pool and the checkout counters since startup
+    return get_pool_metrics()
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def read_metrics():
+    # Prometheus text exposition format
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -1,10 +1,11 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from .converter import organization_converter
 from ..dependencies import get_db_session
 from ..domain.organization import service, schemas, models
-from .util_functions import UserQueryRequest, generate_uuid, string_hash, success_message_response, get_order_by_conditions, get_filter_conditions, get_select_fields
+from .util_functions import UserQueryRequest, generate_uuid, success_message_response, get_order_by_conditions, get_filter_conditions, get_select_fields, get_cursor_pagination, set_next_cursor
+from ..responses import get_model_response, get_trusted_response
 from pydantic import BaseModel, Field
 from resources.strings import ORG_DOES_NOT_EXIST_ERROR, INVALID_FIELDS_IN_REQUEST_ERROR
 
@@ -21,7 +22,7 @@ async def create_organization(organization: schemas.OrganizationBase, db: Sessio
 async def read_organizations(skip: int = 0, limit: int = 100, db: Session = Depends(get_db_session)):
     organizations = await service.get_organizations(db, skip=skip, limit=limit)
     # return organization_converter.convert_many(organizations)
-    return organizations
+    return get_model_response(organizations, List[schemas.OrganizationResponse])
 
 @router.get("/organization/{organization_id}", response_model=schemas.OrganizationResponse)
 async def read_organization(organization_id: str, db: Session = Depends(get_db_session)):
@@ -34,6 +35,7 @@ async def read_organization(organization_id: str, db: Session = Depends(get_db_s
 @router.post("/getOrganizationsByParams/", response_model=list, response_model_exclude_none=True)
 async def read_users(
         request: UserQueryRequest, 
+        response: Response,
         db: Session = Depends(get_db_session)):
     
     # Get all valid columns from the User model
@@ -49,8 +51,12 @@ async def read_users(
     limit = request.page_size
     skip = (request.page_no - 1) * request.page_size  # Offset calculation
 
-    db_users = await service.get_organizations_by_params(db, selected_fields, filter_cond, ordering, skip=skip, limit=limit)
-    return [dict(zip(selected_fields, user)) for user in db_users]
+    # A cursor switches to keyset pagination instead of skipping rows
+    query_fields, filter_cond, ordering, skip = get_cursor_pagination(request, table_fields, selected_fields, filter_cond, ordering, skip)
+
+    db_users = await service.get_organizations_by_params(db, query_fields, filter_cond, ordering, skip=skip, limit=limit)
+    set_next_cursor(response, request, db_users, table_fields)
+    return get_trusted_response([dict(zip(selected_fields, user)) for user in db_users], response)
 
 @router.put("/organization/{organization_id}", response_model=success_message_response)
 async def update_organization(organization_id: str, organization: schemas.OrganizationUpdate, db: Session = Depends(get_db_session)):
@@ -0,0 +1,61 @@
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Request, Response
+from typing import Optional
+from sqlalchemy.orm import Session
+import pandas as pd
+from ..dependencies import get_db_session
+from ..domain.region_import import service as regionImportService, schemas as regionImportSchemas
+from ..domain.region_tree import service as regionTreeService
+from .util_functions import get_collection_not_modified
+from resources.strings import REGION_DOES_NOT_EXIST_ERROR
+
+router = APIRouter(tags=["regions"])
+
+@router.post("/bulkImportRegions")
+async def bulk_import_regions(request: regionImportSchemas.RegionImportRequest, db: Session = Depends(get_db_session)):
+    # Nested states -> zones -> districts -> blocks; existing regions are matched by name and reused
+    rows = regionImportService.get_region_rows_from_tree(request)
+    return await regionImportService.bulk_import_regions(db, rows)
+
+@router.post("/bulkUploadRegionData")
+async def bulk_upload_regions(file: UploadFile = File(...), db: Session = Depends(get_db_session)):
+    # Read the uploaded file into a dataframe, one State/Zone/District/Block path per row
+    if file.filename.endswith(".csv"):
+        df = pd.read_csv(file.file)
+    else:
+        df = pd.read_excel(file.file)
+
+    if not regionImportService.BULK_REGION_COLUMNS.issubset(set(df.columns)):
+        raise HTTPException(status_code=400, detail="Missing required columns")
+
+    rows = regionImportService.get_region_rows_from_frame(df)
+    return await regionImportService.bulk_import_regions(db, rows)
+
+@router.get("/regionTree", response_model=list)
+async def read_region_tree(
+        request: Request,
+        response: Response,
+        region_id: Optional[str] = None,
+        depth: Optional[int] = Query(None, ge=0),
+        db: Session = Depends(get_db_session)):
+    # Every state with its subtree, or the subtree of region_id; depth limits the levels below
+    # the returned regions. Served from the in-memory region tree, revalidated with the block list ETag.
+    not_modified = await get_collection_not_modified(request, response, db, "block")
+    if not_modified:
+        return not_modified
+
+    tree = await regionTreeService.get_region_tree(db)
+    if region_id is None:
+        return [tree.to_dict(node, depth) for node in tree.roots]
+    node = tree.get(region_id)
+    if node is None:
+        raise HTTPException(status_code=404, detail=REGION_DOES_NOT_EXIST_ERROR)
+    return [tree.to_dict(node, depth)]
+
+@router.get("/regionTree/{region_id}/ancestors", response_model=list)
+async def read_region_ancestors(region_id: str, db: Session = Depends(get_db_session)):
+    # The state down to the region itself
+    tree = await regionTreeService.get_region_tree(db)
+    ancestors = tree.get_ancestors(region_id)
+    if not ancestors:
+        raise HTTPException(status_code=404, detail=REGION_DOES_NOT_EXIST_ERROR)
+    return [tree.to_dict(node, 0) for node in reversed(ancestors)]
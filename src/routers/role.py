@@ -1,21 +1,26 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from ..dependencies import get_db_session
 from ..domain.role import service, schemas, models
 from ..domain.role_assignment import service as userRoleService, schemas as userRoleSchemas, models as userRoleModels
 from ..domain.role_assignment.models import LevelEnum
-from .util_functions import UserQueryRequest, LoginQueryRequest, generate_uuid, string_hash, success_message_response, get_order_by_conditions, get_filter_conditions, get_select_fields
+from ..domain.region_tree import service as regionTreeService
+from .util_functions import UserQueryRequest, LoginQueryRequest, BatchFetchRequest, get_batch_result, generate_uuid, success_message_response, get_order_by_conditions, get_filter_conditions, get_select_fields, get_cursor_pagination, set_next_cursor, get_collection_not_modified
+from ..responses import get_trusted_response, get_rows_response
 from resources.strings import ROLE_DOES_NOT_EXIST_ERROR, USER_ROLE_ASSOCIATION_DOES_NOT_EXIST_ERROR, USER_ROLE_ASSOCIATION_DOES_NOT_EXIST_ERROR
 
 router = APIRouter(tags=["role"])
 
 @router.get("/role/", response_model=list[schemas.RoleResponse])
-async def get_roles(page_no: int = 1, page_size: int = 100, db: Session = Depends(get_db_session)):
+async def get_roles(request: Request, response: Response, page_no: int = 1, page_size: int = 100, db: Session = Depends(get_db_session)):
+    not_modified = await get_collection_not_modified(request, response, db, "role")
+    if not_modified:
+        return not_modified
     limit = page_size
     skip = (page_no - 1) * page_size
-    return await service.get_roles(db, skip=skip, limit=limit)  
+    return get_trusted_response(await service.get_roles(db, skip=skip, limit=limit), response)
 
 @router.post("/role/", response_model=schemas.RoleBase)
 async def create_role(role: schemas.RoleBase, db: Session = Depends(get_db_session)):
@@ -33,6 +38,7 @@ async def read_role(role_id: str, db: Session = Depends(get_db_session)):
 @router.post("/getRolesByParams/", response_model=list[schemas.RoleResponse], response_model_exclude_none=True)
 async def read_roles(
         request: UserQueryRequest, 
+        response: Response,
         db: Session = Depends(get_db_session)):
 
     # Get all valid columns from the User model
@@ -48,8 +54,13 @@ async def read_roles(
     limit = request.page_size
     skip = (request.page_no - 1) * request.page_size  # Offset calculation
 
-    db_roles = await service.get_roles_by_params(db, selected_fields, filter_cond, ordering, skip=skip, limit=limit)
-    return [dict(zip(selected_fields, role)) for role in db_roles]
+    # A cursor switches to keyset pagination instead of skipping rows
+    query_fields, filter_cond, ordering, skip = get_cursor_pagination(request, table_fields, selected_fields, filter_cond, ordering, skip)
+
+    db_roles = await service.get_roles_by_params(db, query_fields, filter_cond, ordering, skip=skip, limit=limit)
+    set_next_cursor(response, request, db_roles, table_fields)
+    fields = [field for field in selected_fields if field in schemas.RoleResponse.model_fields]
+    return get_rows_response(db_roles, fields, exclude_none=True, response=response)
 
 @router.put("/role/{role_id}", response_model=success_message_response)
 async def update_role(role_id: str, role: schemas.RoleUpdate, db: Session = Depends(get_db_session)):
@@ -71,7 +82,15 @@ async def read_role(user_id: str, db: Session = Depends(get_db_session)):
     user_roles = await userRoleService.get_user_roles_with_hierarchy(db, user_id)    
     if user_roles is None:
         raise HTTPException(status_code=404, detail=USER_ROLE_ASSOCIATION_DOES_NOT_EXIST_ERROR)
-    return [userRoleService.serialize_user_role(ur) for ur in user_roles]
+    tree = await regionTreeService.get_region_tree(db)
+    return [userRoleService.serialize_user_role(ur, tree) for ur in user_roles]
+
+@router.post("/userRole/batch", response_model=dict)
+async def read_user_roles_batch(request: BatchFetchRequest, db: Session = Depends(get_db_session)):
+    # Keyed by user id, as GET /userRole/{user_id}; users without assignments are reported missing
+    roles_by_user = await userRoleService.get_users_roles_with_hierarchy(db, list(dict.fromkeys(request.ids)))
+    user_roles = {user_id: roles for user_id, roles in roles_by_user.items() if roles}
+    return get_trusted_response(get_batch_result(request.ids, user_roles))
 
 @router.post("/userRole/", response_model=userRoleSchemas.UserRoleResponse)
 async def create_user_role(role: userRoleSchemas.UserRoleBase, db: Session = Depends(get_db_session)):
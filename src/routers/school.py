@@ -1,9 +1,10 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from ..dependencies import get_db_session
 from ..domain.school import service, schemas, models
-from .util_functions import UserQueryRequest, generate_uuid, string_hash, success_message_response, get_order_by_conditions, get_filter_conditions, get_select_fields
+from .util_functions import UserQueryRequest, BatchFetchRequest, get_batch_result, generate_uuid, success_message_response, get_order_by_conditions, get_filter_conditions, get_select_fields, get_cursor_pagination, set_next_cursor
+from ..responses import get_model_response, get_trusted_response, get_rows_response
 from pydantic import BaseModel, Field
 from resources.strings import SCHOOL_DOES_NOT_EXIST_ERROR, INVALID_FIELDS_IN_REQUEST_ERROR
 
@@ -16,10 +17,14 @@ async def create_School(school: schemas.SchoolBase, db: Session = Depends(get_db
     updated_school = school.model_copy(update={"id": unique_id})   
     return await service.create_school(db=db, school=updated_school)
 
+@router.post("/bulkUpsertSchools")
+async def bulk_upsert_schools(request: schemas.BulkSchoolRequest, db: Session = Depends(get_db_session)):
+    return await service.bulk_upsert_schools(db, request.schools)
+
 @router.get("/school/", response_model=List[schemas.SchoolResponse])
 async def read_schools(skip: int = 0, limit: int = 100, db: Session = Depends(get_db_session)):
     schools = await service.get_schools(db, skip=skip, limit=limit)
-    return schools
+    return get_trusted_response(schools)
 
 @router.get("/school/{school_id}", response_model=schemas.SchoolResponse)
 async def read_School(school_id: str, db: Session = Depends(get_db_session)):
@@ -28,6 +33,11 @@ async def read_School(school_id: str, db: Session = Depends(get_db_session)):
         raise HTTPException(status_code=404, detail=SCHOOL_DOES_NOT_EXIST_ERROR)
     return db_school
 
+@router.post("/school/batch", response_model=dict)
+async def read_schools_batch(request: BatchFetchRequest, db: Session = Depends(get_db_session)):
+    schools = await service.get_schools_by_ids(db, request.ids)
+    return get_trusted_response(get_batch_result(request.ids, schools))
+
 @router.get("/schoolDetails/{school_id}", response_model=schemas.SchoolDetailsResponse)
 async def read_School_details(school_id: str, db: Session = Depends(get_db_session)):
     db_school = await service.get_school_details(db, school_id=school_id)
@@ -38,6 +48,7 @@ async def read_School_details(school_id: str, db: Session = Depends(get_db_sessi
 @router.post("/allSchoolDetails/", response_model=List[schemas.SchoolDetailsResponse],  response_model_exclude_none=True)
 async def read_schools_details(
         request: UserQueryRequest, 
+        response: Response,
         db: Session = Depends(get_db_session)):
      # Get all valid columns from the User model
     table_fields = models.School.get_school_details_fields()  
@@ -53,13 +64,21 @@ async def read_schools_details(
     limit = request.page_size
     skip = (request.page_no - 1) * request.page_size  # Offset calculation
 
-    db_schools = await service.get_all_schools_details(db, selected_fields, filter_cond, ordering, skip=skip, limit=limit)
-    return db_schools
+    # A cursor switches to keyset pagination instead of skipping rows
+    query_fields, keyset_cond, ordering, skip = get_cursor_pagination(request, table_fields, selected_fields, [], ordering, skip)
+
+    db_schools = await service.get_all_schools_details(db, query_fields, filter_cond, ordering, skip=skip, limit=limit, keyset_conditions=keyset_cond)
+    set_next_cursor(response, request, db_schools, table_fields)
+    # The cursor columns were only fetched for the cursor
+    if query_fields != selected_fields:
+        db_schools = [{key: school[key] for key in selected_fields if key in school} for school in db_schools]
+    return get_model_response(db_schools, List[schemas.SchoolDetailsResponse], exclude_none=True, response=response)
     # return [dict(zip(selected_fields, school)) for school in db_schools]
 
 @router.post("/getSchoolsByParams/", response_model=list, response_model_exclude_none=True)
 async def read_schools_by_params(
         request: UserQueryRequest, 
+        response: Response,
         db: Session = Depends(get_db_session)):
     
     # Get all valid columns from the User model
@@ -75,8 +94,12 @@ async def read_schools_by_params(
     limit = request.page_size
     skip = (request.page_no - 1) * request.page_size  # Offset calculation
 
-    db_schools = await service.get_schools_by_params(db, selected_fields, filter_cond, ordering, skip=skip, limit=limit)
-    return [dict(zip(selected_fields, school)) for school in db_schools]
+    # A cursor switches to keyset pagination instead of skipping rows
+    query_fields, filter_cond, ordering, skip = get_cursor_pagination(request, table_fields, selected_fields, filter_cond, ordering, skip)
+
+    db_schools = await service.get_schools_by_params(db, query_fields, filter_cond, ordering, skip=skip, limit=limit)
+    set_next_cursor(response, request, db_schools, table_fields)
+    return get_rows_response(db_schools, selected_fields, response=response)
 
 @router.put("/school/{school_id}", response_model=success_message_response)
 async def update_School(school_id: str, school: schemas.SchoolUpdate, db: Session = Depends(get_db_session)):
@@ -1,11 +1,12 @@
-from typing import List
+from typing import List, Union
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from ..dependencies import get_db_session
+from ..responses import get_trusted_response
 from ..domain.school import service, schemas, models
 from ..domain.role_assignment import service as roleService
 from ..domain.role_assignment.schemas import StudentUpdateRequest
-from .util_functions import UserQueryRequest, generate_uuid, string_hash, success_message_response, get_order_by_conditions, get_filter_conditions, get_select_fields
+from .util_functions import UserQueryRequest, BatchFetchRequest, get_batch_result, generate_uuid, success_message_response, get_order_by_conditions, get_filter_conditions, get_select_fields
 from pydantic import BaseModel, Field
 from resources.strings import CLASS_DOES_NOT_EXIST_ERROR, INVALID_FIELDS_IN_REQUEST_ERROR
 
@@ -17,11 +18,16 @@ async def create_School(school_class: schemas.ClassBase, db: Session = Depends(g
     updated_class = school_class.model_copy(update={"id": unique_id})   
     return await service.create_school_class(db=db, school_class=updated_class)
 
-@router.get("/schoolClass/{school_id}", response_model=List[schemas.ClassDetailsBase])
-async def get_school_classes(school_id: str, db: Session = Depends(get_db_session)):
-    schools = await service.get_school_classes(db, school_id=school_id)
+@router.get("/schoolClass/{school_id}", response_model=List[Union[schemas.ClassDetailsWithStudentsBase, schemas.ClassDetailsBase]])
+async def get_school_classes(school_id: str, include_students: bool = False, db: Session = Depends(get_db_session)):
+    schools = await service.get_school_classes(db, school_id=school_id, include_students=include_students)
     return schools
 
+@router.post("/schoolClass/batch", response_model=dict)
+async def read_school_classes_batch(request: BatchFetchRequest, db: Session = Depends(get_db_session)):
+    school_classes = await service.get_school_classes_by_ids(db, request.ids)
+    return get_trusted_response(get_batch_result(request.ids, school_classes))
+
 @router.get("/schoolClassStudents/{class_id}")
 async def get_school_class_students(class_id: str, db: Session = Depends(get_db_session)):
     db_school = await roleService.get_school_class_students(db, class_id=class_id)
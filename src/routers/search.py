@@ -0,0 +1,19 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from ..dependencies import get_db_session
+from ..domain.search import service, schemas
+from resources.strings import INVALID_SEARCH_TYPE_ERROR
+
+router = APIRouter(tags=["search"])
+
+@router.get("/search", response_model=List[schemas.SearchResult])
+async def search(
+        q: str = Query(..., min_length=1),
+        types: str = ",".join(service.SEARCH_GROUPS),
+        limit: int = Query(20, ge=1, le=100),
+        db: Session = Depends(get_db_session)):
+    groups = [group.strip() for group in types.split(',') if group.strip()]
+    if not groups or any(group not in service.SEARCH_GROUPS for group in groups):
+        raise HTTPException(status_code=400, detail=INVALID_SEARCH_TYPE_ERROR)
+    return await service.search(db, q, groups, limit=limit)
@@ -1,9 +1,10 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from ..dependencies import get_db_session
 from ..domain.state import service, schemas, models
-from .util_functions import UserQueryRequest, LoginQueryRequest, generate_uuid, string_hash, success_message_response, get_order_by_conditions, get_filter_conditions, get_select_fields
+from .util_functions import UserQueryRequest, LoginQueryRequest, generate_uuid, success_message_response, get_order_by_conditions, get_filter_conditions, get_select_fields, get_cursor_pagination, set_next_cursor, get_collection_not_modified
+from ..responses import get_trusted_response, get_rows_response
 from resources.strings import STATE_DOES_NOT_EXIST_ERROR, STATE_ALREADY_EXISTS_ERROR
 
 router = APIRouter(tags=["states"])
@@ -18,11 +19,14 @@ async def create_state(state: schemas.StateBase, db: Session = Depends(get_db_se
     return await service.create_state(db=db, state=updated_state)
 
 @router.get("/state/", response_model=List[schemas.StateResponse])
-async def read_states(page_no: int = 1, page_size: int = 100, db: Session = Depends(get_db_session)):
+async def read_states(request: Request, response: Response, page_no: int = 1, page_size: int = 100, db: Session = Depends(get_db_session)):
+    not_modified = await get_collection_not_modified(request, response, db, "state")
+    if not_modified:
+        return not_modified
     limit = page_size
     skip = (page_no - 1) * page_size  # Offset calculation        
     states = await service.get_states(db, skip=skip, limit=limit)  # ✅ Await the async function
-    return states
+    return get_trusted_response(states, response)
 
 @router.get("/state/{state_id}", response_model=schemas.StateResponse)
 async def read_state(state_id: str, db: Session = Depends(get_db_session)):
@@ -34,6 +38,7 @@ async def read_state(state_id: str, db: Session = Depends(get_db_session)):
 @router.post("/getStatesByParams/", response_model=list, response_model_exclude_none=True)
 async def read_states(
         request: UserQueryRequest, 
+        response: Response,
         db: Session = Depends(get_db_session)):
 
     # Get all valid columns from the state model
@@ -49,8 +54,12 @@ async def read_states(
     limit = request.page_size
     skip = (request.page_no - 1) * request.page_size  # Offset calculation
 
-    db_states = await service.get_states_by_params(db, selected_fields, filter_cond, ordering, skip=skip, limit=limit)
-    return db_states
+    # A cursor switches to keyset pagination instead of skipping rows
+    query_fields, filter_cond, ordering, skip = get_cursor_pagination(request, table_fields, selected_fields, filter_cond, ordering, skip)
+
+    db_states = await service.get_states_by_params(db, query_fields, filter_cond, ordering, skip=skip, limit=limit)
+    set_next_cursor(response, request, db_states, table_fields)
+    return get_rows_response(db_states, selected_fields, response=response)
 
 @router.put("/state/{state_id}", response_model=success_message_response)
 async def update_state(state_id: str, state: schemas.StateUpdate, db: Session = Depends(get_db_session)):
@@ -3,8 +3,9 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from ..dependencies import get_db_session
 from ..domain.role_assignment import service, schemas, models
-from .util_functions import UserQueryRequest, LoginQueryRequest, generate_uuid, string_hash, success_message_response, get_order_by_conditions, get_filter_conditions, get_select_fields
+from .util_functions import UserQueryRequest, LoginQueryRequest, generate_uuid, success_message_response, get_order_by_conditions, get_filter_conditions, get_select_fields
 from resources.strings import STATE_DOES_NOT_EXIST_ERROR, STATE_ALREADY_EXISTS_ERROR, USER_ROLE_ASSOCIATION_DOES_NOT_EXIST_ERROR
+from logger import logger
 
 router = APIRouter(tags=["teachers"])
 
@@ -29,7 +30,7 @@ async def update_teacher_to_class(assignment_id: str, teacherDetails: schemas.Te
     try: 
         return await service.update_teacher_to_class(teacherDetails=teacherDetails, assignment_id=assignment_id, db=db)        
     except Exception as e:     
-        print("------------ error ", str(e))   
+        logger.warning(f"Error updating teacher assignment - {e}")
         return {"message": USER_ROLE_ASSOCIATION_DOES_NOT_EXIST_ERROR}
 
 @router.get("/teacher/{school_id}")
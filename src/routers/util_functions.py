@@ -1,20 +1,30 @@
 import uuid
-import bcrypt
+import base64
+import json
+import os
+import anyio
+from datetime import date, datetime, time
+from email.utils import parsedate_to_datetime
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import FileResponse
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 import operator
+from sqlalchemy import Column, and_, or_, false
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.expression import desc, asc
+from resources.strings import INVALID_CURSOR_ERROR, FILE_NOT_FOUND_ERROR
+from ..collection_versions import get_collection_etag
+from ..config import COLLECTION_CACHE_MAX_AGE_SECONDS, BATCH_FETCH_MAX_IDS
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
 # Generate a random UUID
 def generate_uuid() -> str:
     return uuid.uuid4()
 
 
-def string_hash(string_to_hash: str) -> str:
-    salt = bcrypt.gensalt()
-    hashed_password = bcrypt.hashpw(string_to_hash.encode("utf-8"), salt)
-    return hashed_password.decode("utf-8")
-
 def get_filter_conditions(filters: dict, table_fields: list) -> list:
     filter_conditions = []
     if filters:
@@ -55,6 +65,167 @@ def get_order_by_conditions(order_by: list, table_fields: list) -> tuple:
             ordering.append(desc(column) if is_desc else asc(column))
     return ordering
 
+def get_cursor_fields(order_by: list, table_fields: list) -> list:
+    ''' The order_by entries a cursor walks, with "id" appended as the tiebreaker so the order is total '''
+    cursor_fields = [field for field in (order_by or []) if field.lstrip("-") in table_fields]
+    if "id" in table_fields and "id" not in [field.lstrip("-") for field in cursor_fields]:
+        cursor_fields.append("id")
+    return cursor_fields
+
+def get_keyset_conditions(cursor: str, cursor_fields: list, table_fields: list) -> list:
+    '''
+    Conditions selecting the rows after the cursor row in cursor_fields order, expanded as
+    (a > x) OR (a = x AND b > y) OR ... so that mixed ASC/DESC directions are supported.
+    An empty cursor starts from the first row.
+    '''
+    if not cursor:
+        return []
+
+    values = _decode_cursor(cursor, cursor_fields, table_fields)
+    clauses = []
+    for position, field in enumerate(cursor_fields):
+        preceding = [
+            table_fields[name.lstrip("-")] == value
+            for name, value in zip(cursor_fields[:position], values[:position])
+        ]
+        column = table_fields[field.lstrip("-")]
+        clauses.append(and_(*preceding, _get_keyset_comparison(column, values[position], field.startswith("-"))))
+    return [or_(*clauses)]
+
+def get_cursor_pagination(request: "UserQueryRequest", table_fields: list, selected_fields: list, filters: list, ordering: list, skip: int) -> tuple:
+    '''
+    Switch a *ByParams query to keyset pagination when the request carries a cursor.
+    Returns (query_fields, filters, ordering, skip); query_fields also selects the cursor
+    columns so the next cursor can be read off the last row.
+    '''
+    if request.cursor is None:
+        return selected_fields, filters, ordering, skip
+
+    cursor_fields = get_cursor_fields(request.order_by, table_fields)
+    query_fields = selected_fields + [
+        field.lstrip("-") for field in cursor_fields if field.lstrip("-") not in selected_fields
+    ]
+    filters = list(filters) + get_keyset_conditions(request.cursor, cursor_fields, table_fields)
+    ordering = get_order_by_conditions(cursor_fields, table_fields)
+    return query_fields, filters, ordering, 0
+
+def set_next_cursor(response: Response, request: "UserQueryRequest", rows: list, table_fields: list):
+    ''' Send the cursor of the page after rows in the X-Next-Cursor header; omitted on the last page '''
+    if request.cursor is None or len(rows) < request.page_size:
+        return
+
+    cursor_fields = get_cursor_fields(request.order_by, table_fields)
+    last_row = rows[-1]
+    values = [_get_row_value(last_row, field.lstrip("-")) for field in cursor_fields]
+    payload = json.dumps({"order_by": cursor_fields, "values": jsonable_encoder(values)})
+    response.headers[NEXT_CURSOR_HEADER] = base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+def _get_keyset_comparison(column, value, is_desc: bool):
+    # PostgreSQL sorts NULLs last ascending and first descending
+    nullable = column.nullable if isinstance(column, Column) else True
+    if is_desc:
+        return column.is_not(None) if value is None else column < value
+    if value is None:
+        return false()
+    return or_(column > value, column.is_(None)) if nullable else column > value
+
+def _decode_cursor(cursor: str, cursor_fields: list, table_fields: list) -> list:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if payload["order_by"] != cursor_fields:
+            raise ValueError("cursor was issued for a different ordering")
+        if len(payload["values"]) != len(cursor_fields):
+            raise ValueError("cursor needs one value per ordering field")
+        return [
+            _decode_cursor_value(table_fields[field.lstrip("-")], value)
+            for field, value in zip(cursor_fields, payload["values"])
+        ]
+    except Exception:
+        raise HTTPException(status_code=400, detail=INVALID_CURSOR_ERROR)
+
+def _decode_cursor_value(column, value):
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type in (datetime, date, time):
+        return python_type.fromisoformat(value)
+    return value if isinstance(value, python_type) else python_type(value)
+
+def _get_row_value(row, field: str):
+    if isinstance(row, dict):
+        return row.get(field)
+    if hasattr(row, "_mapping"):
+        return row._mapping[field]
+    return getattr(row, field)
+
+async def get_file_response(request: Request, file_path: str, media_type: Optional[str] = None, filename: Optional[str] = None, content_disposition_type: str = "attachment") -> Response:
+    '''
+    Serve a file from disk. Starlette's FileResponse streams it in chunks on a worker thread,
+    closes the handle when done, and answers Range/If-Range requests with 206; on top of that
+    a matching If-None-Match (or If-Modified-Since) gets a 304 without touching the file.
+    '''
+    try:
+        stat_result = await anyio.to_thread.run_sync(os.stat, file_path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=FILE_NOT_FOUND_ERROR)
+
+    response = FileResponse(
+        file_path,
+        stat_result=stat_result,
+        media_type=media_type,
+        filename=filename,
+        content_disposition_type=content_disposition_type,
+        # Clients may keep their copy but must revalidate it with the ETag
+        headers={"Cache-Control": "no-cache"},
+    )
+    if _is_not_modified(request, response):
+        not_modified_headers = {
+            name: response.headers[name] for name in ("etag", "last-modified", "cache-control") if name in response.headers
+        }
+        return Response(status_code=304, headers=not_modified_headers)
+    return response
+
+def _is_not_modified(request: Request, response: Response) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-Modified-Since is ignored when If-None-Match is present (RFC 9110)
+        return _is_etag_match(if_none_match, response.headers["etag"])
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        return parsedate_to_datetime(response.headers["last-modified"]) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+def _is_etag_match(if_none_match: str, etag: str) -> bool:
+    etags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in etags or etag in etags
+
+async def get_collection_not_modified(request: Request, response: Response, db: AsyncSession, *collections: str) -> Optional[Response]:
+    '''
+    Conditional GET for a list built from the given collections (see collection_versions).
+    Returns a 304 response when the client's If-None-Match still matches; otherwise sets the
+    ETag and Cache-Control headers on response and returns None so the route builds the list.
+    Call it before querying, so a revalidated list costs only the version lookup.
+    '''
+    etag = await get_collection_etag(db, collections, f"{request.url.path}?{request.url.query}")
+    if COLLECTION_CACHE_MAX_AGE_SECONDS:
+        cache_control = f"private, max-age={COLLECTION_CACHE_MAX_AGE_SECONDS}"
+    else:
+        cache_control = "no-cache"
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and _is_etag_match(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return None
+
 def get_limit_offset(limit: int, offset: int) -> tuple[int]:
     limit = min(int(limit), 100) if limit is not None else 25
     offset = max(int(offset), 0) if offset is not None else 0
@@ -89,6 +260,22 @@ class UserQueryRequest(BaseModel):
     page_no: Optional[int] = Field(1, ge=1)  # Optional with default value
     page_size: Optional[int] = Field(100, ge=1, le=100)  # Optional with default value
     order_by: Optional[List[str]] = None
+    # Keyset pagination: send "" for the first page, then the X-Next-Cursor of the previous page.
+    # page_no is ignored while a cursor is sent.
+    cursor: Optional[str] = None
+
+
+class BatchFetchRequest(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=BATCH_FETCH_MAX_IDS)
+
+
+def get_batch_result(ids: list, found: dict) -> dict:
+    ''' Body of a batch fetch: what was found keyed by id in request order, and the ids that matched nothing '''
+    ids = list(dict.fromkeys(ids))
+    return {
+        "results": {item_id: found[item_id] for item_id in ids if item_id in found},
+        "missing": [item_id for item_id in ids if item_id not in found],
+    }
 
 
 class LoginQueryRequest(BaseModel):
@@ -0,0 +1,35 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+###
+# Read-only query path for the list endpoints.
+# Selecting ORM entities builds an object per row, registers it in the session's identity map
+# and sets up its relationship loaders, only for the route to dump it to JSON straight away.
+# These helpers select table columns instead, so the statement runs as plain Core and each row
+# comes back as a dict of column values, ready for the responses in src/responses.py.
+###
+
+
+def get_response_columns(model, response_schema) -> list:
+    ''' Table columns behind the fields of response_schema, in field order '''
+    columns = model.__table__.columns
+    return [columns[field] for field in response_schema.model_fields if field in columns]
+
+
+def get_field_columns(model, fields: list) -> list:
+    ''' Table columns for field names already checked against the model's get_valid_fields() '''
+    columns = model.__table__.columns
+    return [columns[field] for field in fields]
+
+
+async def get_rows(db: AsyncSession, statement) -> list:
+    ''' Run a column select and return its rows as plain dicts '''
+    result = await db.execute(statement)
+    return [dict(row) for row in result.mappings()]
+
+
+async def get_rows_by_ids(db: AsyncSession, model, response_schema, ids: list) -> dict:
+    ''' Rows of model whose id is in ids, projected onto response_schema and keyed by id; one IN query '''
+    columns = get_response_columns(model, response_schema)
+    rows = await get_rows(db, select(*columns).filter(model.__table__.columns["id"].in_(ids)))
+    return {row["id"]: row for row in rows}
@@ -0,0 +1,81 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from typing import Callable, Iterable
+
+###
+# Write notifications for caches and version counters.
+# Sessions remember which registered tables they wrote to, through ORM flushes as well as
+# insert/update/delete statements. Callbacks registered with on_committing_write run inside the
+# committing transaction, so their own statements commit or roll back with the write; callbacks
+# registered with on_committed_write run once it has committed. Both are called with the
+# registered tables that were written to. A rollback forgets them.
+###
+
+# Table name -> callbacks to run before / after a commit that wrote to it
+_committing_callbacks = {}
+_committed_callbacks = {}
+
+
+def on_committing_write(tables: Iterable[str], callback: Callable[[Session, set], None]):
+    ''' Call callback(session, written) in the transaction of every commit that wrote to one of tables '''
+    for table in tables:
+        _committing_callbacks.setdefault(table, []).append(callback)
+
+
+def on_committed_write(tables: Iterable[str], callback: Callable[[set], None]):
+    ''' Call callback(written) after every commit that wrote to one of tables; written is the subset it wrote to '''
+    for table in tables:
+        _committed_callbacks.setdefault(table, []).append(callback)
+
+
+def _get_callbacks(registry: dict, written_tables: set) -> dict:
+    # Each callback runs once per commit, however many of its tables were written
+    callbacks = {}
+    for table in written_tables:
+        for callback in registry.get(table, ()):
+            callbacks.setdefault(callback, set()).add(table)
+    return callbacks
+
+
+def _track_table(session, table_name):
+    if table_name in _committing_callbacks or table_name in _committed_callbacks:
+        session.info.setdefault("written_tables", set()).add(table_name)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_writes(session, flush_context):
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        _track_table(session, getattr(instance, "__tablename__", None))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement_writes(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        _track_table(orm_execute_state.session, getattr(table, "name", None))
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_before_commit(session):
+    # Commit flushes after this event; flush first so pending ORM changes are tracked too
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    written_tables = session.info.get("written_tables")
+    if not written_tables:
+        return
+    for callback, tables in _get_callbacks(_committing_callbacks, written_tables).items():
+        callback(session, tables)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_after_commit(session):
+    written_tables = session.info.pop("written_tables", None)
+    if not written_tables:
+        return
+    for callback, tables in _get_callbacks(_committed_callbacks, written_tables).items():
+        callback(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_writes(session):
+    session.info.pop("written_tables", None)
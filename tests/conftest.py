@@ -0,0 +1,49 @@
+import os
+import sys
+import tempfile
+import pytest
+
+###
+# The tests run the app against a throwaway SQLite database. Settings are read from the
+# environment before the .env file, so they are set here, before the app is first imported.
+###
+
+_tmp_dir = tempfile.mkdtemp(prefix="ilp-tests-")
+os.environ["DB_URL"] = f"sqlite+aiosqlite:///{os.path.join(_tmp_dir, 'ilp.db')}"
+os.environ["UPLOAD_FOLDER"] = _tmp_dir
+os.environ["LOG_FILE"] = os.path.join(_tmp_dir, "adminlogs.log")
+os.environ["PASSWORD_HASH_ROUNDS"] = "4"  # bcrypt's minimum, imported users get a hash quickly
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    import main
+
+    # Entering the client runs the startup hook, which creates the tables and runs the migrations
+    with TestClient(main.app, base_url="http://testserver/ilp/v1") as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def school_parents(client):
+    ''' Ids of a block and an organization that schools can be created under '''
+    regions = {"states": [{"name": "Test State", "zones": [{"name": "Test Zone", "districts": [{"name": "Test District", "blocks": [{"name": "Test Block"}]}]}]}]}
+    assert client.post("/bulkImportRegions", json=regions).status_code == 200
+    tree = client.get("/regionTree").json()
+    state = next(node for node in tree if node["name"] == "Test State")
+    block = state["children"][0]["children"][0]["children"][0]
+
+    # Added through the session factory, on the app's event loop where its connections live
+    from src.database import AsyncSessionLocal
+    from src.domain.organization.models import Organization
+
+    async def add_organization():
+        async with AsyncSessionLocal() as db:
+            db.add(Organization(id="test-org", name="Test Org", long_name="Test Organization", description="Schools under test"))
+            await db.commit()
+
+    client.portal.call(add_organization)
+    return {"block_id": block["id"], "organization_id": "test-org"}
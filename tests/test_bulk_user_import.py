@@ -0,0 +1,85 @@
+import pytest
+
+SCHOOL_DISE_CODE = 30000000001
+CSV_HEADER = "First Name,Last Name,Email,Username,Phone1,Phone2,Gender,Address,City,State,Country,Pincode,School Dise Code,Role"
+
+
+@pytest.fixture(scope="module")
+def import_school(client, school_parents):
+    ''' A school for imported users to be assigned to, and the roles they are given '''
+    from src.database import AsyncSessionLocal
+    from src.domain.role.models import Role, RoleEnum
+    from src.domain.role.service import invalidate_role_cache
+
+    async def add_roles():
+        async with AsyncSessionLocal() as db:
+            db.add_all([Role(id=f"role-{role.value.lower()}", name=role) for role in RoleEnum])
+            await db.commit()
+        invalidate_role_cache()
+
+    client.portal.call(add_roles)
+    school = {"name": "Import School", "long_name": "Import School", "dise_code": SCHOOL_DISE_CODE, "address": "Main Road", "city": "Town", "pincode": 560001, **school_parents}
+    assert client.post("/bulkUpsertSchools", json={"schools": [school]}).json()["created"] == 1
+    return SCHOOL_DISE_CODE
+
+
+def upload_users(client, rows: list):
+    content = "\n".join([CSV_HEADER, *rows]) + "\n"
+    return client.post("/bulkUploadUserData", files={"file": ("users.csv", content.encode("utf-8"), "text/csv")})
+
+
+def get_user_id(client, email: str) -> str:
+    response = client.post("/getIlpusersByParams/", json={"fields": ["id"], "filters": {"email": {"==": email}}})
+    assert response.status_code == 200
+    return response.json()[0]["id"]
+
+
+def test_upload_reports_every_rejected_row(client, import_school):
+    response = upload_users(client, [
+        f"Asha,Rao,asha@ilp-test.org,,9000000001,,FEMALE,Street 1,Town,KA,India,560001,{import_school},TEACHER",
+        f"Ravi,,ravi@ilp-test.org,,9000000002,,MALE,Street 2,Town,KA,India,560001,{import_school},TEACHER",
+        f"Asha,Rao,ASHA@ilp-test.org,asha2,9000000003,,FEMALE,Street 3,Town,KA,India,560001,{import_school},TEACHER",
+        f"Kiran,Das,kiran@ilp-test.org,,9000000004,,UNKNOWN,Street 4,Town,KA,India,560001,{import_school},TEACHER",
+        "Lata,Shah,lata@ilp-test.org,,9000000005,,FEMALE,Street 5,Town,KA,India,560001,39999999999,TEACHER",
+        f"Mohan,Kumar,mohan@ilp-test.org,,9000000006,,MALE,Street 6,Town,KA,India,560001,{import_school},PRINCIPAL",
+    ])
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["created"] == 2
+    assert report["errors"] == [
+        "Row 3: First Name or Last Name is missing",
+        "Row 4: User with email 'ASHA@ilp-test.org' or username 'asha2' already exists",
+        "Row 5: Invalid gender 'UNKNOWN'",
+        "Row 6: A school with dise code, '39999999999' doesnt exist. So, role is not created for user 'Lata Shah'",
+        "Row 7: Invalid role 'PRINCIPAL'",
+    ]
+
+
+def test_imported_user_is_assigned_to_the_school(client, import_school):
+    assert upload_users(client, [
+        f"Nila,Menon,nila@ilp-test.org,,9000000007,,FEMALE,Street 7,Town,KA,India,560001,{import_school},STUDENT",
+    ]).json()["created"] == 1
+
+    roles = client.get(f"/userRole/{get_user_id(client, 'nila@ilp-test.org')}").json()
+    assert [(role["role_name"], role["level"], role["school_name"]) for role in roles] == [("STUDENT", "SCHOOL", "Import School")]
+
+
+def test_reuploading_a_sheet_creates_no_duplicates(client, import_school):
+    row = f"Omar,Ali,omar@ilp-test.org,,9000000008,,MALE,Street 8,Town,KA,India,560001,{import_school},TEACHER"
+    assert upload_users(client, [row]).json()["created"] == 1
+
+    report = upload_users(client, [row]).json()
+    assert report["created"] == 0
+    assert report["errors"] == ["Row 2: User with email 'omar@ilp-test.org' or username 'omarali' already exists"]
+
+
+
+def test_field_validation_errors_name_the_field(client, import_school):
+    report = upload_users(client, [
+        f"Uma,Nair,not-an-email,,9000000009,,FEMALE,Street 9,Town,KA,India,560001,{import_school},TEACHER",
+    ]).json()
+
+    assert report["created"] == 0
+    assert len(report["errors"]) == 1
+    assert report["errors"][0].startswith("Row 2: email: value is not a valid email address")
@@ -0,0 +1,56 @@
+def get_etag(client, url: str, **params) -> str:
+    response = client.get(url, params=params)
+    assert response.status_code == 200
+    return response.headers["etag"]
+
+
+def test_unchanged_list_is_revalidated_with_304(client):
+    etag = get_etag(client, "/state/")
+
+    response = client.get("/state/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    # Weak comparison, as a proxy may have weakened the tag
+    assert client.get("/state/", headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+
+
+def test_lists_from_other_urls_have_their_own_etags(client):
+    assert get_etag(client, "/state/") != get_etag(client, "/state/", page_size=1)
+    # /regionTree and /block/ are both built from the block collection
+    assert get_etag(client, "/regionTree") != get_etag(client, "/block/")
+
+
+def test_region_write_changes_the_etags_of_the_lists_below_it(client):
+    before = {url: get_etag(client, url) for url in ("/state/", "/zone/", "/role/")}
+
+    assert client.post("/state/", json={"name": "Etag State", "description": "Changes the region lists"}).status_code == 200
+
+    after = {url: get_etag(client, url) for url in before}
+    assert after["/state/"] != before["/state/"]
+    assert after["/zone/"] != before["/zone/"]
+    assert after["/role/"] == before["/role/"]
+    response = client.get("/state/", headers={"If-None-Match": before["/state/"]})
+    assert response.status_code == 200
+    assert "Etag State" in [state["name"] for state in response.json()]
+
+
+def test_statement_writes_change_the_etag(client):
+    etag = get_etag(client, "/regionTree")
+
+    # The bulk import writes with insert() statements rather than ORM objects
+    regions = {"states": [{"name": "Etag Import State", "zones": [{"name": "Etag Import Zone"}]}]}
+    assert client.post("/bulkImportRegions", json=regions).status_code == 200
+
+    response = client.get("/regionTree", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert "Etag Import State" in [state["name"] for state in response.json()]
+
+
+def test_rejected_write_leaves_the_etag_alone(client):
+    assert client.post("/state/", json={"name": "Rejected Etag State", "description": "Created once"}).status_code == 200
+    etag = get_etag(client, "/state/")
+
+    assert client.post("/state/", json={"name": "Rejected Etag State", "description": "Created twice"}).status_code == 400
+
+    assert client.get("/state/", headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,74 @@
+import pytest
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+SCHOOL_NAME = "Cursor School"
+DISE_CODES = [20000000001 + number for number in range(5)]
+
+
+@pytest.fixture(scope="module")
+def tied_schools(client, school_parents):
+    ''' Five schools with the same name, so ordering by name alone leaves ties '''
+    schools = [
+        {"name": SCHOOL_NAME, "long_name": f"{SCHOOL_NAME} {dise_code}", "dise_code": dise_code, "address": "Main Road", "city": "Town", "pincode": 560001, **school_parents}
+        for dise_code in DISE_CODES
+    ]
+    response = client.post("/bulkUpsertSchools", json={"schools": schools})
+    assert response.status_code == 200
+    assert response.json()["created"] == len(DISE_CODES)
+    return school_parents
+
+
+def get_all_pages(client, url: str, body: dict) -> tuple:
+    ''' Every row of a keyset paginated query and the number of pages it took '''
+    rows, pages, cursor = [], 0, ""
+    while cursor is not None:
+        response = client.post(url, json={**body, "cursor": cursor})
+        assert response.status_code == 200
+        rows.extend(response.json())
+        pages += 1
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+    return rows, pages
+
+
+def test_cursor_returns_tied_rows_exactly_once(client, tied_schools):
+    body = {"fields": ["id", "name"], "filters": {"name": {"==": SCHOOL_NAME}}, "order_by": ["name"], "page_size": 2}
+    rows, pages = get_all_pages(client, "/getSchoolsByParams/", body)
+
+    ids = [row["id"] for row in rows]
+    assert pages == 3
+    assert len(ids) == len(set(ids)) == len(DISE_CODES)
+    # Ties are broken by id
+    assert ids == sorted(ids)
+
+
+def test_cursor_follows_descending_order_without_leaking_cursor_columns(client, tied_schools):
+    body = {"fields": ["dise_code"], "filters": {"name": {"==": SCHOOL_NAME}}, "order_by": ["-dise_code"], "page_size": 2}
+    rows, _ = get_all_pages(client, "/getSchoolsByParams/", body)
+
+    assert rows == [{"dise_code": dise_code} for dise_code in reversed(DISE_CODES)]
+
+
+def test_school_details_cursor_pages_through_tied_names(client, tied_schools):
+    body = {"fields": ["dise_code"], "filters": {"name": SCHOOL_NAME}, "order_by": ["name"], "page_size": 2}
+    rows, pages = get_all_pages(client, "/allSchoolDetails/", body)
+
+    assert pages == 3
+    assert sorted(row["dise_code"] for row in rows) == DISE_CODES
+    assert all(set(row) == {"dise_code"} for row in rows)
+
+
+def test_last_page_has_no_next_cursor(client, tied_schools):
+    body = {"filters": {"name": {"==": SCHOOL_NAME}}, "order_by": ["name"], "page_size": len(DISE_CODES) + 1, "cursor": ""}
+    response = client.post("/getSchoolsByParams/", json=body)
+
+    assert response.status_code == 200
+    assert len(response.json()) == len(DISE_CODES)
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+# The second cursor carries one value for the two cursor fields name and id
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "eyJvcmRlcl9ieSI6IFsibmFtZSIsICJpZCJdLCAidmFsdWVzIjogWyJ4Il19"], ids=["not-json", "too-few-values"])
+def test_malformed_cursor_is_rejected(client, cursor):
+    response = client.post("/getSchoolsByParams/", json={"order_by": ["name"], "cursor": cursor})
+
+    assert response.status_code == 400
@@ -0,0 +1,35 @@
+from src.domain.dashboard import service as dashboard_service
+
+
+def get_summary(client) -> dict:
+    response = client.get("/dashboard/summary")
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_unchanged_summary_is_served_from_the_snapshot(client):
+    get_summary(client)
+    snapshot = dashboard_service._summary
+
+    assert get_summary(client) == snapshot
+    assert dashboard_service._summary is snapshot
+
+
+def test_write_from_another_worker_rebuilds_the_summary(client):
+    from src.database import AsyncSessionLocal
+    from src.domain.state.models import State
+
+    states = get_summary(client)["region_counts"]["states"]
+
+    # Committed through a session of its own, as another worker's write would be; the snapshot only
+    # learns of it from the dashboard version counter
+    async def add_state():
+        async with AsyncSessionLocal() as db:
+            db.add(State(id="dashboard-state", name="Dashboard State", description="Counted by the dashboard"))
+            await db.commit()
+
+    client.portal.call(add_state)
+
+    summary = get_summary(client)
+    assert summary["region_counts"]["states"] == states + 1
+    assert "Dashboard State" in [region["name"] for region in summary["recent_regions"]]
@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+from typing import List
+
+import pytest
+from pydantic import BaseModel
+
+from src import responses
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@pytest.fixture(params=[True, False], ids=["fast", "default"])
+def fast_json(request, monkeypatch):
+    monkeypatch.setattr(responses, "FAST_JSON_RESPONSES", request.param)
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def two_states(client):
+    for name in ("Fast State A", "Fast State B"):
+        assert client.post("/state/", json={"name": name, "description": "Listed by the response tests"}).status_code == 200
+
+
+def test_list_keeps_its_cache_headers(client, two_states, fast_json):
+    response = client.get("/state/")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["etag"]
+    assert response.headers["cache-control"]
+
+
+def test_by_params_list_keeps_its_next_cursor(client, two_states, fast_json):
+    body = {"fields": ["id", "name"], "order_by": ["name"], "page_size": 1, "cursor": ""}
+    response = client.post("/getStatesByParams/", json=body)
+
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    assert response.headers[NEXT_CURSOR_HEADER]
+
+
+def test_fast_and_default_responses_match(client, two_states, monkeypatch):
+    body = {"fields": ["id", "name", "description"], "order_by": ["name"], "page_size": 1, "cursor": ""}
+
+    def get_lists():
+        by_params = client.post("/getStatesByParams/", json=body)
+        states = client.get("/state/")
+        return (by_params.json(), by_params.headers[NEXT_CURSOR_HEADER]), (states.json(), states.headers["etag"])
+
+    fast = get_lists()
+    monkeypatch.setattr(responses, "FAST_JSON_RESPONSES", False)
+    assert get_lists() == fast
+
+
+class Stamped(BaseModel):
+    created_at: datetime
+
+
+def test_utc_datetimes_are_written_like_pydantic():
+    # sqlite hands back naive datetimes, so aware ones from postgres are checked on the encoder itself
+    rows = [{"created_at": datetime(2025, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc)}]
+
+    assert responses.FastJSONResponse(rows).body == responses.get_type_adapter(List[Stamped]).dump_json(rows)
+    assert b'"2025-01-02T03:04:05.123456Z"' in responses.FastJSONResponse(rows).body
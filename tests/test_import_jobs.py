@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta, timezone
+
+
+def add_job(client, job_id: str, status: str, idle_seconds: int):
+    ''' An import job last heard from idle_seconds ago '''
+    from src.database import AsyncSessionLocal
+    from src.domain.import_job.models import ImportJob, ImportJobStatusEnum
+
+    async def add():
+        async with AsyncSessionLocal() as db:
+            db.add(ImportJob(id=job_id, kind="users", total_rows=10, processed_rows=4, status=ImportJobStatusEnum(status),
+                             last_updated_at=datetime.now(timezone.utc) - timedelta(seconds=idle_seconds)))
+            await db.commit()
+
+    client.portal.call(add)
+
+
+def test_polling_fails_a_job_whose_worker_went_away(client):
+    from src.config import IMPORT_JOB_STALE_SECONDS
+
+    add_job(client, "stalled-job", "RUNNING", IMPORT_JOB_STALE_SECONDS + 60)
+    add_job(client, "busy-job", "RUNNING", 5)
+
+    stalled = client.get("/importJobs/stalled-job").json()
+    assert (stalled["status"], stalled["processed_rows"]) == ("FAILED", 4)
+    assert stalled["failure_reason"].startswith("The import stopped making progress")
+    assert stalled["finished_at"]
+    assert client.get("/importJobs/busy-job").json()["status"] == "RUNNING"
+
+
+def test_startup_fails_every_stalled_job(client):
+    from src.config import IMPORT_JOB_STALE_SECONDS
+    from src.database import AsyncSessionLocal
+    from src.domain.import_job import service as import_job_service
+
+    add_job(client, "stalled-pending-job", "PENDING", IMPORT_JOB_STALE_SECONDS + 60)
+    add_job(client, "stalled-running-job", "RUNNING", IMPORT_JOB_STALE_SECONDS + 60)
+    add_job(client, "finished-job", "COMPLETED", IMPORT_JOB_STALE_SECONDS + 60)
+
+    async def expire() -> int:
+        async with AsyncSessionLocal() as db:
+            return await import_job_service.expire_stale_import_jobs(db)
+
+    assert client.portal.call(expire) == 2
+
+    statuses = {job_id: client.get(f"/importJobs/{job_id}").json()["status"] for job_id in ("stalled-pending-job", "stalled-running-job", "finished-job")}
+    assert statuses == {"stalled-pending-job": "FAILED", "stalled-running-job": "FAILED", "finished-job": "COMPLETED"}
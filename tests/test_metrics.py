@@ -0,0 +1,46 @@
+import re
+
+
+def get_sample(client, sample: str) -> float:
+    ''' Value of one sample on /metrics, 0 when it hasn't been recorded yet '''
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    match = re.search(rf"^{re.escape(sample)} (\S+)$", response.text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_requests_are_counted_by_route_template_and_status(client):
+    found = 'http_requests_total{method="GET",route="/ilp/v1/state/",status="200"}'
+    not_found = 'http_requests_total{method="GET",route="/ilp/v1/state/{state_id}",status="404"}'
+    before = get_sample(client, found), get_sample(client, not_found)
+
+    assert client.get("/state/").status_code == 200
+    assert client.get("/state/no-such-state").status_code == 404
+    assert client.get("/state/another-missing-state").status_code == 404
+
+    assert get_sample(client, found) == before[0] + 1
+    assert get_sample(client, not_found) == before[1] + 2
+
+
+def test_queries_run_by_a_request_are_recorded(client):
+    labels = '{method="GET",route="/ilp/v1/state/"}'
+    count_before = get_sample(client, f"http_request_db_queries_count{labels}")
+    sum_before = get_sample(client, f"http_request_db_queries_sum{labels}")
+
+    assert client.get("/state/").status_code == 200
+
+    assert get_sample(client, f"http_request_db_queries_count{labels}") == count_before + 1
+    # The list query at least, besides the collection version lookup
+    assert get_sample(client, f"http_request_db_queries_sum{labels}") >= sum_before + 1
+    assert get_sample(client, f'http_request_db_queries_bucket{{method="GET",route="/ilp/v1/state/",le="+Inf"}}') == count_before + 1
+
+
+def test_unmatched_paths_share_one_route_label(client):
+    sample = 'http_requests_total{method="GET",route="unmatched",status="404"}'
+    before = get_sample(client, sample)
+
+    assert client.get("/no-such-route").status_code == 404
+    assert client.get("/another/missing/route").status_code == 404
+
+    assert get_sample(client, sample) == before + 2
+    assert "/no-such-route" not in client.get("/metrics").text
@@ -0,0 +1,75 @@
+REGIONS = {"states": [{"name": "Import State", "zones": [{"name": "Import Zone", "districts": [
+    {"name": "North District", "blocks": [{"name": "North Block"}, {"name": "Hill Block"}]},
+    {"name": "South District", "blocks": [{"name": "South Block"}]},
+]}]}]}
+
+
+def find_region(nodes: list, *names: str) -> dict:
+    ''' The node at the end of a path of names in a /regionTree response '''
+    for name in names:
+        node = next(node for node in nodes if node["name"] == name)
+        nodes = node.get("children", [])
+    return node
+
+
+def upload_regions(client, rows: list):
+    content = "\n".join(["State,Zone,District,Block", *rows]) + "\n"
+    return client.post("/bulkUploadRegionData", files={"file": ("regions.csv", content.encode("utf-8"), "text/csv")})
+
+
+def test_reimporting_a_tree_reuses_the_existing_regions(client):
+    report = client.post("/bulkImportRegions", json=REGIONS).json()
+    assert report["created"] == {"state": 1, "zone": 1, "district": 2, "block": 3}
+    assert report["errors"] == []
+
+    # Regions are matched by case-insensitive name
+    shouting = {"states": [{**REGIONS["states"][0], "name": "IMPORT STATE"}]}
+    report = client.post("/bulkImportRegions", json=shouting).json()
+    assert report["created"] == {"state": 0, "zone": 0, "district": 0, "block": 0}
+    assert report["existing"] == {"state": 1, "zone": 1, "district": 2, "block": 3}
+
+
+def test_imported_regions_are_linked_to_their_parents(client):
+    client.post("/bulkImportRegions", json=REGIONS)
+    tree = client.get("/regionTree").json()
+    block = find_region(tree, "Import State", "Import Zone", "North District", "Hill Block")
+
+    ancestors = client.get(f"/regionTree/{block['id']}/ancestors").json()
+    assert [(node["level"], node["name"]) for node in ancestors] == [
+        ("STATE", "Import State"), ("ZONE", "Import Zone"), ("DISTRICT", "North District"), ("BLOCK", "Hill Block"),
+    ]
+    # Children are served in name order
+    district = find_region(tree, "Import State", "Import Zone", "North District")
+    assert [child["name"] for child in district["children"]] == ["Hill Block", "North Block"]
+
+
+def test_upload_reports_rows_that_cannot_be_placed(client):
+    response = upload_regions(client, [
+        "Csv State,Csv Zone,Csv District,Csv Block",
+        "Csv State,,Csv District,",
+        "Csv State,Other Zone,Csv District,Other Block",
+    ])
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["created"] == {"state": 1, "zone": 2, "district": 1, "block": 1}
+    assert report["errors"] == [
+        "Row 3: Zone is missing",
+        "Row 4: District 'Csv District' appears under more than one zone",
+    ]
+
+
+def test_existing_region_under_another_parent_is_rejected(client):
+    client.post("/bulkImportRegions", json=REGIONS)
+    moved = {"states": [{"name": "Import State", "zones": [{"name": "Second Zone", "districts": [{"name": "South District"}]}]}]}
+
+    report = client.post("/bulkImportRegions", json=moved).json()
+    assert report["created"]["zone"] == 1
+    assert report["created"]["district"] == 0
+    assert report["errors"] == ["Import State / Second Zone / South District: District 'South District' already exists under a different zone"]
+
+
+def test_upload_without_region_columns_is_rejected(client):
+    response = client.post("/bulkUploadRegionData", files={"file": ("regions.csv", b"State,Zone\nA,B\n", "text/csv")})
+
+    assert response.status_code == 400
@@ -0,0 +1,30 @@
+from sqlalchemy import delete, select, update
+
+
+def test_missing_paths_are_backfilled_and_existing_ones_kept(client, school_parents):
+    from src.database import AsyncSessionLocal
+    from src.domain.region_path import service as region_path_service
+    from src.domain.region_path.models import RegionPath
+    from src.domain.school.models import School
+
+    school = {"name": "Path School", "long_name": "Path School", "dise_code": 60000000001, "address": "Main Road", "city": "Town", "pincode": 560001,
+              "classes": [{"grade": "4", "section": "A"}], **school_parents}
+    assert client.post("/bulkUpsertSchools", json={"schools": [school]}).json()["created"] == 1
+
+    async def backfill() -> dict:
+        async with AsyncSessionLocal() as db:
+            school_id = await db.scalar(select(School.id).where(School.dise_code == 60000000001))
+            # The school lost its path and the class's one is out of date; neither is the only path in the table
+            await db.execute(delete(RegionPath).where(RegionPath.region_id == school_id))
+            await db.execute(update(RegionPath).where(RegionPath.school_id == school_id).values(class_name="Stale Class"))
+            await db.commit()
+
+            await region_path_service.ensure_region_paths(db)
+
+            result = await db.execute(select(RegionPath).where(RegionPath.school_id == school_id))
+            return {path.level: path for path in result.scalars().all()}
+
+    paths = client.portal.call(backfill)
+
+    assert (paths["SCHOOL"].school_name, paths["SCHOOL"].block_name, paths["SCHOOL"].state_name) == ("Path School", "Test Block", "Test State")
+    assert paths["CLASS"].class_name == "Stale Class"
@@ -0,0 +1,39 @@
+from src.domain.region_tree import service as region_tree_service
+
+
+def add_state_elsewhere(client, state_id: str, name: str):
+    ''' Write a state the way another worker process would: committed, but never staged in this process's tree '''
+    from src.database import AsyncSessionLocal
+    from src.domain.state.models import State
+
+    async def add_state():
+        async with AsyncSessionLocal() as db:
+            db.add(State(id=state_id, name=name, description="Written by another worker"))
+            await db.commit()
+
+    client.portal.call(add_state)
+
+
+def test_local_write_patches_the_tree_without_a_reload(client, monkeypatch):
+    # Every request checks the version, so the tree starts out current whatever earlier tests wrote
+    monkeypatch.setattr(region_tree_service, "REGION_TREE_VERSION_CHECK_SECONDS", 0)
+    client.get("/regionTree")
+    tree = region_tree_service._tree
+
+    response = client.post("/state/", json={"name": "Patched State", "description": "Added in this process"})
+    state_id = response.json()["id"]
+
+    # Served from the patched tree, which is still current when the version is checked, so it isn't rebuilt
+    assert client.get(f"/regionTree/{state_id}/ancestors").json()[0]["name"] == "Patched State"
+    assert region_tree_service._tree is tree
+
+
+def test_write_from_another_worker_is_picked_up_by_the_version_check(client, monkeypatch):
+    client.get("/regionTree")
+    add_state_elsewhere(client, "elsewhere-state", "Elsewhere State")
+
+    monkeypatch.setattr(region_tree_service, "REGION_TREE_VERSION_CHECK_SECONDS", 0)
+    response = client.get("/regionTree/elsewhere-state/ancestors")
+
+    assert response.status_code == 200
+    assert response.json()[0]["name"] == "Elsewhere State"
@@ -0,0 +1,60 @@
+def make_school(parents: dict, dise_code: int, **fields) -> dict:
+    school = {"name": f"Upsert School {dise_code}", "long_name": "Upsert School", "dise_code": dise_code, "address": "Main Road", "city": "Town", "pincode": 560001, **parents}
+    return {**school, **fields}
+
+
+def upsert_schools(client, schools: list) -> dict:
+    response = client.post("/bulkUpsertSchools", json={"schools": schools})
+    assert response.status_code == 200
+    return response.json()
+
+
+def get_school_details(client, dise_code: int) -> dict:
+    body = {"fields": ["name", "address", "block_name", "state_name"], "filters": {"dise_code": str(dise_code)}}
+    return client.post("/allSchoolDetails/", json=body).json()[0]
+
+
+def test_upsert_creates_then_updates_on_dise_code(client, school_parents):
+    classes = [{"grade": "1", "section": "A"}, {"grade": "1", "section": "B"}]
+    report = upsert_schools(client, [
+        make_school(school_parents, 40000000001, classes=classes),
+        make_school(school_parents, 40000000002, classes=[{"grade": "2"}]),
+    ])
+    assert (report["created"], report["updated"], report["unchanged"], report["classes_created"]) == (2, 0, 0, 3)
+
+    # Classes the school already has are not created again
+    report = upsert_schools(client, [
+        make_school(school_parents, 40000000001, address="New Road", classes=[*classes, {"grade": "2", "section": "A"}]),
+        make_school(school_parents, 40000000002, classes=[{"grade": "2"}]),
+    ])
+    assert (report["created"], report["updated"], report["unchanged"], report["classes_created"]) == (0, 1, 1, 1)
+    assert report["errors"] == []
+    assert get_school_details(client, 40000000001)["address"] == "New Road"
+
+
+def test_new_and_renamed_schools_get_region_paths(client, school_parents):
+    upsert_schools(client, [make_school(school_parents, 40000000003)])
+    upsert_schools(client, [make_school(school_parents, 40000000003, name="Renamed School")])
+
+    details = get_school_details(client, 40000000003)
+    assert (details["name"], details["block_name"], details["state_name"]) == ("Renamed School", "Test Block", "Test State")
+
+
+def test_invalid_schools_are_reported_and_skipped(client, school_parents):
+    report = upsert_schools(client, [
+        make_school(school_parents, 40000000004),
+        make_school(school_parents, 40000000004, name="Same Dise Code"),
+        make_school(school_parents, 40000000005, block_id="no-such-block"),
+        make_school(school_parents, 40000000006, organization_id="no-such-organization"),
+        {"name": "Incomplete School", "classes": [{"section": "A"}]},
+    ])
+
+    assert (report["created"], report["skipped"]) == (1, 4)
+    # Validation problems are found before the lookups; each names the field it belongs to
+    assert report["errors"][0] == "School 2: dise code 40000000004 appears more than once"
+    assert report["errors"][1].startswith("School 5: long_name: Field required;")
+    assert "classes.0.grade: Field required" in report["errors"][1]
+    assert report["errors"][2:] == [
+        "School 3: block 'no-such-block' does not exist",
+        "School 4: organization 'no-such-organization' does not exist",
+    ]
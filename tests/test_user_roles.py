@@ -0,0 +1,57 @@
+import pytest
+
+SCHOOL_DISE_CODE = 50000000001
+
+
+@pytest.fixture(scope="module")
+def assigned_user(client, school_parents):
+    ''' A user with a class, a school and a block assignment under the test block '''
+    from sqlalchemy import select
+    from src.database import AsyncSessionLocal
+    from src.domain.ilpuser.models import ILPUser
+    from src.domain.role.models import Role, RoleEnum
+    from src.domain.role_assignment.models import UserRole, LevelEnum
+    from src.domain.school.models import Class, School
+
+    school = {"name": "Roles School", "long_name": "Roles School", "dise_code": SCHOOL_DISE_CODE, "address": "Main Road", "city": "Town", "pincode": 560001,
+              "classes": [{"grade": "3", "section": "C"}], **school_parents}
+    assert client.post("/bulkUpsertSchools", json={"schools": [school]}).json()["created"] == 1
+
+    async def add_user():
+        async with AsyncSessionLocal() as db:
+            school_id = await db.scalar(select(School.id).where(School.dise_code == SCHOOL_DISE_CODE))
+            class_id = await db.scalar(select(Class.id).where(Class.school_id == school_id))
+            db.add(ILPUser(id="roles-user", email="roles@ilp-test.org", password="x", username="rolesuser", first_name="Role", last_name="Holder",
+                           phone1="9000000010", gender="FEMALE", created_by="roles-user"))
+            # Another test module may have seeded the roles already
+            role_ids = dict((await db.execute(select(Role.name, Role.id))).all())
+            for role in (RoleEnum.TEACHER, RoleEnum.BLOCK_MANAGER):
+                if role not in role_ids:
+                    role_ids[role] = f"roles-{role.value.lower()}"
+                    db.add(Role(id=role_ids[role], name=role))
+            await db.flush()
+            db.add_all([
+                UserRole(id="roles-class", user_id="roles-user", role_id=role_ids[RoleEnum.TEACHER], level=LevelEnum.CLASS, level_id=class_id),
+                UserRole(id="roles-school", user_id="roles-user", role_id=role_ids[RoleEnum.TEACHER], level=LevelEnum.SCHOOL, level_id=school_id),
+                UserRole(id="roles-block", user_id="roles-user", role_id=role_ids[RoleEnum.BLOCK_MANAGER], level=LevelEnum.BLOCK, level_id=school_parents["block_id"]),
+            ])
+            await db.commit()
+
+    client.portal.call(add_user)
+    return "roles-user"
+
+
+def test_assignments_carry_their_region_chain(client, assigned_user):
+    roles = {role["id"]: role for role in client.get(f"/userRole/{assigned_user}").json()}
+
+    assert (roles["roles-class"]["class_name"], roles["roles-class"]["school_name"]) == ("3 C", "Roles School")
+    for role in roles.values():
+        assert (role["block_name"], role["district_name"], role["zone_name"], role["state_name"]) == ("Test Block", "Test District", "Test Zone", "Test State")
+
+
+def test_batch_serializes_assignments_like_the_single_endpoint(client, assigned_user):
+    single = client.get(f"/userRole/{assigned_user}").json()
+    batch = client.post("/userRole/batch", json={"ids": [assigned_user, "no-such-user"]}).json()
+
+    assert batch["missing"] == ["no-such-user"]
+    assert sorted(batch["results"][assigned_user], key=lambda role: role["id"]) == sorted(single, key=lambda role: role["id"])